@@ -1,16 +1,32 @@
-@router.get("/issues/{issue_id}/status", tags=["Issues"])
-def get_issue_status(issue_id: str):
-    """
-    Fetches the current status of a specific issue by ID.
-    Used by the front-end for live workflow updates.
-    """
+import asyncio
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, Header, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from scripts import platform_data_api_async
+from scripts.issue_events import get_issue_event_bus
+
+router = APIRouter()
+
+# Longest a long-poll request may hold the connection waiting for a change
+ISSUE_STATUS_MAX_WAIT_SECONDS = float(os.getenv("ISSUE_STATUS_MAX_WAIT_SECONDS", "30"))
+# Idle streams get a heartbeat so proxies keep them open and dead clients are noticed
+ISSUE_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("ISSUE_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
+async def _issue_status(issue_id: str) -> dict:
     try:
-        issue = platform_data_api.db.get(issue_id)
+        issue = await platform_data_api_async.fetch_issue_details(issue_id)
         if not issue:
             return {"error": "Issue not found", "issue_id": issue_id, "status": "Not Found"}
         return {
             "issue_id": issue_id,
-            "status": issue.get("status", "Unknown")
+            "status": issue.get("status", "Unknown"),
+            "last_updated": issue.get("last_updated"),
         }
     except Exception as e:
         return {
@@ -18,3 +34,109 @@ def get_issue_status(issue_id: str):
             "issue_id": issue_id,
             "status": "Error"
         }
+
+
+def _etag(body: dict) -> str:
+    return '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16] + '"'
+
+
+@router.get("/issues/{issue_id}/status", tags=["Issues"])
+async def get_issue_status(issue_id: str, request: Request, wait: float = Query(0, ge=0)):
+    """
+    Fetches the current status of a specific issue by ID.
+
+    Responses carry an ETag. Send it back as If-None-Match with `wait=<seconds>`
+    to long-poll: the request returns as soon as the status changes, or 304 once
+    the wait (capped at ISSUE_STATUS_MAX_WAIT_SECONDS) elapses. Clients that can
+    stream should use /issues/events or /issues/events/ws instead.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(wait, ISSUE_STATUS_MAX_WAIT_SECONDS)
+
+    # Subscribe before reading so a change between the read and the wait isn't missed
+    async with get_issue_event_bus().subscribe(issue_ids=[issue_id]) as subscription:
+        while True:
+            body = await _issue_status(issue_id)
+            etag = _etag(body)
+            if etag != if_none_match:
+                return JSONResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+            remaining = deadline - loop.time()
+            if remaining <= 0 or await subscription.get(remaining) is None:
+                return Response(status_code=304, headers={"ETag": etag})
+
+
+async def _snapshots(issue_ids: List[str]) -> List[dict]:
+    return [{"type": "snapshot", **await _issue_status(issue_id)} for issue_id in issue_ids]
+
+
+@router.get("/issues/events", tags=["Issues"])
+async def stream_issue_events(
+    request: Request,
+    issue_id: List[str] = Query(default=[]),
+    status: List[str] = Query(default=[]),
+    last_event_id: Optional[str] = Header(default=None),
+):
+    """
+    Server-Sent Events stream of status changes, optionally filtered by issue
+    and/or status. Starts with a snapshot of each requested issue; reconnecting
+    clients (Last-Event-ID) get the events they missed instead.
+    """
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    subscription = get_issue_event_bus().subscribe(issue_id, status, last_event_id=resume_from)
+
+    async def stream():
+        try:
+            if resume_from is None:
+                for snapshot in await _snapshots(issue_id):
+                    yield f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(ISSUE_EVENTS_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"id: {event.id}\nevent: status\ndata: {json.dumps(event.to_dict())}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def _receive_filters(websocket: WebSocket, subscription):
+    """Clients may change their subscription by sending {"issue_ids": [...], "statuses": [...]}."""
+    while True:
+        message = await websocket.receive_json()
+        if isinstance(message, dict):
+            if "issue_ids" in message:
+                subscription.issue_ids = set(message["issue_ids"] or ())
+            if "statuses" in message:
+                subscription.statuses = set(message["statuses"] or ())
+
+
+@router.websocket("/issues/events/ws")
+async def issue_events_websocket(websocket: WebSocket):
+    """WebSocket stream of status changes; filters come from ?issue_id=&status= and later messages."""
+    issue_ids = websocket.query_params.getlist("issue_id")
+    statuses = websocket.query_params.getlist("status")
+    await websocket.accept()
+
+    async with get_issue_event_bus().subscribe(issue_ids, statuses) as subscription:
+        receiver = asyncio.create_task(_receive_filters(websocket, subscription))
+        try:
+            for snapshot in await _snapshots(issue_ids):
+                await websocket.send_json(snapshot)
+            while True:
+                getter = asyncio.create_task(subscription.get(ISSUE_EVENTS_HEARTBEAT_SECONDS))
+                await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                if receiver.done():
+                    getter.cancel()
+                    break
+                event = getter.result()
+                await websocket.send_json({"type": "status", **event.to_dict()} if event else {"type": "ping"})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
+            if receiver.done() and not receiver.cancelled():
+                receiver.exception()  # Disconnects end the receiver; nothing to report
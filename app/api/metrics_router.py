@@ -1,8 +1,18 @@
 from fastapi import APIRouter
-from scripts import platform_data_api
+from fastapi.responses import PlainTextResponse
+from scripts import platform_data_api, shared_state
+from scripts.latency_metrics import registry
 
 router = APIRouter()
 
+@router.get("/metrics", tags=["Metrics"], response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Latency histograms (workflow stages, LLM calls, git commands) in Prometheus text format,
+    summed over all workers when they share state.
+    """
+    return PlainTextResponse(shared_state.render_metrics(registry), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @router.get("/metrics/summary", tags=["Metrics"])
 def get_summary_metrics():
     """
@@ -2,28 +2,37 @@ from fastapi import APIRouter, UploadFile, File # <--- Added UploadFile, File he
 from pydantic import BaseModel
 from app.utils.gpt4o_client import run_gpt4o_chat
 
-import tempfile
-import speech_recognition as sr
-import pyttsx3
-from fastapi.responses import StreamingResponse
-import os # Added os for file path join if needed, and cleanup
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from app.utils.upload_limits import ensure_upload_size
+from app.services.tts_pool import TTSPoolBusy, get_tts_pool
+from scripts.utils.speech_cache import load_prewarm_phrases, speech_cache
 
 router = APIRouter()
 
+# Cache identity of the audio produced by /speak
+PYTTSX3_VOICE = "pyttsx3:default"
+PYTTSX3_ENCODING = "wav"
+
 @router.post("/transcribe") # <--- Changed path from "/voice/transcribe" to "/transcribe"
-def transcribe_voice(file: UploadFile = File(...)):
+async def transcribe_voice(file: UploadFile = File(...)):
     """
     Receives an audio file, transcribes it using speech_recognition,
     and returns the text transcript.
     """
-    recognizer = sr.Recognizer()
-    # Use tempfile safely and ensure cleanup
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp:
-        temp.write(file.file.read())
-        temp_file_path = temp.name
+    ensure_upload_size(file)
+    # The upload is already held in Starlette's spooled file (in memory below
+    # its spill threshold), so hand that straight to speech_recognition instead
+    # of copying it into another temp file.
+    await file.seek(0)
+    return await run_in_threadpool(_recognize, file.file)
 
+def _recognize(audio_file) -> dict:
+    # Blocking: decoding and recognize_google run in the threadpool
+    import speech_recognition as sr  # Imported on first use to keep it out of app startup
+    recognizer = sr.Recognizer()
     try:
-        with sr.AudioFile(temp_file_path) as source:
+        with sr.AudioFile(audio_file) as source:
             audio_data = recognizer.record(source)
             # Using recognize_google - requires internet access
             text = recognizer.recognize_google(audio_data)
@@ -32,10 +41,9 @@ def transcribe_voice(file: UploadFile = File(...)):
         return {"transcript": "", "error": "Speech Recognition could not understand audio"}
     except sr.RequestError as e:
         return {"transcript": "", "error": f"Could not request results from Google Speech Recognition service; {e}"}
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+    except ValueError as e:
+        # sr.AudioFile raises ValueError for unsupported or corrupt audio
+        return {"transcript": "", "error": f"Unsupported audio file: {e}"}
 
 
 class CommandRequest(BaseModel):
@@ -53,48 +61,45 @@ def handle_command(cmd: CommandRequest):
     response = run_gpt4o_chat("You are a voice assistant in DebugIQ.", cmd.text_command)
     return {"spoken_text": response}
 
-# Using a fixed filename like "output.wav" is problematic for
-# concurrent requests on a web server as multiple requests
-# might try to write to or read from the same file simultaneously.
-# A better approach is to generate audio data in memory or use a
-# more robust method for temporary file handling per request.
 @router.post("/speak") # <--- Changed path from "/voice/speak" to "/speak"
 def synthesize_voice(cmd: CommandRequest):
     """
     Receives text and synthesizes speech using pyttsx3.
-    Returns audio data as a WAV file stream.
+    Returns audio data as a WAV response.
     """
-    # Using pyttsx3 - note potential concurrency issues with file handling
-    # and that this uses a local TTS engine, not Gemini TTS as discussed
-    engine = pyttsx3.init()
-
-    # Use a temporary file for this request to avoid concurrency issues
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp:
-        temp_output_path = temp.name
-
+    # Synthesis runs on the shared pool of long-lived pyttsx3 engines, so
+    # requests don't pay engine startup and the audio never goes through a
+    # per-request temp file. Phrases spoken before are served from the cache.
     try:
-        # pyttsx3 requires a file path to save the audio
-        engine.save_to_file(cmd.text_command, temp_output_path)
-        engine.runAndWait() # Blocks until synthesis is complete
-
-        # Stream the content of the temporary file
-        return StreamingResponse(open(temp_output_path, "rb"), media_type="audio/wav")
+        audio_bytes = speech_cache.get_or_synthesize(
+            cmd.text_command,
+            lambda text: get_tts_pool().synthesize(text),
+            voice=PYTTSX3_VOICE,
+            encoding=PYTTSX3_ENCODING
+        )
+        return Response(content=audio_bytes, media_type="audio/wav")
+    except TTSPoolBusy:
+        return JSONResponse(status_code=503, content={"error": "Speech synthesis is busy, try again shortly"})
+    except TimeoutError:
+        return JSONResponse(status_code=504, content={"error": "Speech synthesis timed out"})
     except Exception as e:
         # Basic error handling
         print(f"Error during text-to-speech synthesis: {e}")
         # Return an error response (consider a more structured error response)
         return {"error": "Failed to synthesize speech"}
-    finally:
-        # Clean up the temporary file after streaming
-        if os.path.exists(temp_output_path):
-             # Need to ensure the file is closed before deleting in some scenarios,
-             # especially in async contexts or if the file object isn't closed
-             # by StreamingResponse automatically. For robustness in production,
-             # consider more advanced temp file management or async handlers.
-             try:
-                 os.remove(temp_output_path)
-             except OSError as e:
-                 print(f"Error removing temporary file {temp_output_path}: {e}")
+
+
+def prewarm_speech_cache() -> int:
+    """Synthesizes the configured pre-warm phrases so /speak serves them from cache."""
+    phrases = load_prewarm_phrases()
+    if not phrases:
+        return 0
+    return speech_cache.prewarm(
+        phrases,
+        lambda text: get_tts_pool().synthesize(text),
+        voice=PYTTSX3_VOICE,
+        encoding=PYTTSX3_ENCODING
+    )
 
 
 # Note on Gemini Integration:
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, File, Query, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from scripts.voice.gemini_voice_bridge import transcribe_and_respond_from_audio
 from scripts.utils.tts_google import synthesize_speech_to_bytes  # Optional TTS engine
+from app.services.voice_stream import VoiceStreamSession, get_voice_backend
+from app.utils.upload_limits import ensure_upload_size
 import io
+import json
 
 router = APIRouter()
 
@@ -12,6 +15,7 @@ async def voice_interactive(file: UploadFile = File(...)):
     Accepts raw audio input, sends to Gemini for transcription and agent response,
     and returns a synthesized spoken reply using TTS as audio/wav.
     """
+    ensure_upload_size(file)
     audio_data = await file.read()
 
     # Transcribe audio and generate response using Gemini
@@ -21,3 +25,44 @@ async def voice_interactive(file: UploadFile = File(...)):
     tts_audio_bytes = synthesize_speech_to_bytes(gemini_reply_text)
 
     return StreamingResponse(io.BytesIO(tts_audio_bytes), media_type="audio/wav")
+
+@router.websocket("/voice/stream")
+async def voice_stream(websocket: WebSocket, sample_rate: int = Query(16000, ge=8000, le=48000), backend: str = None):
+    """
+    Streaming voice session. The client sends mono 16-bit PCM chunks as binary
+    messages while recording; utterances are cut by voice-activity detection
+    (or by sending {"event": "end_utterance"}). Partial transcripts, the final
+    transcript and the reply are streamed back, with reply audio sent one
+    sentence at a time. Send {"event": "close"} to finish after pending replies.
+    Text frames that aren't a JSON object close the socket with 1003.
+    """
+    await websocket.accept()
+    session = VoiceStreamSession(
+        get_voice_backend(backend) if backend else get_voice_backend(),
+        websocket.send_json,
+        websocket.send_bytes,
+        sample_rate=sample_rate
+    )
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                await session.feed_audio(message["bytes"])
+            elif message.get("text"):
+                try:
+                    event = json.loads(message["text"]).get("event")
+                except (ValueError, AttributeError):
+                    await websocket.close(code=1003)
+                    return
+                if event == "end_utterance":
+                    await session.end_utterance()
+                elif event == "close":
+                    await session.close()
+                    await websocket.close()
+                    return
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.abort()
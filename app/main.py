@@ -1,25 +1,37 @@
 # File: DebuIQ-backend/app/main.py
 
+import os
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry
+from app.utils.upload_limits import UploadSizeLimitMiddleware
 
-# Core DebugIQ Modules
-from app.api import analyze
-from app.api import qa
-from app.api import doc
-from app.api import config
-from app.api import voice
+# Initialize FastAPI app
+app = FastAPI(title="DebugIQ API - GPT-4o & Gemini Powered")
 
-# Voice Interaction (Bidirectional Audio)
-from app.api.voice_interactive_router import router as voice_interactive_router
+# Routers are imported on the first request under their prefix (or by ROUTER_WARMUP),
+# so /health is up before the voice stack, LLM SDKs and `scripts` have been imported.
+routers = LazyRouterRegistry(app)
 
-# Agent Routers
-from app.api.autonomous_router import router as autonomous_router
-from app.api.metrics_router import router as metrics_router
-from app.api.issues_router import router as issues_router
+# Core Debugging Agents
+routers.register("analyze", "app.api.analyze", prefix="/debugiq", tags=["Analysis"])
+routers.register("qa", "app.api.qa", prefix="/qa", tags=["Quality Assurance"])
+routers.register("doc", "app.api.doc", prefix="/doc", tags=["Documentation"])
 
-# Initialize FastAPI app
-app = FastAPI(title="DebugIQ API - GPT-4o & Gemini Powered")
+# Voice Routers
+routers.register("voice", "app.api.voice", prefix="/voice", tags=["Voice Assistant"])
+routers.register("voice_interactive", "app.api.voice_interactive_router", prefix="/voice", tags=["Voice Interactive"])
+
+# Autonomous Orchestration & Status
+routers.register("autonomous", "app.api.autonomous_router", prefix="/workflow", tags=["Autonomous Workflow"])
+
+# Issue Management
+routers.register("issues", "app.api.issues_router", tags=["Issues"], paths=("/issues",))
+
+# Metrics/Analytics API
+routers.register("metrics", "app.api.metrics_router", tags=["Metrics"], paths=("/metrics",))
 
 # CORS configuration
 app.add_middleware(
@@ -30,26 +42,34 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-# Core Debugging Agents
-app.include_router(analyze.router, prefix="/debugiq", tags=["Analysis"])
-app.include_router(qa.router, prefix="/qa", tags=["Quality Assurance"])
-app.include_router(doc.router, prefix="/doc", tags=["Documentation"])
+# Cap audio uploads while they stream in (MAX_AUDIO_UPLOAD_BYTES)
+app.add_middleware(UploadSizeLimitMiddleware, path_prefixes=("/voice",))
 
-# Voice Routers
-app.include_router(voice.router, prefix="/voice", tags=["Voice Assistant"])
-app.include_router(voice_interactive_router, prefix="/voice", tags=["Voice Interactive"])
+app.add_middleware(LazyRouterMiddleware, registry=routers)
 
-# Platform Config API
-app.include_router(config.config_router, prefix="/api", tags=["Configuration"])
+@app.on_event("startup")
+def warm_up_routers():
+    routers.warm_up()
 
-# Autonomous Orchestration & Status
-app.include_router(autonomous_router, prefix="/workflow", tags=["Autonomous Workflow"])
+# With several workers (WEB_CONCURRENCY / SHARED_STATE_DB), follow the other workers'
+# status transitions so every worker streams all events and reports the same metrics
+@app.on_event("startup")
+def follow_shared_state():
+    from scripts import shared_state
+    shared_state.start()
 
-# Issue Management
-app.include_router(issues_router, tags=["Issues"])
+# Pre-synthesize frequently spoken phrases (SPEECH_CACHE_PREWARM) in the background
+@app.on_event("startup")
+def prewarm_voice_cache():
+    if not os.getenv("SPEECH_CACHE_PREWARM"):
+        return
 
-# Metrics/Analytics API
-app.include_router(metrics_router, tags=["Metrics"])
+    def prewarm():
+        if routers.load("voice"):
+            from app.api import voice
+            voice.prewarm_speech_cache()
+
+    threading.Thread(target=prewarm, name="speech-cache-prewarm", daemon=True).start()
 
 # Root and health check endpoints
 @app.get("/")
@@ -59,3 +79,8 @@ async def read_root():
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "message": "API is running"}
+
+@app.get("/health/imports")
+async def import_profile():
+    """Which routers have been loaded and how long each import took."""
+    return {"routers": routers.report()}
@@ -1,12 +1,25 @@
-import google.generativeai as genai
 import base64
 from typing import Tuple
 import os
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from scripts import tracing
+from scripts.latency_metrics import LLM_CALL_SECONDS, timed
 
+_genai = None
+
+def _get_genai():
+    # google.generativeai is slow to import; configure it on first use instead of at import
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _genai = genai
+    return _genai
+
+@tracing.traced("llm.gemini_transcribe")
+@timed(LLM_CALL_SECONDS, task="gemini_transcribe")
 def transcribe_audio_bytes(audio_bytes: bytes, mime_type: str = "audio/wav") -> str:
-    model = genai.GenerativeModel("models/gemini-1.5-pro-latest")
+    model = _get_genai().GenerativeModel("models/gemini-1.5-pro-latest")
     response = model.generate_content(
         contents=[{
             "role": "user",
@@ -16,8 +29,10 @@ def transcribe_audio_bytes(audio_bytes: bytes, mime_type: str = "audio/wav") ->
     )
     return response.text
 
+@tracing.traced("llm.gemini_tts")
+@timed(LLM_CALL_SECONDS, task="gemini_tts")
 def synthesize_speech(text: str) -> Tuple[bytes, str]:
-    model = genai.GenerativeModel("models/gemini-1.5-pro-latest")
+    model = _get_genai().GenerativeModel("models/gemini-1.5-pro-latest")
     response = model.generate_content(
         contents=[{"role": "user", "parts": [{"text": f"Say this clearly and naturally: {text}"}]}],
         generation_config={"response_mime_type": "audio/wav"}
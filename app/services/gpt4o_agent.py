@@ -1,19 +1,35 @@
 import os
-import openai
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
-openai.api_base = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+from scripts import tracing
+from scripts.latency_metrics import LLM_CALL_SECONDS
+
+_openai = None
+
+def _get_openai():
+    # Configured on first call rather than at import so app startup stays fast
+    global _openai
+    if _openai is None:
+        import openai
+        openai.api_key = os.getenv("OPENAI_API_KEY")
+        openai.api_base = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+        _openai = openai
+    return _openai
 
 def run_gpt4o_agent(prompt: str, model: str = "gpt-4o", temperature: float = 0.3, system_message: str = "You are a world-class software debugging agent. Be accurate, concise, and professional.") -> str:
     try:
-        response = openai.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=temperature
-        )
+        with tracing.span("llm.call", {"llm.task": "gpt4o_agent", "llm.model": model}) as span, \
+                LLM_CALL_SECONDS.time(task="gpt4o_agent"):
+            response = _get_openai().chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature
+            )
+            usage = getattr(response, "usage", None)
+            if usage:
+                span.set_attributes({"llm.prompt_tokens": usage.prompt_tokens, "llm.completion_tokens": usage.completion_tokens})
         return response.choices[0].message.content.strip()
     except Exception as e:
         return f"[GPT-4o Error]: {str(e)}"
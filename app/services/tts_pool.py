@@ -0,0 +1,108 @@
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+TTS_POOL_WORKERS = int(os.getenv("TTS_POOL_WORKERS", "2"))
+TTS_QUEUE_SIZE = int(os.getenv("TTS_QUEUE_SIZE", "16"))
+TTS_TIMEOUT_SECONDS = float(os.getenv("TTS_TIMEOUT_SECONDS", "30"))
+# pyttsx3 can only render to a path, so each worker owns one scratch file that it
+# overwrites for every job. /dev/shm keeps that file in memory where available.
+TTS_SCRATCH_DIR = os.getenv("TTS_SCRATCH_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+
+
+class TTSPoolBusy(Exception):
+    """Raised when the synthesis queue is full."""
+
+
+def _default_engine_factory():
+    import pyttsx3
+    # Not pyttsx3.init(): it caches one engine per driver, which would hand every worker the same engine
+    return pyttsx3.Engine()
+
+
+class TTSEnginePool:
+    """
+    A fixed set of worker threads, each holding a long-lived TTS engine.
+
+    pyttsx3 engines are not thread-safe and are expensive to create, so every
+    worker initializes its own engine once and then serves jobs from a bounded
+    queue. Audio is returned as bytes; callers never see the scratch files.
+    """
+
+    def __init__(
+        self,
+        workers: int = TTS_POOL_WORKERS,
+        queue_size: int = TTS_QUEUE_SIZE,
+        engine_factory: Callable = _default_engine_factory,
+        scratch_dir: str = TTS_SCRATCH_DIR,
+    ):
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._engine_factory = engine_factory
+        self._scratch_dir = scratch_dir
+        self._threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self._worker, args=(i,), name=f"tts-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self, index: int):
+        engine = None
+        fd, scratch_path = tempfile.mkstemp(prefix=f"debugiq_tts_{os.getpid()}_{index}_", suffix=".wav", dir=self._scratch_dir)
+        os.close(fd)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                text, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue  # Caller timed out before we got to it
+                try:
+                    if engine is None:
+                        engine = self._engine_factory()
+                    engine.save_to_file(text, scratch_path)
+                    engine.runAndWait()
+                    with open(scratch_path, "rb") as f:
+                        future.set_result(f.read())
+                except Exception as e:
+                    # Drop the engine so the next job starts from a fresh one
+                    engine = None
+                    future.set_exception(e)
+        finally:
+            if os.path.exists(scratch_path):
+                os.remove(scratch_path)
+
+    def synthesize(self, text: str, timeout: float = TTS_TIMEOUT_SECONDS) -> bytes:
+        """Synthesizes `text` to WAV bytes, waiting at most `timeout` seconds."""
+        future: Future = Future()
+        try:
+            self._jobs.put_nowait((text, future))
+        except queue.Full:
+            raise TTSPoolBusy("TTS queue is full")
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        for t in self._threads:
+            t.join(timeout=5)
+
+
+_pool: Optional[TTSEnginePool] = None
+_pool_lock = threading.Lock()
+
+def get_tts_pool() -> TTSEnginePool:
+    """Returns the process-wide TTS pool, starting it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = TTSEnginePool()
+    return _pool
@@ -0,0 +1,230 @@
+import asyncio
+import io
+import math
+import os
+import re
+import wave
+from array import array
+from typing import Awaitable, Callable, List, Optional
+
+VOICE_STREAM_BACKEND = os.getenv("VOICE_STREAM_BACKEND", "gemini")  # "gemini" or "local"
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_ENERGY_THRESHOLD = float(os.getenv("VAD_ENERGY_THRESHOLD", "500"))  # RMS of 16-bit samples
+VAD_SILENCE_MS = int(os.getenv("VAD_SILENCE_MS", "600"))  # Trailing silence that ends an utterance
+PARTIAL_TRANSCRIPT_INTERVAL_MS = int(os.getenv("PARTIAL_TRANSCRIPT_INTERVAL_MS", "1000"))
+MAX_UTTERANCE_SECONDS = float(os.getenv("MAX_UTTERANCE_SECONDS", "30"))  # Longer speech is cut into several utterances
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wraps mono 16-bit PCM in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text.strip()) if s.strip()]
+
+
+class EnergyVAD:
+    """
+    Frame-energy voice activity detector for mono 16-bit PCM.
+
+    feed() returns a list of (is_speech, frame) pairs; leftover bytes that don't
+    fill a frame are kept until the next call.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = VAD_FRAME_MS, threshold: float = VAD_ENERGY_THRESHOLD):
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * 2
+        self.threshold = threshold
+        self._pending = b""
+
+    def feed(self, pcm: bytes):
+        data = self._pending + pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._pending = data[usable:]
+        frames = []
+        for start in range(0, usable, self.frame_bytes):
+            frame = data[start:start + self.frame_bytes]
+            samples = array("h", frame)
+            rms = math.sqrt(sum(s * s for s in samples) / len(samples))
+            frames.append((rms >= self.threshold, frame))
+        return frames
+
+
+# --- Backends ---
+
+class GeminiVoiceBackend:
+    """Gemini transcription/response with Google TTS, as used by /voice/interactive."""
+
+    def transcribe(self, wav: bytes) -> str:
+        from app.services.gemini_voice import transcribe_audio_bytes
+        return transcribe_audio_bytes(wav)
+
+    def respond(self, wav: bytes) -> str:
+        from scripts.voice.gemini_voice_bridge import transcribe_and_respond_from_audio
+        return transcribe_and_respond_from_audio(wav)
+
+    def synthesize(self, text: str) -> bytes:
+        from scripts.utils.tts_google import synthesize_speech_to_bytes
+        return synthesize_speech_to_bytes(text)
+
+
+class LocalVoiceBackend:
+    """Deterministic offline stand-in for tests and local development."""
+
+    sample_rate = 16000
+
+    def transcribe(self, wav: bytes) -> str:
+        with wave.open(io.BytesIO(wav)) as w:
+            duration_ms = int(w.getnframes() * 1000 / w.getframerate())
+        return f"[{duration_ms} ms of speech]"
+
+    def respond(self, wav: bytes) -> str:
+        return f"I heard {self.transcribe(wav)}. This is the local voice backend."
+
+    def synthesize(self, text: str) -> bytes:
+        # 10 ms of silence per character keeps the audio size proportional to the text
+        return pcm_to_wav(b"\x00\x00" * (self.sample_rate // 100) * len(text), self.sample_rate)
+
+
+def get_voice_backend(name: str = VOICE_STREAM_BACKEND):
+    if name == "local":
+        return LocalVoiceBackend()
+    return GeminiVoiceBackend()
+
+
+# --- Session ---
+
+class VoiceStreamSession:
+    """
+    Turns a stream of PCM chunks into utterances and streams replies back.
+
+    Messages sent to the client:
+      {"type": "speech_start"}
+      {"type": "partial_transcript", "text": ...}   while the user is speaking
+      {"type": "transcript", "text": ...}           once the utterance ends
+      {"type": "reply_text", "text": ..., "index": n} followed by the audio for
+      that sentence as a binary WAV message
+      {"type": "reply_end"}
+    """
+
+    def __init__(
+        self,
+        backend,
+        send_json: Callable[[dict], Awaitable[None]],
+        send_bytes: Callable[[bytes], Awaitable[None]],
+        sample_rate: int = 16000,
+    ):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self._send_json = send_json
+        self._send_bytes = send_bytes
+        self._vad = EnergyVAD(sample_rate)
+        self._frame_ms = self._vad.frame_bytes * 1000 // (2 * sample_rate)
+        self._max_utterance_bytes = int(MAX_UTTERANCE_SECONDS * sample_rate) * 2
+        self._speech = bytearray()
+        self._in_speech = False
+        self._silence_ms = 0
+        self._since_partial_ms = 0
+        self._partial_task: Optional[asyncio.Task] = None
+        self._utterances: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        self._send_lock = asyncio.Lock()
+        self._worker = asyncio.create_task(self._reply_loop())
+
+    async def _send(self, message):
+        # Partial transcripts and replies come from different tasks
+        async with self._send_lock:
+            if isinstance(message, bytes):
+                await self._send_bytes(message)
+            else:
+                await self._send_json(message)
+
+    async def feed_audio(self, pcm: bytes):
+        for is_speech, frame in self._vad.feed(pcm):
+            if is_speech:
+                if not self._in_speech:
+                    self._in_speech = True
+                    await self._send({"type": "speech_start"})
+                self._silence_ms = 0
+            elif not self._in_speech:
+                continue
+            else:
+                self._silence_ms += self._frame_ms
+
+            self._speech.extend(frame)
+            self._since_partial_ms += self._frame_ms
+
+            if self._silence_ms >= VAD_SILENCE_MS or len(self._speech) >= self._max_utterance_bytes:
+                await self.end_utterance()
+            elif self._since_partial_ms >= PARTIAL_TRANSCRIPT_INTERVAL_MS:
+                self._since_partial_ms = 0
+                if self._partial_task is None or self._partial_task.done():
+                    self._partial_task = asyncio.create_task(self._send_partial(bytes(self._speech)))
+
+    async def _send_partial(self, pcm: bytes):
+        try:
+            text = await asyncio.to_thread(self.backend.transcribe, pcm_to_wav(pcm, self.sample_rate))
+            await self._send({"type": "partial_transcript", "text": text})
+        except Exception as e:
+            print(f"Partial transcription failed: {e}")
+
+    async def end_utterance(self):
+        """Ends the current utterance (silence, length limit or client request) and queues the reply."""
+        if self._speech:
+            await self._utterances.put(bytes(self._speech))
+        self._speech = bytearray()
+        self._in_speech = False
+        self._silence_ms = 0
+        self._since_partial_ms = 0
+
+    async def _reply_loop(self):
+        while True:
+            pcm = await self._utterances.get()
+            if pcm is None:
+                return
+            try:
+                await self._reply(pcm)
+            except Exception as e:
+                await self._send({"type": "error", "message": str(e)})
+
+    async def _reply(self, pcm: bytes):
+        if self._partial_task and not self._partial_task.done():
+            self._partial_task.cancel()
+        wav = pcm_to_wav(pcm, self.sample_rate)
+        transcript, reply = await asyncio.gather(
+            asyncio.to_thread(self.backend.transcribe, wav),
+            asyncio.to_thread(self.backend.respond, wav),
+        )
+        await self._send({"type": "transcript", "text": transcript})
+
+        sentences = split_sentences(reply)
+        # Synthesize one sentence ahead so the next chunk of audio is ready
+        # while the current one is being sent.
+        next_audio = asyncio.ensure_future(asyncio.to_thread(self.backend.synthesize, sentences[0])) if sentences else None
+        for index, sentence in enumerate(sentences):
+            audio = await next_audio
+            if index + 1 < len(sentences):
+                next_audio = asyncio.ensure_future(asyncio.to_thread(self.backend.synthesize, sentences[index + 1]))
+            await self._send({"type": "reply_text", "text": sentence, "index": index})
+            await self._send(audio)
+        await self._send({"type": "reply_end"})
+
+    async def close(self):
+        """Flushes any buffered speech, waits for pending replies and stops the session."""
+        await self.end_utterance()
+        await self._utterances.put(None)
+        await self._worker
+        if self._partial_task and not self._partial_task.done():
+            self._partial_task.cancel()
+
+    def abort(self):
+        """Stops the session immediately, e.g. after the client disconnected."""
+        self._worker.cancel()
+        if self._partial_task and not self._partial_task.done():
+            self._partial_task.cancel()
@@ -1,15 +1,6 @@
-import requests
-import os
+from scripts.git_platform_client import get_git_platform_client
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
 def post_pr_comment(repo_full_name: str, pr_number: str, comment_body: str):
-    url = f"https://api.github.com/repos/{repo_full_name}/issues/{pr_number}/comments"
-    headers = {
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json"
-    }
-    data = {"body": comment_body}
-    response = requests.post(url, headers=headers, json=data)
-    response.raise_for_status()
-    return response.json()
+    # Shared pooled client; raises GitPlatformError on a non-2xx response
+    return get_git_platform_client().post_issue_comment(repo_full_name, pr_number, comment_body)
@@ -1,20 +1,39 @@
 # app/utils/gpt4o_client.py
-from openai import OpenAI
 import os
+import threading
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from scripts import tracing
+from scripts.latency_metrics import LLM_CALL_SECONDS
+
+_client = None
+_client_lock = threading.Lock()
+
+def _get_client():
+    # Importing openai and building the client is slow, so defer it to the first request
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
 
 def run_gpt4o_chat(system_prompt, user_input):
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_input}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
+        with tracing.span("llm.call", {"llm.task": "gpt4o_chat", "llm.model": "gpt-4o"}) as span, \
+                LLM_CALL_SECONDS.time(task="gpt4o_chat"):
+            response = _get_client().chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_input}
+                ],
+                temperature=0.3,
+                max_tokens=1000
+            )
+            usage = getattr(response, "usage", None)
+            if usage:
+                span.set_attributes({"llm.prompt_tokens": usage.prompt_tokens, "llm.completion_tokens": usage.completion_tokens})
         return response.choices[0].message.content.strip()
     except Exception as e:
         print(f"[GPT-4o ERROR] {e}")
@@ -0,0 +1,129 @@
+import importlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from scripts.utils.logger import setup_logger
+
+# Routers to import in the background right after startup: "", "all", or comma-separated names
+ROUTER_WARMUP = os.getenv("ROUTER_WARMUP", "")
+
+logger = setup_logger("lazy_routers")
+
+
+@dataclass
+class LazyRouter:
+    name: str
+    module: str
+    attribute: str = "router"
+    prefix: str = ""
+    tags: List[str] = field(default_factory=list)
+    # URL prefixes this router serves; a request under one of them triggers the import
+    paths: Tuple[str, ...] = ()
+    loaded: bool = False
+    import_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    def serves(self, path: str) -> bool:
+        return any(path == p or path.startswith(p.rstrip("/") + "/") for p in self.paths)
+
+
+class LazyRouterRegistry:
+    """
+    Routers registered by module path and imported (then included in the app)
+    the first time a request reaches one of their URL prefixes, so startup
+    doesn't pay for speech_recognition, the Gemini/OpenAI SDKs or `scripts`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routers: dict = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, module: str, prefix: str = "", tags: List[str] = None,
+                 paths: Tuple[str, ...] = None, attribute: str = "router"):
+        self._routers[name] = LazyRouter(name, module, attribute, prefix, list(tags or []),
+                                         tuple(paths or (prefix,)))
+
+    def pending(self, path: Optional[str] = None) -> List[str]:
+        """Names of routers not yet loaded (that serve `path`, if given)."""
+        return [r.name for r in self._routers.values()
+                if not r.loaded and r.error is None and (path is None or r.serves(path))]
+
+    def load(self, name: str) -> bool:
+        """Imports and includes one router; blocking, so call it off the event loop."""
+        with self._lock:
+            router = self._routers[name]
+            if router.loaded or router.error is not None:
+                return router.loaded
+            started = time.perf_counter()
+            try:
+                module = importlib.import_module(router.module)
+                self.app.include_router(getattr(module, router.attribute), prefix=router.prefix, tags=router.tags)
+            except Exception as e:
+                # A router whose dependencies are missing shouldn't take the rest of the API down
+                router.error = f"{type(e).__name__}: {e}"
+                logger.error("❌ Failed to load router '%s' (%s): %s", name, router.module, router.error)
+                return False
+            finally:
+                router.import_seconds = time.perf_counter() - started
+            router.loaded = True
+            self.app.openapi_schema = None  # Regenerate docs with the new routes
+            logger.info("📦 Loaded router '%s' in %.0f ms", name, router.import_seconds * 1000)
+            return True
+
+    def load_all(self, names: Optional[List[str]] = None):
+        """Loads the named routers, or every router when `names` is None."""
+        for name in list(self._routers) if names is None else names:
+            self.load(name)
+
+    def warm_up(self, spec: str = ROUTER_WARMUP) -> Optional[threading.Thread]:
+        """Loads the routers named in `spec` ("all" or "a,b") in a background thread."""
+        spec = (spec or "").strip()
+        if not spec:
+            return None
+        names = None
+        if spec != "all":
+            requested = [n.strip() for n in spec.split(",") if n.strip()]
+            names = [n for n in requested if n in self._routers]
+            unknown = [n for n in requested if n not in self._routers]
+            if unknown:
+                logger.warning("Ignoring unknown routers in ROUTER_WARMUP: %s (known: %s)",
+                               ", ".join(unknown), ", ".join(self._routers))
+            if not names:
+                return None
+        thread = threading.Thread(target=self.load_all, args=(names,), name="router-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> List[dict]:
+        """Import-time profile: slowest routers first, unloaded ones last."""
+        rows = [{
+            "name": r.name,
+            "module": r.module,
+            "loaded": r.loaded,
+            "import_ms": round(r.import_seconds * 1000, 1) if r.import_seconds is not None else None,
+            "error": r.error,
+        } for r in self._routers.values()]
+        return sorted(rows, key=lambda row: -(row["import_ms"] or -1))
+
+
+class LazyRouterMiddleware:
+    """Loads the routers a request needs before it is routed; docs pages need all of them."""
+
+    def __init__(self, app, registry: LazyRouterRegistry, docs_paths=("/docs", "/redoc", "/openapi.json")):
+        self.app = app
+        self.registry = registry
+        self.docs_paths = tuple(docs_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            pending = self.registry.pending() if path.startswith(self.docs_paths) else self.registry.pending(path)
+            for name in pending:
+                await run_in_threadpool(self.registry.load, name)
+        await self.app(scope, receive, send)
@@ -0,0 +1,55 @@
+import os
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+
+MAX_AUDIO_UPLOAD_BYTES = int(os.getenv("MAX_AUDIO_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects request bodies above `max_bytes` for the given path prefixes.
+
+    The declared Content-Length is checked before anything is read, and the
+    body is counted as it streams in, so an oversized (or chunked) upload is
+    cut off at the limit instead of being buffered in full first.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_AUDIO_UPLOAD_BYTES, path_prefixes=("/voice",)):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                response = JSONResponse(status_code=413, content={"detail": self._detail()})
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # HTTPException passes through FastAPI's body parsing untouched
+                    raise HTTPException(status_code=413, detail=self._detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _detail(self) -> str:
+        return f"Upload exceeds the {self.max_bytes} byte limit"
+
+
+def ensure_upload_size(file: UploadFile, max_bytes: int = MAX_AUDIO_UPLOAD_BYTES) -> None:
+    """Backstop for routes mounted without the middleware."""
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes} byte limit")
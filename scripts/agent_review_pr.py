@@ -1,14 +1,234 @@
 import os
+import re
 import sys
 import json
-import logging
+import hashlib
+import tempfile
+import threading
 import argparse
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 
-from debugiq_agents.utils import ai_api_client, platform_data_api
-from debugiq_agents.core.logger import get_logger
+from scripts import patch_engine, platform_data_api, tracing
+from scripts.latency_metrics import LLM_CALL_SECONDS
+from scripts.utils.logger import setup_logger
+
+logger = setup_logger("agent_review_pr")
+
+PR_REVIEW_TASK_TYPE = "pr_review"
+# Chunks reviewed at once; bounded so a huge PR doesn't flood the AI provider
+REVIEW_MAX_CONCURRENCY = int(os.getenv("REVIEW_MAX_CONCURRENCY", "4"))
+# Upper bound on the diff text sent per review request
+REVIEW_CHUNK_MAX_CHARS = int(os.getenv("REVIEW_CHUNK_MAX_CHARS", "12000"))
+# Per-PR findings keyed by hunk content, reused on re-review. Empty string disables it.
+REVIEW_CACHE_DIR = os.getenv("REVIEW_CACHE_DIR", os.path.join(tempfile.gettempdir(), "debugiq_review_cache"))
+
+REVIEW_CATEGORIES = ("potential_issues", "suggestions", "security_concerns", "suggested_tests")
+
+
+@dataclass
+class ReviewHunk:
+    hunk_id: str
+    path: str
+    text: str
+
+    @property
+    def key(self) -> str:
+        """Content hash of the hunk; line numbers are left out so a hunk that only moved still matches."""
+        body = self.text.split("\n", 1)[1] if self.text.startswith("@@") and "\n" in self.text else self.text
+        return hashlib.sha256(f"{self.path}\x00{body}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ReviewChunk:
+    path: str
+    hunks: List[ReviewHunk] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(f"[{hunk.hunk_id}]\n{hunk.text}" for hunk in self.hunks)
+
+
+def _hunk_text(hunk: patch_engine.Hunk) -> str:
+    header = f"@@ -{hunk.old_start},{hunk.old_count} +{hunk.new_start},{hunk.new_count} @@ {hunk.section}".rstrip()
+    return "\n".join([header] + hunk.lines)
+
+
+def _split_oversized(text: str, max_chars: int) -> List[str]:
+    """Splits one huge hunk on line boundaries so no request exceeds max_chars."""
+    pieces, current, size = [], [], 0
+    for line in text.splitlines():
+        if current and size + len(line) + 1 > max_chars:
+            pieces.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def _diff_hunks(code_diff: str, max_chars: int) -> List[ReviewHunk]:
+    try:
+        file_patches = patch_engine.parse_unified_diff(code_diff, recount=True)
+    except patch_engine.PatchParseError:
+        # Not parseable as a unified diff; review it as plain text in bounded pieces
+        return [ReviewHunk(f"H{i + 1}", "(diff)", piece) for i, piece in enumerate(_split_oversized(code_diff, max_chars))]
+
+    hunks = []
+    for file_patch in file_patches:
+        for hunk in file_patch.hunks:
+            for piece in _split_oversized(_hunk_text(hunk), max_chars):
+                hunks.append(ReviewHunk(f"H{len(hunks) + 1}", file_patch.path, piece))
+    return hunks
+
+
+def pack_chunks(hunks: List[ReviewHunk], max_chars: int = REVIEW_CHUNK_MAX_CHARS) -> List[ReviewChunk]:
+    """Groups consecutive hunks of the same file into chunks of at most `max_chars` of diff text."""
+    chunks: List[ReviewChunk] = []
+    size = 0
+    for hunk in hunks:
+        if not chunks or chunks[-1].path != hunk.path or size + len(hunk.text) > max_chars:
+            chunks.append(ReviewChunk(path=hunk.path))
+            size = 0
+        chunks[-1].hunks.append(hunk)
+        size += len(hunk.text)
+    return chunks
+
+
+def split_diff_into_chunks(code_diff: str, max_chars: int = REVIEW_CHUNK_MAX_CHARS) -> List[ReviewChunk]:
+    """
+    Splits a PR diff into per-file chunks of consecutive hunks, each at most
+    `max_chars` of diff text. Every hunk gets an id (H1, H2, ...) that the
+    reviewer uses to attribute its findings.
+    """
+    return pack_chunks(_diff_hunks(code_diff, max_chars), max_chars)
+
+
+class ReviewCache:
+    """
+    Findings of earlier reviews of a PR, keyed by hunk content hash.
+
+    Stored per PR along with the head commit they were produced for; only
+    hunks still present in the latest diff are kept.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = REVIEW_CACHE_DIR):
+        self.cache_dir = cache_dir or None
+        self._memory: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, pr_id: str) -> str:
+        return os.path.join(self.cache_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", pr_id) + ".json")
+
+    def load(self, pr_id: str) -> dict:
+        with self._lock:
+            if pr_id in self._memory:
+                return self._memory[pr_id]
+        entry = {"head_sha": None, "hunks": {}}
+        if self.cache_dir:
+            try:
+                with open(self._path(pr_id), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                pass
+        with self._lock:
+            self._memory[pr_id] = entry
+        return entry
+
+    def save(self, pr_id: str, head_sha: Optional[str], hunks: Dict[str, List[dict]]):
+        entry = {"head_sha": head_sha, "hunks": hunks}
+        with self._lock:
+            self._memory[pr_id] = entry
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(pr_id)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(pr_id))
+        except OSError as e:
+            logger.warning(f"Could not persist review cache for PR {pr_id}: {e}")
+
+
+review_cache = ReviewCache()
+
+
+def _call_ai(task_type: str, prompt: str) -> str:
+    from scripts.utils.ai_api_clients import call_ai_agent
+    with tracing.span("llm.call", {"llm.task": task_type, "llm.prompt_chars": len(prompt)}) as span, \
+            LLM_CALL_SECONDS.time(task=task_type):
+        response = call_ai_agent(task_type, prompt)
+        span.set_attribute("llm.response_chars", len(response))
+        return response
+
+
+def _parse_findings(raw: str, chunk: ReviewChunk) -> List[dict]:
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("\n", 1)[1] if "\n" in raw else ""
+        if raw.rstrip().endswith("```"):
+            raw = raw.rstrip()[:-3]
+    data = json.loads(raw)
+    hunk_ids = {hunk.hunk_id for hunk in chunk.hunks}
+    findings = []
+    for item in data.get("findings", []):
+        category = item.get("category")
+        text = (item.get("text") or "").strip()
+        if category not in REVIEW_CATEGORIES + ("summary",) or not text:
+            continue
+        hunk_id = item.get("hunk") if item.get("hunk") in hunk_ids else chunk.hunks[0].hunk_id
+        findings.append({"hunk": hunk_id, "category": category, "text": text})
+    return findings
+
+
+def review_chunk(chunk: ReviewChunk, pr_context: str, ai_call: Callable[[str, str], str] = _call_ai) -> List[dict]:
+    """Reviews one chunk and returns its findings, each tagged with the hunk it refers to."""
+    prompt = f"""
+You are reviewing part of a pull request. Only the hunks below are in scope.
+
+{pr_context}
+
+File: {chunk.path}
+Each hunk is labelled with an id in square brackets.
+
+```diff
+{chunk.text}
+```
+
+Respond with JSON only:
+{{"findings": [{{"hunk": "<hunk id>", "category": "<summary|potential_issues|suggestions|security_concerns|suggested_tests>", "text": "<one finding>"}}]}}
+Give one "summary" finding per hunk describing what it changes.
+"""
+    return _parse_findings(ai_call(PR_REVIEW_TASK_TYPE, prompt), chunk)
+
+
+def merge_findings(chunks: List[ReviewChunk], findings_by_hunk: Dict[str, List[dict]], failed_chunks: int = 0, note: str = "") -> Dict[str, str]:
+    """Reduces per-hunk findings into the review structure, grouped by file and de-duplicated."""
+    sections = {category: [] for category in ("summary",) + REVIEW_CATEGORIES}
+    seen = set()
+    for chunk in chunks:
+        for hunk in chunk.hunks:
+            for finding in findings_by_hunk.get(hunk.hunk_id, []):
+                key = (chunk.path, finding["category"], finding["text"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                sections[finding["category"]].append(f"- `{chunk.path}`: {finding['text']}")
+
+    files = list(dict.fromkeys(chunk.path for chunk in chunks))
+    header = f"Reviewed {len(files)} file(s) in {len(chunks)} chunk(s)."
+    if failed_chunks:
+        header += f" {failed_chunks} chunk(s) could not be reviewed."
+    if note:
+        header += f" {note}"
+    review = {"summary": "\n".join([header] + sections.pop("summary"))}
+    for category in REVIEW_CATEGORIES:
+        review[category] = "\n".join(sections[category]) or "None identified."
+    return review
 
-logger = get_logger("agent_review_pr")
 
 def review_pull_request(
     pr_id: str,
@@ -17,11 +237,22 @@ def review_pull_request(
     target_branch: str,
     pr_title: str,
     pr_description: str,
-    code_diff: str
+    code_diff: str,
+    max_concurrency: int = REVIEW_MAX_CONCURRENCY,
+    ai_call: Callable[[str, str], str] = _call_ai,
+    head_sha: Optional[str] = None,
+    cache: Optional[ReviewCache] = review_cache,
 ) -> Optional[Dict[str, str]]:
     """
     Uses the AI agent to perform a structured review of a pull request.
 
+    The diff is split into per-file hunk groups that are reviewed concurrently
+    (at most `max_concurrency` at a time) and the findings merged, so latency
+    follows the largest chunk rather than the size of the whole PR.
+
+    Findings are cached per hunk content, so re-reviewing a PR after a
+    follow-up push (`head_sha`) only sends the hunks that changed.
+
     Returns:
         dict: {
             summary: str,
@@ -41,18 +272,103 @@ def review_pull_request(
         logger.warning(f"No linked issue info for PR {pr_id}: {e}")
         linked_issue_info = "N/A"
 
-    # --- Build Prompt ---
-    prompt = f"""
-You are reviewing a pull request.
-
-Repository: {repository_url}
+    pr_context = f"""Repository: {repository_url}
 Merging: {source_branch} → {target_branch}
 Title: {pr_title}
 Description:
 {pr_description}
 
-Linked Issue Info: {linked_issue_info}
+Linked Issue Info: {linked_issue_info}"""
 
-Code Diff:
-```diff
-{code_diff}
+    hunks = _diff_hunks(code_diff, REVIEW_CHUNK_MAX_CHARS)
+    if not hunks:
+        logger.warning(f"PR {pr_id} has an empty diff; nothing to review.")
+        return None
+    chunks = pack_chunks(hunks)
+
+    # --- Reuse findings for hunks unchanged since the last reviewed head ---
+    previous = cache.load(pr_id) if cache else {"head_sha": None, "hunks": {}}
+    findings_by_hunk: Dict[str, List[dict]] = {}
+    pending = []
+    for hunk in hunks:
+        cached = previous["hunks"].get(hunk.key)
+        if cached is None:
+            pending.append(hunk)
+        else:
+            findings_by_hunk[hunk.hunk_id] = [dict(finding, hunk=hunk.hunk_id) for finding in cached]
+    pending_chunks = pack_chunks(pending)
+    logger.info(
+        f"PR {pr_id}: {len(pending)} of {len(hunks)} hunk(s) to review in {len(pending_chunks)} chunk(s)"
+        + (f", the rest reused from {previous['head_sha']}" if len(pending) < len(hunks) else "")
+    )
+
+    # --- Map: review chunks concurrently ---
+    def review(chunk):
+        try:
+            return chunk, review_chunk(chunk, pr_context, ai_call)
+        except Exception as e:
+            logger.error(f"Review of {chunk.path} ({len(chunk.hunks)} hunks) failed: {e}")
+            return chunk, None
+
+    failed = 0
+    reviewed_ids = set()
+    if pending_chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(pending_chunks))), thread_name_prefix="pr-review") as pool:
+            for chunk, findings in pool.map(tracing.wrap(review), pending_chunks):
+                if findings is None:
+                    failed += 1
+                    continue
+                reviewed_ids.update(hunk.hunk_id for hunk in chunk.hunks)
+                for finding in findings:
+                    findings_by_hunk.setdefault(finding["hunk"], []).append(finding)
+
+    if pending_chunks and failed == len(pending_chunks) and len(pending) == len(hunks):
+        logger.error(f"All review chunks failed for PR {pr_id}")
+        return None
+
+    if cache:
+        # Keep findings for every hunk in the current diff that has been reviewed at some point
+        cache.save(pr_id, head_sha, {
+            hunk.key: [{k: v for k, v in finding.items() if k != "hunk"} for finding in findings_by_hunk.get(hunk.hunk_id, [])]
+            for hunk in hunks
+            if hunk.hunk_id in reviewed_ids or hunk.key in previous["hunks"]
+        })
+
+    # --- Reduce: merge into the review structure ---
+    reused = len(hunks) - len(pending)
+    note = f"Reused findings for {reused} unchanged hunk(s)." if reused else ""
+    return merge_findings(chunks, findings_by_hunk, failed, note)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI review of a pull request diff")
+    parser.add_argument("--pr-id", required=True)
+    parser.add_argument("--repo-url", required=True)
+    parser.add_argument("--source-branch", required=True)
+    parser.add_argument("--target-branch", required=True)
+    parser.add_argument("--pr-title", required=True)
+    parser.add_argument("--pr-description", default="")
+    parser.add_argument("--diff-file", required=True, help="Path to the unified diff to review")
+    parser.add_argument("--head-sha", help="Head commit of the PR; findings for unchanged hunks are reused on re-review")
+    args = parser.parse_args()
+
+    with open(args.diff_file, "r", encoding="utf-8") as f:
+        code_diff = f.read()
+
+    result = review_pull_request(
+        pr_id=args.pr_id,
+        repository_url=args.repo_url,
+        source_branch=args.source_branch,
+        target_branch=args.target_branch,
+        pr_title=args.pr_title,
+        pr_description=args.pr_description,
+        code_diff=code_diff,
+        head_sha=args.head_sha
+    )
+    if result is None:
+        sys.exit(1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
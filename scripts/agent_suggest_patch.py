@@ -1,9 +1,12 @@
 # scripts/agent_suggest_patch.py
 
 import json
-import traceback
-from scripts import platform_data_api
+from scripts import platform_data_api, tracing
+from scripts.latency_metrics import LLM_CALL_SECONDS
 from scripts.utils.ai_api_clients import call_ai_agent  # ✅ Absolute import with PYTHONPATH=/app
+from scripts.utils.logger import setup_logger
+
+logger = setup_logger("agent_suggest_patch")
 
 PATCH_SUGGESTION_TASK_TYPE = "patch_suggestion"
 
@@ -11,11 +14,11 @@ def agent_suggest_patch(issue_id: str, diagnosis: dict) -> dict | None:
     """
     Uses AI to suggest a code patch based on the diagnosis.
     """
-    print(f"[🩹] Suggesting patch for issue: {issue_id}")
+    logger.info("[🩹] Suggesting patch for issue: %s", issue_id)
 
     repo_info = platform_data_api.get_repository_info_for_issue(issue_id)
     if not repo_info:
-        print(f"[❌] Repository info not found for issue {issue_id}")
+        logger.error("[❌] Repository info not found for issue %s", issue_id)
         return None
 
     files_to_fetch = list(set(
@@ -24,12 +27,12 @@ def agent_suggest_patch(issue_id: str, diagnosis: dict) -> dict | None:
     ))
 
     if not files_to_fetch:
-        print(f"[⚠️] No relevant files to fetch for {issue_id}")
+        logger.warning("[⚠️] No relevant files to fetch for %s", issue_id)
         return None
 
     code_context = platform_data_api.fetch_code_context(repo_info["repository_url"], files_to_fetch)
     if not code_context or code_context.strip() == "":
-        print(f"[❌] Code context unavailable for {issue_id}")
+        logger.error("[❌] Code context unavailable for %s", issue_id)
         return None
 
     prompt = f"""
@@ -57,7 +60,10 @@ Explanation:
 """
 
     try:
-        response = call_ai_agent(PATCH_SUGGESTION_TASK_TYPE, prompt)
+        with tracing.span("llm.call", {"llm.task": PATCH_SUGGESTION_TASK_TYPE, "llm.prompt_chars": len(prompt)}) as span, \
+                LLM_CALL_SECONDS.time(task=PATCH_SUGGESTION_TASK_TYPE):
+            response = call_ai_agent(PATCH_SUGGESTION_TASK_TYPE, prompt)
+            span.set_attribute("llm.response_chars", len(response) if isinstance(response, str) else None)
 
         # Parse as JSON if returned that way, else treat as plain string
         if isinstance(response, str):
@@ -74,6 +80,5 @@ Explanation:
         }
 
     except Exception as e:
-        print(f"[🔥] Error generating patch for {issue_id}: {e}")
-        traceback.print_exc()
+        logger.exception("[🔥] Error generating patch for %s: %s", issue_id, e)
         return None
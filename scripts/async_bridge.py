@@ -0,0 +1,63 @@
+# DebugIQ-backend/scripts/async_bridge.py
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    One event loop per process, running in a daemon thread, that executes the
+    async implementations on behalf of synchronous callers. Sharing it means
+    every caller's subprocesses are multiplexed by one selector rather than each
+    blocked thread reading its own pipes.
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="debugiq-async-bridge", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Runs `coro` on the background loop and blocks until it finishes. The caller's
+    contextvars (current span, pending issue_update) are copied into the task.
+    Must not be called from the background loop itself.
+    """
+    loop = get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the background loop; await the coroutine instead")
+
+    result: concurrent.futures.Future = concurrent.futures.Future()
+
+    def start():
+        task = loop.create_task(coro)
+
+        def done(task: asyncio.Task):
+            if task.cancelled():
+                result.cancel()
+            elif task.exception() is not None:
+                result.set_exception(task.exception())
+            else:
+                result.set_result(task.result())
+
+        task.add_done_callback(done)
+
+    loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+    return result.result(timeout)
@@ -1,34 +1,37 @@
 import os
 import json
-import traceback
-from scripts import platform_data_api
+from scripts import platform_data_api, tracing
+from scripts.latency_metrics import LLM_CALL_SECONDS
+from scripts.utils.logger import setup_logger
 from utils.ai_api_client import call_ai_agent
 
+logger = setup_logger("autonomous_diagnose_issue")
+
 
 DIAGNOSIS_TASK_TYPE = "diagnosis"
 
 def autonomous_diagnose(issue_id: str) -> dict | None:
-    print(f"🔬 Starting autonomous diagnosis for issue: {issue_id}")
+    logger.info("🔬 Starting autonomous diagnosis for issue: %s", issue_id)
     issue_details = platform_data_api.fetch_issue_details(issue_id)
     if not issue_details:
-        print(f"❌ Diagnosis failed: Issue {issue_id} not found.")
+        logger.error("❌ Diagnosis failed: Issue %s not found.", issue_id)
         return None
 
     repo_info = platform_data_api.get_repository_info_for_issue(issue_id)
     if not repo_info:
-        print(f"⚠️ Repository not linked for issue {issue_id}. Proceeding with diagnosis without code context.")
+        logger.warning("⚠️ Repository not linked for issue %s. Proceeding with diagnosis without code context.", issue_id)
         code_context = "Repository not linked, code context not available."
     else:
         files_to_fetch = list(set(issue_details.get("relevant_files", [])))
         if not files_to_fetch:
-            print(f"⚠️ No specific relevant files for issue {issue_id} mentioned in issue details.")
+            logger.warning("⚠️ No specific relevant files for issue %s mentioned in issue details.", issue_id)
 
         code_context = platform_data_api.fetch_code_context(
             repo_info.get("repository_url"),
             files_to_fetch
         )
         if not code_context or code_context.strip() == "":
-            print(f"⚠️ Could not fetch code context or context is empty for issue {issue_id}. Proceeding without full context.")
+            logger.warning("⚠️ Could not fetch code context or context is empty for issue %s. Proceeding without full context.", issue_id)
             code_context = "Could not fetch code context or context is empty."
 
     logs = issue_details.get("logs", "No logs provided.")
@@ -53,9 +56,12 @@ Code:
 """
 
     try:
-        print(f"Calling AI for diagnosis (task_type='{DIAGNOSIS_TASK_TYPE}')...")
-        ai_raw_response = call_ai_agent(DIAGNOSIS_TASK_TYPE, analysis_prompt)
-        print("AI raw response received.")
+        logger.info("Calling AI for diagnosis (task_type='%s')...", DIAGNOSIS_TASK_TYPE)
+        with tracing.span("llm.call", {"llm.task": DIAGNOSIS_TASK_TYPE, "llm.prompt_chars": len(analysis_prompt)}) as span, \
+                LLM_CALL_SECONDS.time(task=DIAGNOSIS_TASK_TYPE):
+            ai_raw_response = call_ai_agent(DIAGNOSIS_TASK_TYPE, analysis_prompt)
+            span.set_attribute("llm.response_chars", len(ai_raw_response))
+        logger.info("AI raw response received.")
 
         if ai_raw_response.strip().startswith("```json"):
             ai_raw_response = ai_raw_response.strip()[len("```json"):].strip()
@@ -79,14 +85,13 @@ Code:
         }
 
         if diagnosis_details["ai_confidence_score"] < 0.5 or not diagnosis_details["root_cause"]:
-            print(f"⚠️ Low confidence or incomplete root cause for issue {issue_id}")
+            logger.warning("⚠️ Low confidence or incomplete root cause for issue %s", issue_id)
             return None
 
-        print(f"✅ Diagnosis complete for issue: {issue_id}")
+        logger.info("✅ Diagnosis complete for issue: %s", issue_id)
         return diagnosis_details
 
     except Exception as e:
         platform_data_api.update_issue_status(issue_id, "Diagnosis Error")
-        print(f"❌ Error during AI diagnosis for issue {issue_id}: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error during AI diagnosis for issue %s: %s", issue_id, e)
         return None
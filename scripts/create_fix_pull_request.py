@@ -1,17 +1,115 @@
-# Recreate the path after execution environment reset
-from pathlib import Path
-
-create_fix_path = Path("/mnt/data/DebugIQ-backend/scripts/create_fix_pull_request.py")
-create_fix_path.parent.mkdir(parents=True, exist_ok=True)
-
-# Write the minimal stub again
-stub_code = '''
-def create_pull_request(issue_id, branch_name, code_diff, diagnosis_details, validation_results):
-    return {
-        "url": f"https://mock.github.com/pulls/{issue_id}",
-        "title": f"fix({issue_id}): Stub PR",
-        "body": f"Autogenerated PR for {issue_id}. Patch:\\n```diff\\n{code_diff}\\n```"
-    }
-'''.strip()
-
-create_fix_path.write_text(stub_code + "\n")
+# DebugIQ-backend/scripts/create_fix_pull_request.py
+
+import os
+
+from scripts import diff_engine, patch_engine, platform_data_api
+from scripts.utils.logger import setup_logger
+
+logger = setup_logger("create_fix_pull_request")
+
+# Keep PR bodies under the Git platform's size limit (GitHub rejects bodies over 65536 chars)
+PR_BODY_MAX_DIFF_CHARS = int(os.getenv("PR_BODY_MAX_DIFF_CHARS", "50000"))
+
+
+def normalize_diff(code_diff: str, original_files: dict) -> str:
+    """
+    Re-renders the patch from the files it produces, so the PR shows a canonical
+    diff (correct hunk headers, consistent context) rather than the raw LLM text.
+    Falls back to the patch as given if it can't be applied in memory.
+    """
+    result = patch_engine.apply_patch(code_diff, original_files)
+    if not result.ok:
+        return code_diff
+    patches = patch_engine.parse_unified_diff(code_diff)
+    rendered = []
+    for file_patch, file_result in zip(patches, result.files):
+        before = "" if file_patch.is_new else original_files.get(file_patch.old_path, "")
+        after = file_result.content or ""
+        fromfile = "/dev/null" if file_patch.is_new else f"a/{file_patch.old_path}"
+        tofile = "/dev/null" if file_patch.is_deleted else f"b/{file_patch.new_path}"
+        rendered.append(diff_engine.unified_diff(before, after, fromfile=fromfile, tofile=tofile))
+    return "".join(rendered)
+
+
+def diff_stat(code_diff: str) -> list:
+    """(path, added, removed) per file in the patch."""
+    try:
+        patches = patch_engine.parse_unified_diff(code_diff, recount=True)
+    except patch_engine.PatchParseError:
+        return []
+    stats = []
+    for file_patch in patches:
+        added = sum(1 for hunk in file_patch.hunks for line in hunk.lines if line[0] == "+")
+        removed = sum(1 for hunk in file_patch.hunks for line in hunk.lines if line[0] == "-")
+        stats.append((file_patch.path, added, removed))
+    return stats
+
+
+def build_pr_body(issue_id: str, code_diff: str, diagnosis_details: dict, validation_results: dict, original_files: dict = None) -> str:
+    """Markdown PR description: root cause, validation outcome, changed files and the patch."""
+    diagnosis_details = diagnosis_details or {}
+    validation_results = validation_results or {}
+    lines = [f"Automated fix for issue **{issue_id}** generated by DebugIQ.", ""]
+
+    lines += ["## Root cause", diagnosis_details.get("root_cause") or "_Not available._", ""]
+    if diagnosis_details.get("detailed_analysis"):
+        lines += ["<details><summary>Analysis</summary>", "", diagnosis_details["detailed_analysis"], "", "</details>", ""]
+
+    lines.append("## Validation")
+    checks = validation_results.get("checks_run") or []
+    if checks:
+        lines += ["| Check | Status |", "| --- | --- |"]
+        lines += [f"| {check.get('check')} | {check.get('status')} |" for check in checks]
+    else:
+        lines.append("_No validation results recorded._")
+    lines.append("")
+
+    stats = diff_stat(code_diff)
+    if stats:
+        lines.append("## Changes")
+        lines += [f"- `{path}` (+{added} / -{removed})" for path, added, removed in stats]
+        lines.append("")
+
+    rendered_diff = normalize_diff(code_diff, original_files) if original_files is not None else code_diff
+    if len(rendered_diff) > PR_BODY_MAX_DIFF_CHARS:
+        rendered_diff = rendered_diff[:PR_BODY_MAX_DIFF_CHARS] + "\n... (diff truncated; see the Files tab)\n"
+    lines += ["## Patch", "```diff", rendered_diff.rstrip("\n"), "```"]
+    return "\n".join(lines)
+
+
+def create_pull_request(issue_id, branch_name, code_diff, diagnosis_details, validation_results, base_branch=None):
+    """
+    Pushes the patch to `branch_name` and opens a pull request for it.
+
+    Returns the platform's PR details, or a dict with an "error" key.
+    """
+    logger.info("📬 Creating pull request for issue %s on branch %s...", issue_id, branch_name)
+    repo_info = platform_data_api.get_repository_info_for_issue(issue_id)
+    if not repo_info:
+        return {"error": f"Repository info not available for issue {issue_id}"}
+    base_branch = base_branch or repo_info.get("default_branch", "main")
+
+    try:
+        # Usually already in the blob cache from the workflow's patch pre-check
+        paths = patch_engine.paths_needed(code_diff)
+        original_files = platform_data_api.fetch_file_contents(
+            repo_info["repository_url"], paths, ref=base_branch,
+            auth_token=repo_info.get("auth_token"),
+            platform_type=repo_info.get("platform_type", "github")
+        ) if paths else {}
+
+        body = build_pr_body(issue_id, code_diff, diagnosis_details, validation_results, original_files)
+        root_cause = ((diagnosis_details or {}).get("root_cause") or "automated fix").strip().splitlines()[0]
+        title = f"fix({issue_id}): {root_cause[:72]}"
+
+        branch = platform_data_api.apply_patch_and_create_branch(repo_info["repository_url"], base_branch, branch_name, code_diff, issue_id)
+        if not branch or not branch.get("pushed"):
+            # Nothing was pushed, so there is no branch to open a PR from
+            reason = (branch or {}).get("reason", "branch was not pushed")
+            logger.warning("⚠️ Not opening a pull request for issue %s: %s", issue_id, reason)
+            return {"error": f"No pull request created for {branch_name}: {reason}"}
+        return platform_data_api.create_pull_request_on_platform(issue_id, branch_name, base_branch, title, body)
+
+    except Exception as e:
+        logger.exception("❌ Error creating pull request for issue %s: %s", issue_id, e)
+        return {"error": f"Failed to create pull request: {e}"}
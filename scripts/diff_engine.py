@@ -0,0 +1,326 @@
+# DebugIQ-backend/scripts/diff_engine.py
+
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+# "histogram" (git's default for readable diffs of source code) or "myers"
+DIFF_ALGORITHM = os.getenv("DIFF_ALGORITHM", "histogram")
+# Above this many differing lines (after trimming the common prefix/suffix) diffs are delegated to git
+DIFF_GIT_THRESHOLD_LINES = int(os.getenv("DIFF_GIT_THRESHOLD_LINES", "20000"))
+DIFF_GIT_TIMEOUT_SECONDS = float(os.getenv("DIFF_GIT_TIMEOUT_SECONDS", "60"))
+# Lines occurring more often than this in a region are not used as histogram anchors
+_HISTOGRAM_MAX_CHAIN = 64
+# Edit distance beyond which Myers gives up on a region and reports it as replaced
+_MYERS_MAX_COST = int(os.getenv("DIFF_MYERS_MAX_COST", "2000"))
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def intern_lines(a: List[str], b: List[str]) -> Tuple[List[int], List[int]]:
+    """Maps every distinct line to a small integer so comparisons are integer compares."""
+    ids: Dict[str, int] = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b]
+    return a_ids, b_ids
+
+
+def common_affixes(a: List[int], b: List[int]) -> Tuple[int, int]:
+    """Lengths of the common prefix and (non-overlapping) common suffix."""
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+def _myers(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """
+    Matched (i, j) pairs of a shortest edit script for a[alo:ahi] vs b[blo:bhi]
+    (Myers, O(ND)). Regions needing more than _MYERS_MAX_COST edits are reported
+    as one replaced block rather than spending quadratic memory on the trace.
+    """
+    n, m = ahi - alo, bhi - blo
+    if n == 0 or m == 0:
+        return []
+    max_d = min(n + m, _MYERS_MAX_COST)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        trace.append(v[offset - d - 1:offset + d + 2])  # Only diagonals -d-1..d+1 are read back
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+    else:
+        return []
+
+    matches = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        saved = trace[d]  # saved[0] is diagonal -d-1
+        k = x - y
+        if k == -d or (k != d and saved[k - 1 + d + 1] < saved[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = saved[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((alo + x, blo + y))
+        x, y = prev_x, prev_y
+    matches.reverse()
+    return matches
+
+
+def _histogram(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """
+    Histogram diff: anchor on the longest common run around the rarest shared
+    line, then split the problem around it. Regions without a usable anchor
+    fall back to Myers.
+    """
+    matches = []
+    stack = [(alo, ahi, blo, bhi)]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo >= ahi or blo >= bhi:
+            continue
+
+        occurrences: Dict[int, List[int]] = {}
+        for i in range(alo, ahi):
+            occurrences.setdefault(a[i], []).append(i)
+
+        # Rarest line wins, then the longest run; ties go to the run that keeps both sides
+        # aligned, then to the one nearest the middle so splits stay balanced
+        best = None  # (rank, run length, start in a, start in b)
+        middle = (alo + ahi) // 2
+        has_common = False
+        j = blo
+        while j < bhi:
+            positions = occurrences.get(b[j])
+            next_j = j + 1
+            if positions:
+                has_common = True
+                count = len(positions)
+                if count <= _HISTOGRAM_MAX_CHAIN and (best is None or count <= best[0][0]):
+                    for i in positions:
+                        si, sj = i, j
+                        while si > alo and sj > blo and a[si - 1] == b[sj - 1]:
+                            si -= 1
+                            sj -= 1
+                        ei, ej = i + 1, j + 1
+                        while ei < ahi and ej < bhi and a[ei] == b[ej]:
+                            ei += 1
+                            ej += 1
+                        rank = (count, -(ei - si), abs((si - alo) - (sj - blo)), abs(si - middle))
+                        if best is None or rank < best[0]:
+                            best = (rank, ei - si, si, sj)
+                        next_j = max(next_j, ej)  # Lines inside this run can't anchor a better one
+            j = next_j
+
+        if best is None:
+            if has_common:
+                matches.extend(_myers(a, b, alo, ahi, blo, bhi))
+            continue
+        _, length, si, sj = best
+        matches.extend((si + t, sj + t) for t in range(length))
+        stack.append((alo, si, blo, sj))
+        stack.append((si + length, ahi, sj + length, bhi))
+
+    matches.sort()
+    return matches
+
+
+def _opcodes_from_matches(matches: List[Tuple[int, int]], n: int, m: int) -> List[Opcode]:
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for mi, mj in matches + [(n, m)]:
+        if i < mi and j < mj:
+            opcodes.append(("replace", i, mi, j, mj))
+        elif i < mi:
+            opcodes.append(("delete", i, mi, j, j))
+        elif j < mj:
+            opcodes.append(("insert", i, i, j, mj))
+        if mi < n and mj < m:
+            if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == mi:
+                tag, i1, _, j1, _ = opcodes.pop()
+                opcodes.append(("equal", i1, mi + 1, j1, mj + 1))
+            else:
+                opcodes.append(("equal", mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return opcodes
+
+
+def diff_opcodes(a: List[str], b: List[str], algorithm: str = DIFF_ALGORITHM) -> List[Opcode]:
+    """difflib-style opcodes ('equal', 'replace', 'delete', 'insert') turning `a` into `b`."""
+    a_ids, b_ids = intern_lines(a, b)
+    prefix, suffix = common_affixes(a_ids, b_ids)
+    matches = [(t, t) for t in range(prefix)]
+    ahi, bhi = len(a) - suffix, len(b) - suffix
+    if algorithm == "myers":
+        matches += _myers(a_ids, b_ids, prefix, ahi, prefix, bhi)
+    elif algorithm == "histogram":
+        matches += _histogram(a_ids, b_ids, prefix, ahi, prefix, bhi)
+    else:
+        raise ValueError(f"Unknown diff algorithm: {algorithm}")
+    matches += [(ahi + t, bhi + t) for t in range(suffix)]
+    return _opcodes_from_matches(matches, len(a), len(b))
+
+
+def _group_opcodes(opcodes: List[Opcode], context: int) -> List[List[Opcode]]:
+    """Splits opcodes into hunks with at most `context` equal lines around each change."""
+    if not opcodes or all(op[0] == "equal" for op in opcodes):
+        return []
+    codes = list(opcodes)
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = (tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2)
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+
+    groups, group = [], []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def _range(start: int, length: int) -> str:
+    # Same conventions as GNU diff/git: "-5" for one line, "-4,0" for an empty range after line 4
+    if length == 1:
+        return str(start + 1)
+    if length == 0:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def format_unified(
+    a: List[str], b: List[str], opcodes: List[Opcode],
+    fromfile: str, tofile: str, context: int = 3,
+    a_missing_newline: bool = False, b_missing_newline: bool = False,
+) -> str:
+    groups = _group_opcodes(opcodes, context)
+    if not groups:
+        return ""
+    out = [f"--- {fromfile}", f"+++ {tofile}"]
+    for group in groups:
+        first, last = group[0], group[-1]
+        out.append(f"@@ -{_range(first[1], last[2] - first[1])} +{_range(first[3], last[4] - first[3])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    out.append(" " + a[i])
+                    # An unterminated last line only equals another one, so this needs both to end here
+                    if i == len(a) - 1 and j == len(b) - 1 and a_missing_newline:
+                        out.append("\\ No newline at end of file")
+                continue
+            for i in range(i1, i2):
+                out.append("-" + a[i])
+                if i == len(a) - 1 and a_missing_newline:
+                    out.append("\\ No newline at end of file")
+            for j in range(j1, j2):
+                out.append("+" + b[j])
+                if j == len(b) - 1 and b_missing_newline:
+                    out.append("\\ No newline at end of file")
+    return "\n".join(out) + "\n"
+
+
+def _split(text: str) -> Tuple[List[str], bool]:
+    lines = text.splitlines()
+    return lines, bool(text) and not text.endswith(("\n", "\r"))
+
+
+def _git_unified_diff(a_text: str, b_text: str, fromfile: str, tofile: str, context: int, algorithm: str) -> Optional[str]:
+    git = shutil.which("git")
+    if not git:
+        return None
+    with tempfile.TemporaryDirectory(prefix="debugiq_diff_") as tmp:
+        a_path, b_path = os.path.join(tmp, "a"), os.path.join(tmp, "b")
+        with open(a_path, "w", encoding="utf-8", newline="") as f:
+            f.write(a_text)
+        with open(b_path, "w", encoding="utf-8", newline="") as f:
+            f.write(b_text)
+        try:
+            result = subprocess.run(
+                [git, "diff", "--no-index", "--no-color", "--no-ext-diff", f"-U{context}",
+                 f"--diff-algorithm={algorithm}", a_path, b_path],
+                capture_output=True, text=True, timeout=DIFF_GIT_TIMEOUT_SECONDS,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+    if result.returncode not in (0, 1):
+        return None
+    lines = result.stdout.splitlines()
+    start = next((i for i, line in enumerate(lines) if line.startswith("@@")), None)
+    if start is None:
+        return ""
+    return "\n".join([f"--- {fromfile}", f"+++ {tofile}"] + lines[start:]) + "\n"
+
+
+def unified_diff(
+    a_text: str,
+    b_text: str,
+    fromfile: str = "a",
+    tofile: str = "b",
+    context: int = 3,
+    algorithm: str = DIFF_ALGORITHM,
+    git_threshold: int = DIFF_GIT_THRESHOLD_LINES,
+) -> str:
+    """
+    Unified diff of two texts; empty string when they're equal.
+
+    The common prefix and suffix are trimmed first, so a small edit in a huge
+    file costs little. If what remains is larger than `git_threshold` lines,
+    the diff is delegated to `git diff --no-index`.
+    """
+    if a_text == b_text:
+        return ""
+    a, a_missing_newline = _split(a_text)
+    b, b_missing_newline = _split(b_text)
+    # A final line without a newline only equals another final line without one
+    a_cmp = a[:-1] + [a[-1] + "\x00"] if a_missing_newline else a
+    b_cmp = b[:-1] + [b[-1] + "\x00"] if b_missing_newline else b
+
+    a_ids, b_ids = intern_lines(a_cmp, b_cmp)
+    prefix, suffix = common_affixes(a_ids, b_ids)
+    if (len(a) + len(b)) - 2 * (prefix + suffix) > git_threshold:
+        delegated = _git_unified_diff(a_text, b_text, fromfile, tofile, context, algorithm)
+        if delegated is not None:
+            return delegated
+
+    opcodes = diff_opcodes(a_cmp, b_cmp, algorithm)
+    return format_unified(a, b, opcodes, fromfile, tofile, context, a_missing_newline, b_missing_newline)
@@ -0,0 +1,252 @@
+# DebugIQ-backend/scripts/fake_git_platform_server.py
+
+"""
+Local stand-in for the GitHub API, for tests and offline runs.
+
+Implements the endpoints GitPlatformClient uses (pulls, issue comments,
+workflow dispatches, aliased pullRequest GraphQL lookups) with ETags and
+X-RateLimit-* headers, and counts requests and TCP connections so keep-alive
+and caching behaviour can be asserted.
+
+    with FakeGitPlatformServer() as server:
+        client = GitPlatformClient(base_url=server.url, token="test")
+
+Or standalone: python -m scripts.fake_git_platform_server --port 8765
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+_PULLS = re.compile(r"^/repos/([^/]+)/([^/]+)/pulls(?:/(\d+))?$")
+_COMMENTS = re.compile(r"^/repos/([^/]+)/([^/]+)/issues/(\d+)/comments$")
+_DISPATCH = re.compile(r"^/repos/([^/]+)/([^/]+)/actions/workflows/([^/]+)/dispatches$")
+_GRAPHQL_PR = re.compile(
+    r'(\w+)\s*:\s*repository\(owner:\s*"([^"]+)",\s*name:\s*"([^"]+)"\)\s*\{\s*pullRequest\(number:\s*(\d+)\)'
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.fake.record_connection()
+
+    def _send(self, status: int, body=None, headers: Optional[dict] = None):
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in self.server.fake.rate_limit_headers().items():
+            self.send_header(name, value)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _handle(self, method: str):
+        fake = self.server.fake
+        body = self._read_json() if method == "POST" else {}
+        path = self.path.split("?", 1)[0]
+        fake.record_request(method, path)
+
+        injected = fake.next_failure()
+        if injected:
+            status, headers = injected
+            return self._send(status, {"message": "injected failure"}, headers)
+        if not fake.consume_rate_limit():
+            return self._send(403, {"message": "API rate limit exceeded"})
+        if self.headers.get("Authorization") != f"Bearer {fake.token}" and fake.token:
+            return self._send(401, {"message": "Bad credentials"})
+
+        status, response = fake.route(method, path, body)
+        if method == "GET" and status == 200:
+            etag = '"' + hashlib.sha1(json.dumps(response, sort_keys=True).encode()).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                fake.record_not_modified()
+                return self._send(304, None, {"ETag": etag})
+            return self._send(status, response, {"ETag": etag})
+        self._send(status, response)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+class FakeGitPlatformServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, token: Optional[str] = "test-token",
+                 rate_limit: int = 5000, latency_seconds: float = 0.0):
+        self.token = token
+        self.rate_limit = rate_limit
+        self.rate_remaining = rate_limit
+        self.rate_reset = int(time.time()) + 3600
+        self.latency_seconds = latency_seconds
+        self.pulls = {}  # (owner, repo) -> {number: pr}
+        self.comments = []
+        self.dispatches = []
+        self.requests = Counter()  # (method, path) -> count
+        self.connections = 0
+        self.not_modified = 0
+        self._failures: List[tuple] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # --- Test controls ---
+
+    def fail_next(self, status: int, headers: Optional[dict] = None, times: int = 1):
+        """Makes the next `times` requests return `status` (e.g. 429 with Retry-After)."""
+        with self._lock:
+            self._failures += [(status, headers or {})] * times
+
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    # --- Bookkeeping (called from handler threads) ---
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def record_request(self, method: str, path: str):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        with self._lock:
+            self.requests[(method, path)] += 1
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+            self.rate_remaining += 1  # Like GitHub, 304s don't count against the limit
+
+    def next_failure(self) -> Optional[tuple]:
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def consume_rate_limit(self) -> bool:
+        with self._lock:
+            if self.rate_remaining <= 0:
+                return False
+            self.rate_remaining -= 1
+            return True
+
+    def rate_limit_headers(self) -> dict:
+        with self._lock:
+            return {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self.rate_remaining),
+                "X-RateLimit-Reset": str(self.rate_reset),
+            }
+
+    # --- API ---
+
+    def _create_pull(self, owner: str, repo: str, body: dict) -> dict:
+        with self._lock:
+            repo_pulls = self.pulls.setdefault((owner, repo), {})
+            number = len(repo_pulls) + 1
+            pr = {
+                "id": hash((owner, repo, number)) & 0xFFFFFFF,
+                "number": number,
+                "title": body.get("title"),
+                "body": body.get("body"),
+                "head": {"ref": body.get("head"), "sha": hashlib.sha1(f"{owner}/{repo}#{number}".encode()).hexdigest()},
+                "base": {"ref": body.get("base")},
+                "state": "open",
+                "html_url": f"https://github.com/{owner}/{repo}/pull/{number}",
+                "created_at": datetime.utcnow().isoformat(),
+            }
+            repo_pulls[number] = pr
+        return pr
+
+    def _graphql(self, body: dict) -> dict:
+        data = {}
+        for alias, owner, repo, number in _GRAPHQL_PR.findall(body.get("query", "")):
+            pr = self.pulls.get((owner, repo), {}).get(int(number))
+            data[alias] = {"pullRequest": pr and {
+                "number": pr["number"], "title": pr["title"], "state": pr["state"].upper(),
+                "url": pr["html_url"], "headRefOid": pr["head"]["sha"],
+            }}
+        return {"data": data}
+
+    def route(self, method: str, path: str, body: dict) -> tuple:
+        if method == "POST" and path == "/graphql":
+            return 200, self._graphql(body)
+        match = _PULLS.match(path)
+        if match:
+            owner, repo, number = match.groups()
+            if method == "POST" and number is None:
+                return 201, self._create_pull(owner, repo, body)
+            if method == "GET" and number is not None:
+                pr = self.pulls.get((owner, repo), {}).get(int(number))
+                return (200, pr) if pr else (404, {"message": "Not Found"})
+        match = _COMMENTS.match(path)
+        if match and method == "POST":
+            with self._lock:
+                comment = {"id": len(self.comments) + 1, "issue": int(match.group(3)), "body": body.get("body")}
+                self.comments.append(comment)
+            return 201, comment
+        match = _DISPATCH.match(path)
+        if match and method == "POST":
+            with self._lock:
+                self.dispatches.append({"repo": f"{match.group(1)}/{match.group(2)}", "workflow": match.group(3), **body})
+            return 204, None
+        return 404, {"message": "Not Found"}
+
+    # --- Lifecycle ---
+
+    def start(self) -> "FakeGitPlatformServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake GitHub API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default="test-token")
+    args = parser.parse_args()
+    server = FakeGitPlatformServer(args.host, args.port, token=args.token)
+    print(f"🧪 Fake Git platform API listening on {server.url} (token: {args.token})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# DebugIQ-backend/scripts/fake_llm_server.py
+
+"""
+Deterministic stand-in for the OpenAI Chat Completions API, for load tests
+and offline runs.
+
+Serves POST /v1/chat/completions (plain and `stream: true` server-sent
+events). The reply is picked by the first marker found in the prompt, so
+each agent gets output it can parse, and the same prompt always gets the
+same reply. Latency is modelled as time-to-first-token plus completion
+tokens at a fixed token rate.
+
+    with FakeLLMServer(first_token_seconds=0.2, tokens_per_second=50) as llm:
+        os.environ["OPENAI_BASE_URL"] = llm.url + "/v1"
+
+Or standalone: python -m scripts.fake_llm_server --port 8766
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Sequence, Tuple
+
+# (marker in the prompt, reply). {digest} is replaced by a short hash of the prompt.
+DEFAULT_REPLIES: List[Tuple[str, str]] = [
+    ("root_cause_summary", json.dumps({
+        "root_cause_summary": "Unchecked division by zero ({digest})",
+        "detailed_analysis": "The divisor comes straight from the request and is never validated.",
+        "relevant_files": ["service.py"],
+        "suggested_areas": ["service.py#divide"],
+        "confidence": 0.9,
+    })),
+    ("classification", json.dumps({
+        "classification": "Bug",
+        "severity": "High",
+        "priority": "P1",
+        "tags": ["crash", "{digest}"],
+    })),
+    ("unified diff", "--- a/service.py\n+++ b/service.py\n@@ -1,2 +1,4 @@\n def divide(a, b):\n"
+                     "+    if b == 0:\n+        return 0\n     return a / b\n\nExplanation:\nGuard the divisor ({digest})."),
+    ("### PATCH", "### PATCH\ndef divide(a, b):\n    return a / b if b else 0\n\n### EXPLANATION\n"
+                  "The divisor was not checked ({digest}).\n\n### SUMMARY\nGuard against zero divisors."),
+    ("QA agent", "- Fixes the issue: yes\n- Edge cases: negative divisors are fine\n- Improvements: add a test ({digest})"),
+]
+DEFAULT_REPLY = "Acknowledged. Running the requested DebugIQ action now ({digest})."
+
+
+def count_tokens(text: str) -> int:
+    """Whitespace tokens: close enough to a tokenizer for pacing and usage numbers."""
+    return len(text.split())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        fake = self.server.fake
+        path = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not path.endswith("/chat/completions"):
+            return self._send_json(404, {"error": {"message": "Not Found"}})
+
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        reply = fake.reply_for(prompt)
+        tokens = reply.split(" ")
+        fake.record_request(count_tokens(prompt), len(tokens))
+        completion_id = "chatcmpl-" + hashlib.sha1(prompt.encode()).hexdigest()[:24]
+        model = body.get("model", "gpt-4o")
+        usage = {"prompt_tokens": count_tokens(prompt), "completion_tokens": len(tokens),
+                 "total_tokens": count_tokens(prompt) + len(tokens)}
+
+        time.sleep(fake.first_token_seconds)
+        if not body.get("stream"):
+            time.sleep(fake.generation_seconds(len(tokens)))
+            return self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        # Streamed: one SSE event per token, paced at the token rate
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for index, token in enumerate(tokens):
+            if index:
+                time.sleep(fake.generation_seconds(1))
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                     "choices": [{"index": 0, "delta": {"content": (" " if index else "") + token},
+                                  "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        done = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+        self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode())
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class FakeLLMServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, first_token_seconds: float = 0.0,
+                 tokens_per_second: float = 0.0, replies: Optional[Sequence[Tuple[str, str]]] = None):
+        self.first_token_seconds = first_token_seconds
+        self.tokens_per_second = tokens_per_second  # 0 means the whole reply at once
+        self.replies = list(replies if replies is not None else DEFAULT_REPLIES)
+        self.requests = 0
+        self.tokens = Counter()  # "prompt" / "completion" -> total
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reply_for(self, prompt: str) -> str:
+        digest = hashlib.sha1(prompt.encode()).hexdigest()[:8]
+        for marker, reply in self.replies:
+            if marker in prompt:
+                return reply.replace("{digest}", digest)
+        return DEFAULT_REPLY.replace("{digest}", digest)
+
+    def generation_seconds(self, tokens: int) -> float:
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def record_request(self, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.requests += 1
+            self.tokens["prompt"] += prompt_tokens
+            self.tokens["completion"] += completion_tokens
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "prompt_tokens": self.tokens["prompt"],
+                    "completion_tokens": self.tokens["completion"]}
+
+    # --- Lifecycle ---
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake OpenAI-compatible chat API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--first-token-seconds", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeLLMServer(args.host, args.port, args.first_token_seconds, args.tokens_per_second)
+    print(f"🧪 Fake LLM API listening on {server.url}/v1")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
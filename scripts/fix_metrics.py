@@ -0,0 +1,169 @@
+# DebugIQ-backend/scripts/fix_metrics.py
+
+import os
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Rolling window kept for throughput and recent success rate, in hourly buckets
+FIX_METRICS_WINDOW_HOURS = int(os.getenv("FIX_METRICS_WINDOW_HOURS", "24"))
+_BUCKET_SECONDS = 3600
+
+WORKFLOW_STARTED = "Fetching Details"
+WORKFLOW_SUCCEEDED = "PR Created - Awaiting Review/QA"
+
+# Terminal failure statuses set by run_autonomous_workflow, by the stage that failed
+FAILURE_STAGES = {
+    "Details Fetch Failed": "fetch_details",
+    "Repository Not Linked": "fetch_details",
+    "Diagnosis Failed": "diagnosis",
+    "Diagnosis Error": "diagnosis",
+    "Patch Suggestion Failed": "patch_suggestion",
+    "Patch Suggestion Error": "patch_suggestion",
+    "Patch Malformed": "patch_suggestion",
+    "Patch Validation Failed": "validation",
+    "Patch Validation Error": "validation",
+    "PR Creation Failed": "pr_creation",
+    "PR Creation Error": "pr_creation",
+}
+
+
+def failure_stage(status: str) -> Optional[str]:
+    """Stage a terminal failure status belongs to, or None if the status isn't a failure."""
+    if status in FAILURE_STAGES:
+        return FAILURE_STAGES[status]
+    if status.endswith(("Failed", "Error")):
+        return "other"
+    return None
+
+
+@dataclass
+class _Tally:
+    started: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    failures_by_stage: Counter = field(default_factory=Counter)
+    time_to_pr_seconds: float = 0.0
+
+    def add(self, other: "_Tally", sign: int = 1):
+        self.started += sign * other.started
+        self.succeeded += sign * other.succeeded
+        self.failed += sign * other.failed
+        self.time_to_pr_seconds += sign * other.time_to_pr_seconds
+        for stage, count in other.failures_by_stage.items():
+            self.failures_by_stage[stage] += sign * count
+        self.failures_by_stage = +self.failures_by_stage  # Drop zeroed stages
+
+    def to_dict(self) -> dict:
+        completed = self.succeeded + self.failed
+        return {
+            "started": self.started,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "success_rate": round(self.succeeded / completed, 4) if completed else None,
+            "failures_by_stage": dict(self.failures_by_stage),
+            "avg_time_to_pr_seconds": round(self.time_to_pr_seconds / self.succeeded, 1) if self.succeeded else None,
+        }
+
+
+class FixMetrics:
+    """
+    Autonomous-fix counters updated on every status transition.
+
+    All-time totals and a rolling window of hourly buckets are kept alongside a
+    running sum of the window, so reading the summary costs the same no matter
+    how many issues exist and never touches the issue store.
+    """
+
+    def __init__(self, window_hours: int = FIX_METRICS_WINDOW_HOURS, clock=time.time):
+        self.window_hours = window_hours
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._totals = _Tally()
+        self._window = _Tally()
+        self._buckets: deque = deque()  # (hour index, _Tally), oldest first
+        self._current_status: Dict[str, str] = {}
+        self._status_counts: Counter = Counter()
+        self._started_at: Dict[str, float] = {}
+        self._transitions = 0
+
+    def _expire(self, hour: int):
+        while self._buckets and self._buckets[0][0] <= hour - self.window_hours:
+            _, expired = self._buckets.popleft()
+            self._window.add(expired, -1)
+
+    def _bucket(self, hour: int) -> _Tally:
+        self._expire(hour)
+        if not self._buckets or self._buckets[-1][0] != hour:
+            self._buckets.append((hour, _Tally()))
+        return self._buckets[-1][1]
+
+    def record_transition(self, issue_id: str, status: str, at: Optional[float] = None):
+        at = self._clock() if at is None else at
+        delta = _Tally()
+        with self._lock:
+            self._transitions += 1
+            previous = self._current_status.get(issue_id)
+            if previous is not None:
+                self._status_counts[previous] -= 1
+                if not self._status_counts[previous]:
+                    del self._status_counts[previous]
+            self._current_status[issue_id] = status
+            self._status_counts[status] += 1
+
+            stage = failure_stage(status)
+            if status == WORKFLOW_STARTED:
+                delta.started = 1
+                self._started_at[issue_id] = at
+            elif status == WORKFLOW_SUCCEEDED:
+                delta.succeeded = 1
+                started = self._started_at.pop(issue_id, None)
+                if started is not None:
+                    delta.time_to_pr_seconds = at - started
+            elif stage is not None:
+                delta.failed = 1
+                delta.failures_by_stage[stage] = 1
+                self._started_at.pop(issue_id, None)
+            else:
+                return
+
+            self._totals.add(delta)
+            self._bucket(int(at // _BUCKET_SECONDS)).add(delta)
+            self._window.add(delta)
+
+    def summary(self) -> dict:
+        now = self._clock()
+        with self._lock:
+            self._expire(int(now // _BUCKET_SECONDS))
+            window = self._window.to_dict()
+            completed = self._window.succeeded + self._window.failed
+            window["throughput_per_hour"] = round(completed / self.window_hours, 2)
+            return {
+                "all_time": self._totals.to_dict(),
+                f"last_{self.window_hours}h": window,
+                "hourly": [{
+                    "hour": datetime.fromtimestamp(hour * _BUCKET_SECONDS, timezone.utc).isoformat(),
+                    "completed": tally.succeeded + tally.failed,
+                    "succeeded": tally.succeeded,
+                    "failed": tally.failed,
+                } for hour, tally in self._buckets],
+                "in_progress": len(self._started_at),
+                "issues_by_status": dict(self._status_counts),
+                "status_transitions": self._transitions,
+                "generated_at": datetime.utcnow().isoformat(),
+            }
+
+
+_metrics: Optional[FixMetrics] = None
+_metrics_lock = threading.Lock()
+
+def get_fix_metrics() -> FixMetrics:
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = FixMetrics()
+    return _metrics
@@ -1,10 +1,10 @@
 import argparse
-import difflib
 import subprocess
-import tempfile
 import openai
 import os
 from debugiq_agents.core.logger import get_logger
+from scripts import diff_engine, impact_map
+from scripts.lint_service import get_lint_service
 
 logger = get_logger("fix_validator")
 openai.api_key = os.getenv("OPENAI_API_KEY")
@@ -14,12 +14,8 @@ def load_file(path):
     with open(path, "r") as f:
         return f.read()
 
-def generate_diff(original, patched):
-    return "\n".join(difflib.unified_diff(
-        original.splitlines(), patched.splitlines(),
-        fromfile="original.py", tofile="patched.py",
-        lineterm=""
-    ))
+def generate_diff(original, patched, fromfile="original.py", tofile="patched.py"):
+    return diff_engine.unified_diff(original, patched, fromfile=fromfile, tofile=tofile)
 
 def validate_patch_with_gpt4o(diff):
     response = openai.ChatCompletion.create(
@@ -32,17 +28,22 @@ def validate_patch_with_gpt4o(diff):
     )
     return response.choices[0].message.content.strip()
 
-def run_linter_on_patch(patch_code):
-    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as tmp:
-        tmp.write(patch_code)
-        tmp_path = tmp.name
-    result = subprocess.run(["flake8", tmp_path], capture_output=True, text=True)
-    os.remove(tmp_path)
-    return result.stdout.strip()
+def run_linter_on_patch(patch_code, filename="patched.py"):
+    # Cached by content hash, so re-checking an unchanged patch doesn't lint again
+    return "\n".join(get_lint_service().lint_source(patch_code, filename))
 
-def run_tests():
+def run_tests(patch_diff=None, repo_path="."):
+    cmd = ["pytest", "--maxfail=3", "--disable-warnings"]
+    if patch_diff:
+        # Limit the run to tests the test-impact map links to the changed code
+        selection = impact_map.select_tests_for_diff(repo_path, patch_diff)
+        logger.info(f"Test selection: {selection.reason}")
+        if not selection.full_suite:
+            if not selection.tests:
+                return "No tests are affected by this patch."
+            cmd.extend(selection.tests)
     logger.info("Running pytest for validation...")
-    result = subprocess.run(["pytest", "--maxfail=3", "--disable-warnings"], capture_output=True, text=True)
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=repo_path)
     return result.stdout.strip()
 
 def main():
@@ -68,7 +69,8 @@ def main():
         exit(1)
 
     print("\n🧪 Running Tests:")
-    test_output = run_tests()
+    source_path = os.path.relpath(args.source)
+    test_output = run_tests(generate_diff(original, patched, fromfile=f"a/{source_path}", tofile=f"b/{source_path}"))
     print(test_output)
 
     if "failed" in test_output.lower():
@@ -0,0 +1,286 @@
+# DebugIQ-backend/scripts/git_platform_client.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from scripts import tracing
+from scripts.utils.logger import setup_logger
+
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN") or os.getenv("GIT_PLATFORM_TOKEN")
+GIT_API_MAX_CONNECTIONS = int(os.getenv("GIT_API_MAX_CONNECTIONS", "20"))
+GIT_API_TIMEOUT_SECONDS = float(os.getenv("GIT_API_TIMEOUT_SECONDS", "30"))
+GIT_API_MAX_RETRIES = int(os.getenv("GIT_API_MAX_RETRIES", "3"))
+# Below this many remaining requests, calls are spaced out over the rest of the rate-limit window
+GIT_API_RATE_LIMIT_RESERVE = int(os.getenv("GIT_API_RATE_LIMIT_RESERVE", "50"))
+# Longest we are willing to sleep for a rate limit before failing the call instead
+GIT_API_MAX_RATE_LIMIT_WAIT_SECONDS = float(os.getenv("GIT_API_MAX_RATE_LIMIT_WAIT_SECONDS", "60"))
+GIT_API_ETAG_CACHE_SIZE = int(os.getenv("GIT_API_ETAG_CACHE_SIZE", "1000"))
+# Aliased sub-queries per GraphQL request
+GIT_API_GRAPHQL_BATCH_SIZE = int(os.getenv("GIT_API_GRAPHQL_BATCH_SIZE", "50"))
+
+_RETRYABLE_STATUSES = (429, 502, 503, 504)
+# Only these are replayed after a 5xx or a dropped connection; a POST may already have taken effect
+_IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+# Failures where the request never reached the server, so any method can be sent again
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+logger = setup_logger("git_platform_client")
+
+
+class GitPlatformError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None, body=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class GitPlatformClient:
+    """
+    GitHub REST/GraphQL client shared across the app.
+
+    - One keep-alive connection pool for every call (no handshake per request).
+    - Conditional GETs: responses are cached with their ETag and revalidated with
+      If-None-Match; a 304 costs no rate-limit budget.
+    - Rate-limit aware: X-RateLimit-* headers pace calls as the budget runs low,
+      and 429/secondary-limit responses are retried after Retry-After.
+    - 5xx responses and dropped connections are retried only for idempotent
+      requests, so a PR, comment or dispatch is never created twice.
+    - Many lookups can be batched into aliased GraphQL queries.
+    """
+
+    def __init__(
+        self,
+        base_url: str = GITHUB_API_URL,
+        token: Optional[str] = GITHUB_TOKEN,
+        max_connections: int = GIT_API_MAX_CONNECTIONS,
+        timeout: float = GIT_API_TIMEOUT_SECONDS,
+        max_retries: int = GIT_API_MAX_RETRIES,
+        transport: Optional[httpx.BaseTransport] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "DebugIQ",
+        }
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        self._client = httpx.Client(
+            base_url=base_url.rstrip("/"),
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self._etags: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._rate_remaining: Optional[int] = None
+        self._rate_reset: Optional[float] = None
+
+    # --- Transport ---
+
+    def _update_rate_limit(self, response: httpx.Response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        with self._lock:
+            if remaining is not None and remaining.isdigit():
+                self._rate_remaining = int(remaining)
+            if reset is not None and reset.isdigit():
+                self._rate_reset = float(reset)
+
+    def _throttle(self):
+        """Spreads the remaining budget over the rest of the window once it gets low."""
+        with self._lock:
+            remaining, reset = self._rate_remaining, self._rate_reset
+        if remaining is None or reset is None or remaining > GIT_API_RATE_LIMIT_RESERVE:
+            return
+        window = reset - time.time()
+        if window <= 0:
+            return
+        delay = window if remaining == 0 else window / remaining
+        if delay > GIT_API_MAX_RATE_LIMIT_WAIT_SECONDS:
+            raise GitPlatformError(f"Rate limit exhausted; resets in {int(window)}s", status_code=429)
+        self._sleep(delay)
+
+    def _retry_delay(self, response: httpx.Response, attempt: int, idempotent: bool) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response isn't retryable."""
+        retry_after = response.headers.get("Retry-After")
+        rate_limited = response.status_code == 429 or (
+            response.status_code == 403 and response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+        if not rate_limited and not idempotent:
+            return None
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        if rate_limited:
+            reset = response.headers.get("X-RateLimit-Reset")
+            if reset is not None and reset.isdigit():
+                return max(0.0, float(reset) - time.time())
+            return 60.0
+        if response.status_code in _RETRYABLE_STATUSES:
+            return min(2 ** attempt, 30)
+        return None
+
+    def request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """
+        Sends a request with rate-limit pacing and retries; raises GitPlatformError on failure.
+
+        `idempotent` defaults to whether the method is safe to replay; pass True for
+        POSTs that only read (e.g. GraphQL queries) so they retry on 5xx too.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in _IDEMPOTENT_METHODS
+        with tracing.span("git_platform.request", {"http.method": method, "url.path": path}) as span:
+            if span.traceparent:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), "traceparent": span.traceparent}
+            response = self._request(method, path, idempotent, **kwargs)
+            span.set_attributes({"http.status_code": response.status_code, "http.response_bytes": len(response.content)})
+            return response
+
+    def _request(self, method: str, path: str, idempotent: bool, **kwargs) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            self._throttle()
+            try:
+                response = self._client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries or not (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                    raise GitPlatformError(f"{method} {path} failed: {e}") from e
+                self._sleep(min(2 ** attempt, 30))
+                continue
+            self._update_rate_limit(response)
+            if response.status_code < 400 or response.status_code == 304:
+                return response
+
+            delay = self._retry_delay(response, attempt, idempotent)
+            if delay is None or attempt == self.max_retries:
+                break
+            if delay > GIT_API_MAX_RATE_LIMIT_WAIT_SECONDS:
+                raise GitPlatformError(f"Rate limited for {int(delay)}s on {method} {path}", status_code=response.status_code)
+            logger.warning("⏳ Git platform returned %s for %s %s; retrying in %.1fs", response.status_code, method, path, delay)
+            self._sleep(delay)
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        message = body.get("message") if isinstance(body, dict) else body
+        raise GitPlatformError(f"{method} {path} failed with {response.status_code}: {message}", response.status_code, body)
+
+    def get_json(self, path: str, params: Optional[dict] = None):
+        """GET with ETag revalidation; unchanged resources are served from the local copy."""
+        key = path + ("?" + "&".join(f"{k}={v}" for k, v in sorted(params.items())) if params else "")
+        with self._lock:
+            cached = self._etags.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        response = self.request("GET", path, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self._etags.move_to_end(key)
+            return cached[1]
+
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._lock:
+                self._etags[key] = (etag, data)
+                self._etags.move_to_end(key)
+                while len(self._etags) > GIT_API_ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return data
+
+    def post_json(self, path: str, payload: dict):
+        response = self.request("POST", path, json=payload)
+        return response.json() if response.content else {}
+
+    # --- GraphQL ---
+
+    def graphql(self, query: str, variables: Optional[dict] = None) -> dict:
+        # Queries only read, so they can be replayed; mutations cannot
+        read_only = not query.lstrip().startswith("mutation")
+        response = self.request("POST", "/graphql", idempotent=read_only,
+                                json={"query": query, "variables": variables or {}})
+        body = response.json()
+        if body.get("errors"):
+            raise GitPlatformError(f"GraphQL errors: {body['errors']}", response.status_code, body)
+        return body.get("data") or {}
+
+    def graphql_batch(self, fields: Dict[str, str], batch_size: int = GIT_API_GRAPHQL_BATCH_SIZE) -> Dict[str, dict]:
+        """
+        Runs many independent lookups as aliased fields of a few queries.
+
+        `fields` maps an alias (a valid GraphQL name) to a top-level field selection,
+        e.g. {"pr12": 'repository(owner: "o", name: "r") { pullRequest(number: 12) { state } }'}.
+        """
+        results: Dict[str, dict] = {}
+        aliases = list(fields)
+        for start in range(0, len(aliases), batch_size):
+            batch = aliases[start:start + batch_size]
+            query = "query {\n" + "\n".join(f"  {alias}: {fields[alias]}" for alias in batch) + "\n}"
+            results.update(self.graphql(query))
+        return results
+
+    # --- Platform operations ---
+
+    def create_pull_request(self, owner: str, repo_name: str, head_branch: str, base_branch: str, title: str, body: str) -> dict:
+        pr = self.post_json(f"/repos/{owner}/{repo_name}/pulls", {
+            "title": title, "head": head_branch, "base": base_branch, "body": body,
+        })
+        return {
+            "url": pr.get("html_url") or pr.get("url"),
+            "id": pr.get("id"),
+            "number": pr.get("number"),
+            "title": pr.get("title", title),
+            "state": pr.get("state"),
+            "created_at": pr.get("created_at"),
+        }
+
+    def post_issue_comment(self, repo_full_name: str, number, body: str) -> dict:
+        return self.post_json(f"/repos/{repo_full_name}/issues/{number}/comments", {"body": body})
+
+    def dispatch_workflow(self, repo_full_name: str, workflow_id: str, ref: str = "main", inputs: Optional[dict] = None):
+        payload = {"ref": ref}
+        if inputs:
+            payload["inputs"] = inputs
+        self.post_json(f"/repos/{repo_full_name}/actions/workflows/{workflow_id}/dispatches", payload)
+
+    def get_pull_request(self, owner: str, repo_name: str, number: int) -> dict:
+        return self.get_json(f"/repos/{owner}/{repo_name}/pulls/{number}")
+
+    def get_pull_requests(self, owner: str, repo_name: str, numbers: List[int],
+                          batch_size: int = GIT_API_GRAPHQL_BATCH_SIZE) -> Dict[int, Optional[dict]]:
+        """Looks up many PRs with batched GraphQL instead of one REST call each."""
+        fields = {
+            f"pr{number}": (
+                f'repository(owner: "{owner}", name: "{repo_name}") '
+                f"{{ pullRequest(number: {int(number)}) {{ number title state url headRefOid }} }}"
+            )
+            for number in numbers
+        }
+        data = self.graphql_batch(fields, batch_size)
+        return {number: (data.get(f"pr{number}") or {}).get("pullRequest") for number in numbers}
+
+    def close(self):
+        self._client.close()
+
+
+_clients: Dict[Optional[str], GitPlatformClient] = {}
+_clients_lock = threading.Lock()
+
+def get_git_platform_client(token: Optional[str] = None) -> GitPlatformClient:
+    """Shared client (and connection pool) per token; defaults to GITHUB_TOKEN."""
+    token = token or GITHUB_TOKEN
+    client = _clients.get(token)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(token)
+            if client is None:
+                client = _clients[token] = GitPlatformClient(token=token)
+    return client
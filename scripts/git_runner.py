@@ -0,0 +1,238 @@
+# DebugIQ-backend/scripts/git_runner.py
+
+import asyncio
+import os
+import re
+import signal
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from scripts import tracing
+from scripts.latency_metrics import GIT_COMMAND_SECONDS, git_subcommand
+from scripts.utils.logger import setup_logger
+
+# git processes allowed to run at once (per event loop); the rest queue
+GIT_MAX_CONCURRENCY = int(os.getenv("GIT_MAX_CONCURRENCY", "16"))
+# ...and per repository (working directory, or remote URL for clone/ls-remote)
+GIT_MAX_CONCURRENCY_PER_REPO = int(os.getenv("GIT_MAX_CONCURRENCY_PER_REPO", "4"))
+GIT_COMMAND_TIMEOUT_SECONDS = float(os.getenv("GIT_COMMAND_TIMEOUT_SECONDS", "300"))
+# After SIGTERM on timeout, how long git gets before its process group is SIGKILLed
+GIT_KILL_GRACE_SECONDS = float(os.getenv("GIT_KILL_GRACE_SECONDS", "2"))
+# stderr is mostly progress output; only its tail is kept for error messages
+GIT_STDERR_TAIL_BYTES = int(os.getenv("GIT_STDERR_TAIL_BYTES", "65536"))
+GIT_READ_CHUNK_BYTES = 64 * 1024
+
+logger = setup_logger("git_runner")
+
+_CREDENTIALS_IN_URL = re.compile(r"//[^/@]+@")
+
+
+def repo_key(command: Sequence[str], cwd: Optional[str]) -> str:
+    """The repository a command works on: its working directory, or the remote it talks to."""
+    if cwd and cwd != ".":
+        return os.path.realpath(cwd)
+    for arg in command[1:]:
+        if "://" in arg or arg.startswith("git@"):
+            return _CREDENTIALS_IN_URL.sub("//", arg)
+    return os.path.realpath(cwd or ".")
+
+
+class _Tail:
+    """Keeps the last `limit` bytes written to it."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.data = bytearray()
+
+    def write(self, chunk: bytes):
+        self.data += chunk
+        if len(self.data) > self.limit:
+            del self.data[:len(self.data) - self.limit]
+
+    def text(self) -> str:
+        return self.data.decode("utf-8", errors="replace")
+
+
+class _LoopLimits:
+    """asyncio semaphores belong to one event loop, so each loop gets its own set."""
+
+    def __init__(self, max_concurrency: int, per_repo: int):
+        self.global_slots = asyncio.Semaphore(max_concurrency)
+        self.per_repo = per_repo
+        self.repos: Dict[str, list] = {}  # repo key -> [semaphore, holders + waiters]
+
+
+class AsyncGitRunner:
+    """
+    Runs git as asyncio subprocesses under a global and a per-repository
+    concurrency limit. Output is read incrementally (optionally handed to a
+    callback instead of being kept), commands that exceed their timeout have
+    their whole process group killed, and the environment is prepared once.
+    """
+
+    def __init__(self, max_concurrency: int = GIT_MAX_CONCURRENCY,
+                 max_concurrency_per_repo: int = GIT_MAX_CONCURRENCY_PER_REPO,
+                 timeout: float = GIT_COMMAND_TIMEOUT_SECONDS,
+                 kill_grace_seconds: float = GIT_KILL_GRACE_SECONDS,
+                 stderr_tail_bytes: int = GIT_STDERR_TAIL_BYTES):
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_repo = max_concurrency_per_repo
+        self.timeout = timeout
+        self.kill_grace_seconds = kill_grace_seconds
+        self.stderr_tail_bytes = stderr_tail_bytes
+        self._limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopLimits]" = weakref.WeakKeyDictionary()
+        self._base_env: Optional[Dict[str, str]] = None
+        self._envs: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+        self._env_lock = threading.Lock()
+
+    # --- Environment ---
+
+    def env(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        os.environ (snapshotted on first use) plus `extra`. Merged environments are
+        cached, so the per-call cost is a dict lookup rather than copying os.environ.
+        """
+        key = tuple(sorted(extra.items())) if extra else ()
+        with self._env_lock:
+            if self._base_env is None:
+                # Never block on a credential prompt: there is no terminal to answer it
+                self._base_env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+            env = self._envs.get(key)
+            if env is None:
+                env = self._envs[key] = {**self._base_env, **(extra or {})}
+                if len(self._envs) > 32:
+                    self._envs.popitem(last=False)
+            else:
+                self._envs.move_to_end(key)
+            return env
+
+    def refresh_env(self):
+        """Re-reads os.environ on the next command (after changing it at runtime)."""
+        with self._env_lock:
+            self._base_env = None
+            self._envs.clear()
+
+    # --- Concurrency ---
+
+    def _loop_limits(self) -> _LoopLimits:
+        loop = asyncio.get_running_loop()
+        limits = self._limits.get(loop)
+        if limits is None:
+            limits = self._limits[loop] = _LoopLimits(self.max_concurrency, self.max_concurrency_per_repo)
+        return limits
+
+    @asynccontextmanager
+    async def _slot(self, key: str):
+        limits = self._loop_limits()
+        entry = limits.repos.get(key)
+        if entry is None:
+            entry = limits.repos[key] = [asyncio.Semaphore(limits.per_repo), 0]
+        entry[1] += 1
+        try:
+            async with entry[0], limits.global_slots:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del limits.repos[key]
+
+    # --- Processes ---
+
+    @staticmethod
+    def _signal_group(process: asyncio.subprocess.Process, sig: int):
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, sig)  # start_new_session makes git's pid its group id
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    async def _terminate(self, process: asyncio.subprocess.Process):
+        """SIGTERM the process group, then SIGKILL it if git hasn't exited within the grace period."""
+        if process.returncode is not None:
+            return
+        self._signal_group(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), self.kill_grace_seconds)
+        except asyncio.TimeoutError:
+            self._signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+            await process.wait()
+
+    @staticmethod
+    async def _drain(reader: asyncio.StreamReader, sink: Callable[[bytes], None]):
+        while True:
+            chunk = await reader.read(GIT_READ_CHUNK_BYTES)
+            if not chunk:
+                return
+            sink(chunk)
+
+    async def run(self, command: Sequence[str], cwd: str, env: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None,
+                  on_stdout: Optional[Callable[[bytes], None]] = None) -> Tuple[int, str, str]:
+        """
+        Runs `command` in `cwd` and returns (exit code, stdout, stderr).
+
+        `env` holds variables to add to the process environment. With `on_stdout`,
+        output chunks are passed to the callback as they arrive and the returned
+        stdout is empty, so large outputs never accumulate in memory. On timeout
+        the process group is killed and the exit code is -1.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        subcommand = git_subcommand(command)
+        key = repo_key(command, cwd)
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+
+        async with self._slot(key):
+            with tracing.span(f"git.{subcommand}", {"git.subcommand": subcommand}) as span, \
+                    GIT_COMMAND_SECONDS.time(subcommand=subcommand) as timer:
+                span.set_attribute("git.queue_wait_ms", round((loop.time() - queued_at) * 1000, 1))
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    cwd=cwd,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=self.env(env),
+                    start_new_session=True,
+                )
+                stdout: List[bytes] = []
+                stderr = _Tail(self.stderr_tail_bytes)
+                try:
+                    await asyncio.wait_for(asyncio.gather(
+                        self._drain(process.stdout, on_stdout or stdout.append),
+                        self._drain(process.stderr, stderr.write),
+                        process.wait(),
+                    ), timeout)
+                except asyncio.TimeoutError:
+                    await self._terminate(process)
+                    timer.outcome = "timeout"
+                    span.set_status("ERROR", f"timed out after {timeout}s")
+                    logger.warning("⏱️ git %s in %s timed out after %ss; killed its process group", subcommand, key, timeout)
+                    message = f"git {subcommand} timed out after {timeout}s\n{stderr.text()}"
+                    return -1, b"".join(stdout).decode("utf-8", errors="replace"), message
+                except BaseException:
+                    await self._terminate(process)  # Caller cancelled: don't leave git running
+                    raise
+
+                timer.outcome = "ok" if process.returncode == 0 else "failed"
+                output = b"".join(stdout).decode("utf-8", errors="replace")
+                span.set_attributes({"git.exit_code": process.returncode, "git.stdout_bytes": len(output)})
+                return process.returncode, output, stderr.text()
+
+
+_runner: Optional[AsyncGitRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_git_runner() -> AsyncGitRunner:
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = AsyncGitRunner()
+    return _runner
@@ -0,0 +1,429 @@
+# DebugIQ-backend/scripts/impact_map.py
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from scripts import platform_data_api
+
+# Where impact maps are stored, one subdirectory per repository. Owned by the service, never
+# inside the repository itself: validation runs in throwaway clones that take it with them.
+IMPACT_MAP_DIR = os.path.abspath(os.getenv("IMPACT_MAP_DIR", os.path.join(tempfile.gettempdir(), "debugiq_impact_maps")))
+# Run the full suite every N selections even when a map is available
+IMPACT_FULL_SUITE_EVERY = int(os.getenv("IMPACT_FULL_SUITE_EVERY", "20"))
+# How far back to look for a map built on an ancestor commit
+IMPACT_MAP_MAX_AGE_COMMITS = int(os.getenv("IMPACT_MAP_MAX_AGE_COMMITS", "50"))
+
+# Changes to these files can affect any test, so they always trigger the full suite
+FULL_SUITE_TRIGGERS = re.compile(
+    r"(^|/)(conftest\.py|setup\.py|setup\.cfg|pyproject\.toml|pytest\.ini|tox\.ini|requirements[^/]*\.txt)$"
+)
+MODULE_SCOPE = "<module>"
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+_CREDENTIALS_IN_URL = re.compile(r"//[^/@]+@")
+
+
+@dataclass
+class TestSelection:
+    __test__ = False  # Not a pytest test class
+
+    tests: List[str] = field(default_factory=list)
+    full_suite: bool = False
+    reason: str = ""
+
+
+# --- Building the map ---
+
+def _decode_numbits(numbits: bytes) -> Set[int]:
+    """Decodes coverage.py's numbits blob (bit n set => line n executed)."""
+    lines = set()
+    for byte_index, byte in enumerate(numbits):
+        for bit in range(8):
+            if byte & (1 << bit):
+                lines.add(byte_index * 8 + bit)
+    return lines
+
+
+def _function_ranges(source: str) -> Dict[str, List[int]]:
+    """Maps qualified function names to their [first, last] line numbers."""
+    ranges = {}
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                    ranges[name] = [start, child.end_lineno]
+                visit(child, f"{name}.")
+
+    try:
+        visit(ast.parse(source), "")
+    except SyntaxError:
+        pass
+    return ranges
+
+
+def _scope_for_line(ranges: Dict[str, List[int]], line: int) -> str:
+    # Innermost function wins, so nested functions map to themselves
+    best, best_size = MODULE_SCOPE, None
+    for name, (start, end) in ranges.items():
+        if start <= line <= end and (best_size is None or end - start < best_size):
+            best, best_size = name, end - start
+    return best
+
+
+def _context_to_test_id(context: str, test_files: List[str]) -> Optional[str]:
+    """
+    Normalizes a coverage context to a pytest node id.
+    Accepts pytest-cov contexts ("tests/test_x.py::test_y|run") and
+    coverage's test_function contexts ("tests.test_x.test_y", or "test_x.test_y"
+    when pytest imported the test module by basename).
+    """
+    if not context:
+        return None
+    context = context.split("|", 1)[0]
+    if "::" in context:
+        return context
+    parts = context.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        suffix = "/".join(parts[:i]) + ".py"
+        matches = [f for f in test_files if f == suffix or f.endswith("/" + suffix)]
+        if len(matches) == 1:
+            return "::".join([matches[0]] + parts[i:])
+    return None
+
+
+def _read_coverage(coverage_file: str, repo_path: str, test_files: List[str]) -> Dict[str, Dict[str, Set[int]]]:
+    """Returns {relative file path: {test id: executed lines}} from a coverage.py data file."""
+    repo_root = os.path.realpath(repo_path)
+    conn = sqlite3.connect(coverage_file)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        contexts = dict(conn.execute("SELECT id, context FROM context"))
+        files = dict(conn.execute("SELECT id, path FROM file"))
+        rows = []
+        if "line_bits" in tables:
+            for file_id, context_id, numbits in conn.execute("SELECT file_id, context_id, numbits FROM line_bits"):
+                rows.append((file_id, context_id, _decode_numbits(numbits)))
+        if "arc" in tables:
+            arcs: Dict[tuple, Set[int]] = {}
+            for file_id, context_id, from_no, to_no in conn.execute("SELECT file_id, context_id, fromno, tono FROM arc"):
+                arcs.setdefault((file_id, context_id), set()).update(n for n in (from_no, to_no) if n > 0)
+            rows.extend((file_id, context_id, lines) for (file_id, context_id), lines in arcs.items())
+    finally:
+        conn.close()
+
+    result: Dict[str, Dict[str, Set[int]]] = {}
+    for file_id, context_id, lines in rows:
+        path = os.path.realpath(files[file_id])
+        if not path.startswith(repo_root + os.sep):
+            continue
+        test_id = _context_to_test_id(contexts.get(context_id, ""), test_files)
+        if not test_id:
+            continue
+        rel_path = os.path.relpath(path, repo_root).replace(os.sep, "/")
+        result.setdefault(rel_path, {}).setdefault(test_id, set()).update(lines)
+    return result
+
+
+def _module_to_path(module: str, repo_path: str) -> Optional[str]:
+    base = module.replace(".", "/")
+    for candidate in (f"{base}.py", f"{base}/__init__.py"):
+        if os.path.exists(os.path.join(repo_path, candidate)):
+            return candidate
+    return None
+
+
+def _imports_of(path: str, repo_path: str) -> Set[str]:
+    """Repository files imported by `path`, resolved from its import statements."""
+    try:
+        with open(os.path.join(repo_path, path), "r", encoding="utf-8", errors="ignore") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError):
+        return set()
+
+    package = os.path.dirname(path).replace("/", ".")
+    found = set()
+    for node in ast.walk(tree):
+        modules = []
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package.split(".") if package else []
+                parent = parent[:len(parent) - node.level + 1] if node.level > 1 else parent
+                base = ".".join([p for p in parent if p] + ([base] if base else []))
+            modules = [base] + [f"{base}.{alias.name}" if base else alias.name for alias in node.names]
+        for module in modules:
+            resolved = _module_to_path(module, repo_path) if module else None
+            if resolved and resolved != path:
+                found.add(resolved)
+    return found
+
+
+def _is_test_file(path: str) -> bool:
+    name = os.path.basename(path)
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def build_import_graph(repo_path: str) -> Dict[str, List[str]]:
+    """Maps each test file to every repository file it imports, directly or transitively."""
+    graph: Dict[str, List[str]] = {}
+    cache: Dict[str, Set[str]] = {}
+    for root, dirs, files in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ("venv", "node_modules", "__pycache__")]
+        for name in files:
+            rel_path = os.path.relpath(os.path.join(root, name), repo_path).replace(os.sep, "/")
+            if not _is_test_file(rel_path):
+                continue
+            seen, stack = set(), [rel_path]
+            while stack:
+                current = stack.pop()
+                if current not in cache:
+                    cache[current] = _imports_of(current, repo_path)
+                for dep in cache[current]:
+                    if dep not in seen:
+                        seen.add(dep)
+                        stack.append(dep)
+            graph[rel_path] = sorted(seen)
+    return graph
+
+
+def build_impact_map(repo_path: str, coverage_file: Optional[str] = None) -> dict:
+    """
+    Builds the impact map for the repository's current commit.
+
+    With a coverage data file recorded per test (pytest-cov --cov-context=test, or
+    coverage's dynamic_context = test_function), tests are mapped to the functions
+    they executed. The import graph of the test files is always included and is
+    used for files the coverage data doesn't cover.
+    """
+    _, commit, _ = platform_data_api.run_git_command(["git", "rev-parse", "HEAD"], repo_path)
+    imports = build_import_graph(repo_path)
+    files: Dict[str, dict] = {}
+
+    if coverage_file and os.path.exists(coverage_file):
+        for rel_path, tests in _read_coverage(coverage_file, repo_path, list(imports)).items():
+            if _is_test_file(rel_path):
+                continue
+            try:
+                with open(os.path.join(repo_path, rel_path), "r", encoding="utf-8", errors="ignore") as f:
+                    ranges = _function_ranges(f.read())
+            except OSError:
+                continue
+            scopes: Dict[str, Set[str]] = {}
+            for test_id, lines in tests.items():
+                for line in lines:
+                    scopes.setdefault(_scope_for_line(ranges, line), set()).add(test_id)
+            files[rel_path] = {
+                "functions": ranges,
+                "tests_by_scope": {scope: sorted(ids) for scope, ids in scopes.items()},
+            }
+
+    return {
+        "commit": commit.strip(),
+        "created_at": datetime.utcnow().isoformat(),
+        "files": files,
+        "imports": imports,
+    }
+
+
+def run_coverage_and_build(repo_path: str, python: str = sys.executable) -> dict:
+    """Runs the full suite under coverage with per-test contexts and builds the map from it."""
+    with tempfile.TemporaryDirectory(prefix="debugiq_impact_") as tmp:
+        rcfile = os.path.join(tmp, "coveragerc")
+        data_file = os.path.join(tmp, ".coverage")
+        with open(rcfile, "w") as f:
+            f.write("[run]\ndynamic_context = test_function\n")
+        subprocess.run(
+            [python, "-m", "coverage", "run", f"--rcfile={rcfile}", f"--data-file={data_file}", "-m", "pytest", "-q"],
+            cwd=repo_path, capture_output=True, text=True
+        )
+        return build_impact_map(repo_path, data_file)
+
+
+# --- Storage ---
+
+def repository_id(repo_path: str) -> str:
+    """
+    Identifies the repository a checkout belongs to: its origin URL without
+    credentials, so every clone of one repository shares a map. Checkouts
+    without a remote fall back to their own path.
+    """
+    return_code, stdout, _ = platform_data_api.run_git_command(["git", "config", "--get", "remote.origin.url"], repo_path)
+    url = stdout.strip() if return_code == 0 else ""
+    if not url:
+        return os.path.realpath(repo_path)
+    url = _CREDENTIALS_IN_URL.sub("//", url).rstrip("/")
+    return url[:-len(".git")] if url.endswith(".git") else url
+
+
+def _map_dir(repo_path: str) -> str:
+    identity = repository_id(repo_path)
+    readable = re.sub(r"[^A-Za-z0-9._-]+", "_", "/".join(identity.split("/")[-2:])).strip("_")
+    return os.path.join(IMPACT_MAP_DIR, f"{readable}-{hashlib.sha1(identity.encode()).hexdigest()[:12]}")
+
+
+def save_impact_map(repo_path: str, impact_map: dict) -> str:
+    directory = _map_dir(repo_path)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{impact_map['commit']}.json")
+    with open(path, "w") as f:
+        json.dump(impact_map, f)
+    return path
+
+
+def load_impact_map(repo_path: str, commit: str = "HEAD", directory: Optional[str] = None) -> Optional[dict]:
+    """Loads the map for `commit`, or for the closest ancestor that has one."""
+    directory = directory or _map_dir(repo_path)
+    if not os.path.isdir(directory):
+        return None
+    return_code, stdout, _ = platform_data_api.run_git_command(
+        ["git", "rev-list", f"--max-count={IMPACT_MAP_MAX_AGE_COMMITS}", commit], repo_path
+    )
+    if return_code != 0:
+        return None
+    for sha in stdout.split():
+        path = os.path.join(directory, f"{sha}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+    return None
+
+
+# --- Selection ---
+
+def changed_lines_from_diff(patch_diff: str) -> Dict[str, Set[int]]:
+    """Maps each changed file to the old-side line numbers touched by the diff."""
+    changed: Dict[str, Set[int]] = {}
+    old_path = new_path = None
+    current: Optional[Set[int]] = None
+    old_line = 0
+    for line in patch_diff.splitlines():
+        if line.startswith("--- "):
+            old_path = line[4:].split("\t")[0].strip()
+            old_path = old_path[2:] if old_path.startswith("a/") else old_path
+            continue
+        if line.startswith("+++ "):
+            new_path = line[4:].split("\t")[0].strip()
+            new_path = new_path[2:] if new_path.startswith("b/") else new_path
+            path = new_path if new_path != "/dev/null" else old_path
+            current = changed.setdefault(path, set())
+            continue
+        match = _HUNK_HEADER.match(line)
+        if match:
+            old_line = int(match.group(1))
+            continue
+        if current is None:
+            continue
+        if line.startswith("-"):
+            current.add(old_line)
+            old_line += 1
+        elif line.startswith("+"):
+            # Insertions are attributed to the old line they follow
+            current.add(max(old_line - 1, 1))
+        elif line.startswith(" "):
+            old_line += 1
+    return changed
+
+
+def _selection_state_path(directory: str) -> str:
+    return os.path.join(directory, "selection_state.json")
+
+
+def _runs_since_full_suite(directory: str) -> int:
+    try:
+        with open(_selection_state_path(directory)) as f:
+            return json.load(f).get("runs_since_full", 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _record_selection(directory: str, full_suite: bool):
+    count = 0 if full_suite else _runs_since_full_suite(directory) + 1
+    os.makedirs(directory, exist_ok=True)
+    with open(_selection_state_path(directory), "w") as f:
+        json.dump({"runs_since_full": count}, f)
+
+
+def select_tests(impact_map: Optional[dict], changed: Dict[str, Optional[Set[int]]]) -> TestSelection:
+    """
+    Chooses the tests affected by the changed files (and lines, when known).
+    Falls back to the full suite when there is no map or a change can't be attributed.
+    """
+    if not impact_map:
+        return TestSelection(full_suite=True, reason="No impact map available")
+
+    selected: Set[str] = set()
+    importers: Dict[str, Set[str]] = {}
+    for test_file, deps in impact_map.get("imports", {}).items():
+        for dep in deps:
+            importers.setdefault(dep, set()).add(test_file)
+
+    for path, lines in changed.items():
+        if FULL_SUITE_TRIGGERS.search(path):
+            return TestSelection(full_suite=True, reason=f"{path} affects the whole suite")
+        if not path.endswith(".py"):
+            continue
+        if _is_test_file(path):
+            selected.add(path)
+            continue
+
+        entry = impact_map.get("files", {}).get(path)
+        if entry:
+            by_scope = entry["tests_by_scope"]
+            scopes = {_scope_for_line(entry["functions"], line) for line in lines} if lines else set(by_scope)
+            if MODULE_SCOPE in scopes:
+                # Module-level changes (imports, constants) can affect every test that touches the file
+                scopes = set(by_scope)
+            for scope in scopes:
+                selected.update(by_scope.get(scope, []))
+        elif path in importers:
+            selected.update(importers[path])
+        else:
+            return TestSelection(full_suite=True, reason=f"No impact data for {path}")
+
+    return TestSelection(tests=sorted(selected), reason=f"Selected from impact map at {impact_map.get('commit', '')[:12]}")
+
+
+def select_tests_for_diff(repo_path: str, patch_diff: str, commit: str = "HEAD") -> TestSelection:
+    """Loads the stored map and selects tests for a diff, forcing a periodic full-suite run."""
+    directory = _map_dir(repo_path)
+    impact_map = load_impact_map(repo_path, commit, directory)
+    selection = select_tests(impact_map, changed_lines_from_diff(patch_diff))
+    if impact_map and not selection.full_suite and IMPACT_FULL_SUITE_EVERY > 0:
+        if _runs_since_full_suite(directory) + 1 >= IMPACT_FULL_SUITE_EVERY:
+            selection = TestSelection(full_suite=True, reason=f"Periodic full-suite run (every {IMPACT_FULL_SUITE_EVERY})")
+    if impact_map:
+        _record_selection(directory, selection.full_suite)
+    return selection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and store the test impact map for a repository")
+    parser.add_argument("--repo", default=".", help="Repository path")
+    parser.add_argument("--coverage-file", help="Existing per-test coverage data; runs the suite under coverage when omitted")
+    args = parser.parse_args()
+
+    if args.coverage_file:
+        impact_map = build_impact_map(args.repo, args.coverage_file)
+    else:
+        impact_map = run_coverage_and_build(args.repo)
+    path = save_impact_map(args.repo, impact_map)
+    print(f"Impact map for {impact_map['commit'][:12]} saved to {path} ({len(impact_map['files'])} covered files)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# DebugIQ-backend/scripts/issue_events.py
+
+import asyncio
+import itertools
+import os
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+# Recent events kept so reconnecting SSE clients can resume from Last-Event-ID
+ISSUE_EVENTS_HISTORY = int(os.getenv("ISSUE_EVENTS_HISTORY", "1000"))
+# Per-subscriber backlog; a slow client loses its oldest events rather than growing memory
+ISSUE_EVENTS_QUEUE_SIZE = int(os.getenv("ISSUE_EVENTS_QUEUE_SIZE", "100"))
+
+
+@dataclass(frozen=True)
+class IssueEvent:
+    id: int
+    issue_id: str
+    status: str
+    timestamp: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class Subscription:
+    """
+    One listener on the bus, bound to the event loop it subscribed from.
+    Empty filters mean "everything"; otherwise an event must match both.
+    """
+
+    def __init__(self, bus: "IssueEventBus", issue_ids: Iterable[str] = (), statuses: Iterable[str] = ()):
+        self._bus = bus
+        self.issue_ids = set(issue_ids or ())
+        self.statuses = set(statuses or ())
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=ISSUE_EVENTS_QUEUE_SIZE)
+        self.dropped = 0
+
+    def matches(self, event: IssueEvent) -> bool:
+        return (not self.issue_ids or event.issue_id in self.issue_ids) and \
+               (not self.statuses or event.status in self.statuses)
+
+    def _deliver(self, event: IssueEvent):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    def notify(self, event: IssueEvent):
+        """Thread-safe: hands the event to the subscriber's loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # Loop has shut down without unsubscribing
+            self._bus.unsubscribe(self)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[IssueEvent]:
+        """Next matching event, or None if `timeout` elapses first."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._bus.unsubscribe(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+class IssueEventBus:
+    """
+    In-process pub/sub for issue status changes.
+
+    `update_issue_status` publishes from whatever thread the workflow runs on;
+    SSE/WebSocket/long-poll handlers subscribe from the event loop.
+    """
+
+    def __init__(self, history_size: int = ISSUE_EVENTS_HISTORY):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: set = set()
+
+    def publish(self, issue_id: str, status: str, event_id: Optional[int] = None,
+                timestamp: Optional[str] = None) -> IssueEvent:
+        """`event_id`/`timestamp` come from the shared transition log when workers share state."""
+        with self._lock:
+            event = IssueEvent(next(self._ids) if event_id is None else event_id, issue_id, status,
+                               timestamp or datetime.utcnow().isoformat())
+            self._history.append(event)
+            subscribers = [s for s in self._subscribers if s.matches(event)]
+        for subscription in subscribers:
+            subscription.notify(event)
+        return event
+
+    def subscribe(self, issue_ids: Iterable[str] = (), statuses: Iterable[str] = (),
+                  last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Must be called from a running event loop. With `last_event_id`, matching
+        events still in the history are replayed first.
+        """
+        subscription = Subscription(self, issue_ids, statuses)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is not None:
+                for event in self._history:
+                    if event.id > last_event_id and subscription.matches(event):
+                        subscription._deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def recent(self, issue_id: Optional[str] = None) -> List[IssueEvent]:
+        with self._lock:
+            return [e for e in self._history if issue_id is None or e.issue_id == issue_id]
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+_bus: Optional[IssueEventBus] = None
+_bus_lock = threading.Lock()
+
+def get_issue_event_bus() -> IssueEventBus:
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = IssueEventBus()
+    return _bus
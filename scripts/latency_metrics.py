@@ -0,0 +1,165 @@
+# DebugIQ-backend/scripts/latency_metrics.py
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; spans fast git plumbing through multi-minute validation runs
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# Label combinations kept per histogram; anything beyond is folded into a single "other" series
+LATENCY_MAX_SERIES = int(os.getenv("LATENCY_MAX_SERIES", "50"))
+OVERFLOW_LABEL = "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}" if pairs else ""
+
+
+class _Timer:
+    """Context manager returned by Histogram.time(); set `.outcome` to override ok/error."""
+
+    def __init__(self, histogram: "Histogram", labels: dict):
+        self._histogram = histogram
+        self._labels = labels
+        self.outcome: Optional[str] = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        labels = dict(self._labels)
+        if "outcome" in self._histogram.label_names and "outcome" not in labels:
+            labels["outcome"] = self.outcome or ("error" if exc_type else "ok")
+        self._histogram.observe(time.perf_counter() - self._started, **labels)
+        return False
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram. An observation is a bisect plus a few integer
+    increments under a lock, and the number of label series is capped.
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, max_series: int = LATENCY_MAX_SERIES):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self.max_series = max_series
+        self._series: Dict[tuple, list] = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= self.max_series:
+                    key = (OVERFLOW_LABEL,) * len(self.label_names)
+                    series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def time(self, **labels) -> _Timer:
+        return _Timer(self, labels)
+
+    def snapshot(self) -> Dict[tuple, Tuple[List[int], float, int]]:
+        with self._lock:
+            return {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+
+    def export(self) -> List[list]:
+        """JSON-friendly snapshot: [[label values, bucket counts, sum, count], ...]."""
+        return [[list(key), counts, total, count] for key, (counts, total, count) in self.snapshot().items()]
+
+    def render(self, snapshot: Optional[Dict[tuple, Tuple[List[int], float, int]]] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        snapshot = self.snapshot() if snapshot is None else snapshot
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            pairs = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {count}")
+        return lines
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator form of histogram.time(**labels)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (), **kwargs) -> Histogram:
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(name, help_text, label_names, **kwargs)
+            return self._histograms[name]
+
+    def export(self) -> Dict[str, List[list]]:
+        with self._lock:
+            histograms = list(self._histograms.values())
+        return {histogram.name: histogram.export() for histogram in histograms}
+
+    def render(self, exports: Optional[Sequence[Dict[str, List[list]]]] = None) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4). With `exports` (from
+        export() in several processes), renders their sum instead of local data.
+        """
+        with self._lock:
+            histograms = list(self._histograms.values())
+        lines = []
+        for histogram in histograms:
+            if exports is None:
+                lines += histogram.render()
+                continue
+            merged: Dict[tuple, list] = {}
+            for export in exports:
+                for key, counts, total, count in export.get(histogram.name, ()):
+                    series = merged.setdefault(tuple(key), [[0] * len(counts), 0.0, 0])
+                    series[0] = [a + b for a, b in zip(series[0], counts)]
+                    series[1] += total
+                    series[2] += count
+            lines += histogram.render({key: tuple(series) for key, series in merged.items()})
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+WORKFLOW_STAGE_SECONDS = registry.histogram(
+    "debugiq_workflow_stage_seconds", "Duration of autonomous workflow stages.", ("stage", "outcome"))
+LLM_CALL_SECONDS = registry.histogram(
+    "debugiq_llm_call_seconds", "Duration of LLM API calls.", ("task", "outcome"))
+GIT_COMMAND_SECONDS = registry.histogram(
+    "debugiq_git_command_seconds", "Duration of git subprocess calls.", ("subcommand", "outcome"))
+
+
+def git_subcommand(command: Sequence[str]) -> str:
+    """`git fetch --depth 1 origin` -> "fetch"; keeps the label set to git's verbs."""
+    args = list(command[1:]) if command and os.path.basename(command[0]) == "git" else list(command)
+    return next((arg for arg in args if not arg.startswith("-")), "")
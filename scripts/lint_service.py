@@ -0,0 +1,359 @@
+# DebugIQ-backend/scripts/lint_service.py
+
+import configparser
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+LINT_CACHE_MAX_ENTRIES = int(os.getenv("LINT_CACHE_MAX_ENTRIES", "5000"))
+# Set LINT_CACHE_DIR to an empty string to disable the on-disk tier.
+LINT_CACHE_DIR = os.getenv("LINT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "debugiq_lint_cache"))
+LINT_TIMEOUT_SECONDS = float(os.getenv("LINT_TIMEOUT_SECONDS", "60"))
+
+# Files flake8 reads its [flake8] section from
+LINT_CONFIG_FILES = (".flake8", "setup.cfg", "tox.ini")
+# flake8's own default ignore list
+DEFAULT_IGNORE = ("E121", "E123", "E126", "E226", "E24", "E704", "W503", "W504")
+DEFAULT_MAX_LINE_LENGTH = 79
+
+# flake8's codes for pyflakes messages (flake8.plugins.pyflakes.FLAKE8_PYFLAKES_CODES), so the
+# in-process linter reports the same codes when flake8 itself isn't installed
+PYFLAKES_CODES = {
+    "UnusedImport": "F401",
+    "ImportShadowedByLoopVar": "F402",
+    "ImportStarUsed": "F403",
+    "LateFutureImport": "F404",
+    "ImportStarUsage": "F405",
+    "ImportStarNotPermitted": "F406",
+    "FutureFeatureNotDefined": "F407",
+    "PercentFormatInvalidFormat": "F501",
+    "PercentFormatExpectedMapping": "F502",
+    "PercentFormatExpectedSequence": "F503",
+    "PercentFormatExtraNamedArguments": "F504",
+    "PercentFormatMissingArgument": "F505",
+    "PercentFormatMixedPositionalAndNamed": "F506",
+    "PercentFormatPositionalCountMismatch": "F507",
+    "PercentFormatStarRequiresSequence": "F508",
+    "PercentFormatUnsupportedFormatCharacter": "F509",
+    "StringDotFormatInvalidFormat": "F521",
+    "StringDotFormatExtraNamedArguments": "F522",
+    "StringDotFormatExtraPositionalArguments": "F523",
+    "StringDotFormatMissingArgument": "F524",
+    "StringDotFormatMixingAutomatic": "F525",
+    "FStringMissingPlaceholders": "F541",
+    "MultiValueRepeatedKeyLiteral": "F601",
+    "MultiValueRepeatedKeyVariable": "F602",
+    "TooManyExpressionsInStarredAssignment": "F621",
+    "TwoStarredExpressions": "F622",
+    "AssertTuple": "F631",
+    "IsLiteral": "F632",
+    "InvalidPrintSyntax": "F633",
+    "IfTuple": "F634",
+    "BreakOutsideLoop": "F701",
+    "ContinueOutsideLoop": "F702",
+    "YieldOutsideFunction": "F704",
+    "ReturnOutsideFunction": "F706",
+    "DefaultExceptNotLast": "F707",
+    "DoctestSyntaxError": "F721",
+    "ForwardAnnotationSyntaxError": "F722",
+    "RedefinedWhileUnused": "F811",
+    "UndefinedName": "F821",
+    "UndefinedExport": "F822",
+    "UndefinedLocal": "F823",
+    "UnusedIndirectAssignment": "F824",
+    "DuplicateArgument": "F831",
+    "UnusedVariable": "F841",
+    "UnusedAnnotation": "F842",
+    "RaiseNotImplemented": "F901",
+}
+
+# Same inline suppression syntax flake8 accepts: "# noqa" or "# noqa: E501,F401"
+_NOQA = re.compile(r"#\s*noqa(?::[\s]?(?P<codes>[A-Z][0-9]+(?:[,\s]+[A-Z][0-9]+)*))?", re.IGNORECASE)
+
+
+def blob_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _split_codes(value: str) -> List[str]:
+    return [code.strip() for code in value.replace("\n", ",").split(",") if code.strip()]
+
+
+def load_lint_config(repo_path: Optional[str]) -> dict:
+    """Reads the [flake8] options relevant to the in-process linter from the repository."""
+    config = {
+        "max_line_length": DEFAULT_MAX_LINE_LENGTH,
+        "ignore": list(DEFAULT_IGNORE),
+        "select": [],
+        "raw": "",
+    }
+    if not repo_path:
+        return config
+    for name in LINT_CONFIG_FILES:
+        path = os.path.join(repo_path, name)
+        if not os.path.isfile(path):
+            continue
+        parser = configparser.RawConfigParser()
+        try:
+            parser.read(path)
+        except configparser.Error:
+            continue
+        if not parser.has_section("flake8"):
+            continue
+        section = dict(parser.items("flake8"))
+        if "max-line-length" in section:
+            config["max_line_length"] = int(section["max-line-length"])
+        if "ignore" in section:
+            config["ignore"] = _split_codes(section["ignore"])
+        config["ignore"] += _split_codes(section.get("extend-ignore", ""))
+        config["select"] = _split_codes(section.get("select", ""))
+        config["raw"] = json.dumps(section, sort_keys=True)
+        break  # flake8 uses the first config file it finds
+    return config
+
+
+def config_hash(config: dict) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def _code_allowed(code: str, config: dict) -> bool:
+    if config["select"] and not any(code.startswith(prefix) for prefix in config["select"]):
+        return False
+    return not any(code.startswith(prefix) for prefix in config["ignore"])
+
+
+def _suppressed(code: str, line: str) -> bool:
+    match = _NOQA.search(line)
+    if not match:
+        return False
+    codes = match.group("codes")
+    return codes is None or any(code.startswith(c) for c in re.split(r"[,\s]+", codes.upper()))
+
+
+class InProcessFlake8:
+    """
+    pyflakes + pycodestyle run inside this process, reporting in flake8's
+    "path:line:col: CODE message" format. Avoids a process start per file.
+    """
+
+    def __init__(self):
+        import pycodestyle
+        import pyflakes
+        import pyflakes.api
+        import pyflakes.reporter
+        try:
+            # An installed flake8 knows about messages newer than the table above
+            from flake8.plugins.pyflakes import FLAKE8_PYFLAKES_CODES
+        except ImportError:
+            FLAKE8_PYFLAKES_CODES = {}
+        self._pycodestyle = pycodestyle
+        self._pyflakes_api = pyflakes.api
+        self._pyflakes_reporter = pyflakes.reporter
+        self._pyflakes_codes = {**PYFLAKES_CODES, **FLAKE8_PYFLAKES_CODES}
+        self.name = f"pyflakes-{pyflakes.__version__}+pycodestyle-{pycodestyle.__version__}"
+        self._style_options = {}
+
+    def _options(self, max_line_length: int):
+        # Option parsing is the expensive part of a pycodestyle check; do it once per setting
+        if max_line_length not in self._style_options:
+            guide = self._pycodestyle.StyleGuide(max_line_length=max_line_length, quiet=True)
+            self._style_options[max_line_length] = guide.options
+        return self._style_options[max_line_length]
+
+    def lint(self, source: str, filename: str, config: dict) -> List[str]:
+        findings = []
+
+        class _Collector(self._pyflakes_reporter.Reporter):
+            def __init__(collector):
+                super().__init__(io.StringIO(), io.StringIO())
+
+            def syntaxError(collector, _filename, msg, lineno, offset, _text):
+                findings.append((lineno or 1, offset or 1, "E999", f"SyntaxError: {msg}"))
+
+            def unexpectedError(collector, _filename, msg):
+                findings.append((1, 1, "E902", str(msg)))
+
+            def flake(collector, message):
+                code = self._pyflakes_codes.get(type(message).__name__, "F999")
+                findings.append((message.lineno, message.col + 1, code, message.message % message.message_args))
+
+        self._pyflakes_api.check(source, filename, _Collector())
+        lines = source.splitlines(True)
+        if any(code == "E999" for _, _, code, _ in findings):
+            # Like flake8, report only the syntax error for unparsable files
+            return [f"{filename}:{line}:{col}: {code} {message}" for line, col, code, message in findings if code == "E999"]
+
+        style = self._pycodestyle.Checker(filename, lines=lines, options=self._options(config["max_line_length"]))
+
+        def report_error(line_number, offset, text, check):
+            code, _, message = text.partition(" ")
+            findings.append((line_number, offset + 1, code, message))
+
+        style.report_error = report_error
+        style.check_all()
+
+        findings.sort()
+        return [
+            f"{filename}:{line}:{col}: {code} {message}"
+            for line, col, code, message in findings
+            if _code_allowed(code, config) and not (0 < line <= len(lines) and _suppressed(code, lines[line - 1]))
+        ]
+
+
+class SubprocessFlake8:
+    """Fallback when pyflakes/pycodestyle can't be imported: `flake8 -` fed over stdin, no temp files."""
+
+    def __init__(self, command: Optional[List[str]] = None):
+        self.command = command or ([shutil.which("flake8")] if shutil.which("flake8") else [sys.executable, "-m", "flake8"])
+        try:
+            version = subprocess.run(self.command + ["--version"], capture_output=True, text=True, timeout=LINT_TIMEOUT_SECONDS).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            version = ""
+        self.name = "flake8-" + (version.split()[0] if version.strip() else "unknown")
+
+    def lint(self, source: str, filename: str, config: dict) -> List[str]:
+        cmd = self.command + [
+            f"--max-line-length={config['max_line_length']}",
+            f"--ignore={','.join(config['ignore'])}",
+            f"--stdin-display-name={filename}",
+        ]
+        if config["select"]:
+            cmd.append(f"--select={','.join(config['select'])}")
+        result = subprocess.run(cmd + ["-"], input=source, capture_output=True, text=True, timeout=LINT_TIMEOUT_SECONDS)
+        if result.returncode not in (0, 1):
+            raise RuntimeError(f"flake8 failed: {result.stderr.strip()}")
+        return [line for line in result.stdout.splitlines() if line.strip()]
+
+
+def default_linter():
+    try:
+        return InProcessFlake8()
+    except ImportError:
+        return SubprocessFlake8()
+
+
+class LintService:
+    """
+    Lints Python sources with results cached by (tool, config hash, blob hash).
+
+    Unchanged files are never re-linted, so re-validating a patch that only
+    differs in one file costs one lint. The memory tier is an LRU bounded by
+    entry count; the disk tier survives restarts.
+    """
+
+    def __init__(self, linter=None, max_entries: int = LINT_CACHE_MAX_ENTRIES, disk_dir: Optional[str] = LINT_CACHE_DIR):
+        self._linter = linter
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir or None
+        self._memory: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._linter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def linter(self):
+        # Built on first use: importing the linters is the slow part we only want once
+        if self._linter is None:
+            with self._linter_lock:
+                if self._linter is None:
+                    self._linter = default_linter()
+        return self._linter
+
+    def _cache_key(self, source: str, filename: str, config: dict) -> str:
+        # The filename is part of the output lines, so it is part of the key
+        raw = "\x00".join([self.linter.name, config_hash(config), blob_hash(source), filename])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + ".json")
+
+    def _lookup(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key)) as f:
+                    findings = json.load(f)
+            except (OSError, ValueError):
+                findings = None
+            if findings is not None:
+                self._remember(key, findings)
+                with self._lock:
+                    self.hits += 1
+                return findings
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key: str, findings: List[str]):
+        with self._lock:
+            self._memory[key] = findings
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, key: str, findings: List[str]):
+        self._remember(key, findings)
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(findings, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write lint cache entry: {e}")
+
+    def lint_source(self, source: str, filename: str = "patched.py", config: Optional[dict] = None) -> List[str]:
+        """Returns flake8-style findings for one source blob."""
+        config = config or load_lint_config(None)
+        key = self._cache_key(source, filename, config)
+        findings = self._lookup(key)
+        if findings is None:
+            findings = self.linter.lint(source, filename, config)
+            self._store(key, findings)
+        return findings
+
+    def lint_files(self, repo_path: str, files: Iterable[str]) -> Dict[str, List[str]]:
+        """Lints the given repository-relative Python files; deleted or non-Python files are skipped."""
+        config = load_lint_config(repo_path)
+        results = {}
+        for path in files:
+            full_path = os.path.join(repo_path, path)
+            if not path.endswith(".py") or not os.path.isfile(full_path):
+                continue
+            with open(full_path, encoding="utf-8", errors="replace") as f:
+                results[path] = self.lint_source(f.read(), path, config)
+        return results
+
+    def lint_diff(self, repo_path: str, patch_diff: str) -> Dict[str, List[str]]:
+        """Lints only the files a diff touches, as they are in `repo_path` (i.e. after applying it)."""
+        from scripts.validation_engine import changed_files_from_diff
+        return self.lint_files(repo_path, changed_files_from_diff(patch_diff))
+
+
+_service: Optional[LintService] = None
+_service_lock = threading.Lock()
+
+def get_lint_service() -> LintService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = LintService()
+    return _service
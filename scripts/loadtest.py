@@ -0,0 +1,452 @@
+# DebugIQ-backend/scripts/loadtest.py
+
+"""
+Offline end-to-end load test for the DebugIQ API.
+
+Starts the app under uvicorn against a deterministic fake LLM
+(scripts/fake_llm_server.py), a bare Git repository on local disk and the
+fake Git platform API, then drives the ingest, workflow, analyze, qa and
+voice endpoints at a fixed concurrency and reports throughput and latency
+percentiles per scenario. Nothing leaves the machine.
+
+    python -m scripts.loadtest --concurrency 16 --requests 200
+    python -m scripts.loadtest --scenarios analyze,qa --max-p95-ms 500 --json
+
+Exits non-zero when a --max-* gate is exceeded, so releases can be gated on it.
+Default scenarios whose router fails to import are skipped (and listed);
+scenarios asked for with --scenarios fail the run instead.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from scripts.fake_git_platform_server import FakeGitPlatformServer
+from scripts.fake_llm_server import FakeLLMServer
+from scripts.shared_state import SharedStateDB, SQLiteIssueStore
+
+# Requests in flight at once, per scenario
+LOADTEST_CONCURRENCY = int(os.getenv("LOADTEST_CONCURRENCY", "8"))
+# Measured requests per scenario (after warm-up)
+LOADTEST_REQUESTS = int(os.getenv("LOADTEST_REQUESTS", "50"))
+# Unmeasured requests per scenario; the first one also imports the lazily loaded router
+LOADTEST_WARMUP = int(os.getenv("LOADTEST_WARMUP", "2"))
+# Fake LLM pacing: time to first token, then tokens per second (0 = instant)
+LOADTEST_LLM_FIRST_TOKEN_SECONDS = float(os.getenv("LOADTEST_LLM_FIRST_TOKEN_SECONDS", "0.05"))
+LOADTEST_LLM_TOKENS_PER_SECOND = float(os.getenv("LOADTEST_LLM_TOKENS_PER_SECOND", "400"))
+LOADTEST_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LOADTEST_REQUEST_TIMEOUT_SECONDS", "120"))
+LOADTEST_STARTUP_TIMEOUT_SECONDS = float(os.getenv("LOADTEST_STARTUP_TIMEOUT_SECONDS", "60"))
+
+SERVICE_PY = "def divide(a, b):\n    return a / b\n"
+TEST_SERVICE_PY = "from service import divide\n\n\ndef test_divide():\n    assert divide(6, 3) == 2\n"
+
+
+# --- Offline dependencies ---
+
+def _git(*args: str, cwd: Optional[str] = None):
+    subprocess.run(["git", "-c", "user.name=DebugIQ Loadtest", "-c", "user.email=loadtest@debugiq.local", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def create_git_host(root: str) -> str:
+    """A bare repository (acme/service.git) holding a small buggy module; returns its file:// URL."""
+    bare = os.path.join(root, "acme", "service.git")
+    work = os.path.join(root, "seed")
+    _git("init", "-q", "--bare", "-b", "main", bare)
+    _git("init", "-q", "-b", "main", work)
+    with open(os.path.join(work, "service.py"), "w") as f:
+        f.write(SERVICE_PY)
+    with open(os.path.join(work, "test_service.py"), "w") as f:
+        f.write(TEST_SERVICE_PY)
+    _git("add", ".", cwd=work)
+    _git("commit", "-qm", "Initial commit", cwd=work)
+    _git("push", "-q", bare, "main", cwd=work)
+    shutil.rmtree(work)
+    return "file://" + bare
+
+
+def seed_issues(store, repository_url: str, count: int) -> List[str]:
+    """Creates `count` open issues against the local repository for the workflow scenario."""
+    issue_ids = []
+    for number in range(1, count + 1):
+        issue_id = f"LOADTEST-{number:04d}"
+        store[issue_id] = {
+            "id": issue_id,
+            "title": f"ZeroDivisionError in divide ({number})",
+            "description": "divide() crashes when the divisor is zero.",
+            "error_message": "ZeroDivisionError: division by zero",
+            "logs": 'File "service.py", line 2, in divide\n    return a / b\nZeroDivisionError: division by zero',
+            "relevant_files": ["service.py"],
+            "repository": repository_url,
+            "status": "New",
+        }
+        issue_ids.append(issue_id)
+    return issue_ids
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ScenarioUnavailable(RuntimeError):
+    """Raised when a scenario that was asked for explicitly can't run because its router failed to load."""
+
+
+class AppServer:
+    """The API under uvicorn in a child process, wired to the fakes through its environment."""
+
+    def __init__(self, env: Dict[str, str], workers: int = 1, log_path: Optional[str] = None):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = {**os.environ, **env, "WEB_CONCURRENCY": str(workers)}
+        self.workers = workers
+        self.log_path = log_path or os.devnull
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> "AppServer":
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self._log = open(self.log_path, "wb")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=root, env=self.env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + LOADTEST_STARTUP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if httpx.get(self.url + "/health", timeout=1).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        self.stop()
+        raise RuntimeError(f"API did not become healthy on {self.url}; see {self.log_path}")
+
+    def router_errors(self, names: Sequence[str], timeout: float = LOADTEST_STARTUP_TIMEOUT_SECONDS) -> Dict[str, str]:
+        """
+        Waits for the named routers to finish importing (ROUTER_WARMUP starts them
+        at startup) and returns the import error of each one that failed.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            rows = {row["name"]: row for row in httpx.get(self.url + "/health/imports", timeout=10).json()["routers"]}
+            settled = all(rows[name]["loaded"] or rows[name]["error"] for name in names)
+            if settled or time.monotonic() >= deadline:
+                return {name: row["error"] for name, row in rows.items() if row["error"]}
+            time.sleep(0.1)
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if getattr(self, "_log", None):
+            self._log.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# --- Scenarios ---
+
+def _check_llm_reply(response: httpx.Response) -> Optional[str]:
+    # The chat helpers turn SDK failures into a 200 with an error string
+    return "LLM call failed" if "[GPT-4o" in response.text else None
+
+
+def _check_analysis(response: httpx.Response) -> Optional[str]:
+    return _check_llm_reply(response) or (
+        "no patch in LLM reply" if response.json().get("patch", "").startswith("# No patch") else None)
+
+
+def _check_workflow(response: httpx.Response) -> Optional[str]:
+    body = response.json()
+    if not isinstance(body, dict):
+        return "workflow returned no result"
+    return str(body["error"])[:120] if body.get("error") else None
+
+
+def _check_triage(response: httpx.Response) -> Optional[str]:
+    return None if response.json() else "triage returned no issue"
+
+
+def _check_audio(response: httpx.Response) -> Optional[str]:
+    return None if response.headers.get("content-type", "").startswith("audio/") else "no audio returned"
+
+
+@dataclass
+class Scenario:
+    name: str
+    router: str  # Name the API's lazy router registry knows it by
+    path: str
+    payload: Callable[[int, Sequence[str]], dict]  # (request number, seeded issue ids) -> JSON body
+    check: Optional[Callable[[httpx.Response], Optional[str]]] = None  # -> error message, or None if OK
+
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in [
+    Scenario("ingest", "autonomous", "/workflow/workflow/triage", lambda n, _: {"raw_data": {
+        "source": "loadtest", "summary": f"ZeroDivisionError in divide (ingest {n})",
+        "logs": "ZeroDivisionError: division by zero", "repository": "acme/service"}}, _check_triage),
+    Scenario("workflow", "autonomous", "/workflow/workflow/run", lambda n, issues: {"issue_id": issues[n % len(issues)]},
+             _check_workflow),
+    Scenario("analyze", "analyze", "/debugiq/analyze", lambda n, _: {
+        "trace": 'File "service.py", line 2, in divide\nZeroDivisionError: division by zero',
+        "language": "python", "config": {}, "source_files": {"service.py": SERVICE_PY + f"# request {n}\n"}},
+        _check_analysis),
+    Scenario("qa", "qa", "/qa/", lambda n, _: {
+        "trace": "ZeroDivisionError: division by zero", "patch": "if b == 0:\n    return 0",
+        "language": "python", "source_files": {"service.py": SERVICE_PY}, "patched_file_name": "service.py",
+        "request": n}, _check_llm_reply),
+    Scenario("voice", "voice", "/voice/command", lambda n, _: {"text_command": f"Show the status of issue {n}"},
+             _check_llm_reply),
+    Scenario("speak", "voice", "/voice/speak", lambda n, _: {"text_command": f"Patch {n} validated and ready for review."},
+             _check_audio),
+]}
+DEFAULT_SCENARIOS = ("ingest", "workflow", "analyze", "qa", "voice")
+
+
+# --- Measurement ---
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile (0-100) of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(latencies: Sequence[float], errors: Counter, elapsed: float) -> dict:
+    """Throughput and latency percentiles (ms) for one scenario; failed requests count toward latency too."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    failed = sum(errors.values())
+    return {
+        "requests": count,
+        "errors": failed,
+        "error_rate": round(failed / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+        "top_errors": dict(errors.most_common(3)),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int,
+                       warmup: int = 0, issue_ids: Sequence[str] = ()) -> dict:
+    """Closed loop: `concurrency` workers send the scenario's requests back to back until `requests` are done."""
+
+    async def send(number: int) -> Optional[str]:
+        try:
+            response = await client.post(scenario.path, json=scenario.payload(number, issue_ids))
+        except httpx.HTTPError as e:
+            return type(e).__name__
+        if response.status_code >= 400:
+            return f"HTTP {response.status_code}"
+        try:
+            return scenario.check(response) if scenario.check else None
+        except ValueError:
+            return "unparseable response"
+
+    for number in range(warmup):
+        await send(requests + number)
+
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for number in remaining:
+            started = time.perf_counter()
+            error = await send(number)
+            latencies.append(time.perf_counter() - started)
+            if error:
+                errors[error] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, requests)))))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def split_runnable(scenarios: Sequence[str], router_errors: Dict[str, str],
+                   explicit: bool) -> Tuple[List[str], Dict[str, str]]:
+    """
+    (scenarios to run, {skipped scenario: reason}) given the routers that failed
+    to import. Raises ScenarioUnavailable if an explicitly requested scenario
+    can't run, or if nothing can.
+    """
+    unavailable = {name: f"router '{SCENARIOS[name].router}' failed to load: {router_errors[SCENARIOS[name].router]}"
+                   for name in scenarios if SCENARIOS[name].router in router_errors}
+    if unavailable and explicit:
+        raise ScenarioUnavailable("; ".join(f"{name}: {reason}" for name, reason in unavailable.items()))
+    runnable = [name for name in scenarios if name not in unavailable]
+    if not runnable:
+        raise ScenarioUnavailable("No scenario can run: " + "; ".join(f"{name}: {reason}" for name, reason in unavailable.items()))
+    return runnable, unavailable
+
+
+def run_loadtest(scenarios: Optional[Sequence[str]] = None, requests: int = LOADTEST_REQUESTS,
+                 concurrency: int = LOADTEST_CONCURRENCY, warmup: int = LOADTEST_WARMUP, workers: int = 1,
+                 first_token_seconds: float = LOADTEST_LLM_FIRST_TOKEN_SECONDS,
+                 tokens_per_second: float = LOADTEST_LLM_TOKENS_PER_SECOND) -> dict:
+    """
+    Brings up the fakes and the API, runs each scenario in turn and returns the report.
+
+    Without `scenarios`, runs DEFAULT_SCENARIOS and skips those whose router failed
+    to import (listed under "skipped"). Scenarios named explicitly must all be
+    runnable; otherwise ScenarioUnavailable is raised before any load is sent.
+    """
+    explicit = scenarios is not None
+    scenarios = list(scenarios if explicit else DEFAULT_SCENARIOS)
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    root = tempfile.mkdtemp(prefix="debugiq_loadtest_")
+    try:
+        with FakeLLMServer(first_token_seconds=first_token_seconds, tokens_per_second=tokens_per_second) as llm, \
+                FakeGitPlatformServer(rate_limit=10 ** 9) as git_platform:
+            repository_url = create_git_host(os.path.join(root, "git"))
+            # The API's issue store is this SQLite file, so issues can be seeded before it starts
+            state_db = os.path.join(root, "state.db")
+            issue_ids = seed_issues(SQLiteIssueStore(SharedStateDB(state_db)), repository_url, requests + warmup)
+            env = {
+                "OPENAI_API_KEY": "loadtest",
+                "OPENAI_BASE_URL": llm.url + "/v1",
+                "OPENAI_API_BASE": llm.url + "/v1",
+                "GITHUB_API_URL": git_platform.url,
+                "GITHUB_TOKEN": git_platform.token,
+                "GIT_PLATFORM_TOKEN": git_platform.token,
+                "SHARED_STATE_DB": state_db,
+                "SPEECH_CACHE_DIR": os.path.join(root, "speech_cache"),
+                "SANDBOX_ROOT": os.path.join(root, "sandboxes"),
+                "VALIDATION_TEST_CMD": f"{sys.executable} -m pytest -q",
+                "LOG_LEVEL": "WARNING",
+                "ROUTER_WARMUP": ",".join(sorted({SCENARIOS[name].router for name in scenarios})),
+            }
+            log_path = os.path.join(root, "api.log")
+            with AppServer(env, workers=workers, log_path=log_path) as api:
+                # A router that failed to import answers 404 to everything; don't measure that as load
+                router_errors = api.router_errors([SCENARIOS[name].router for name in scenarios])
+                runnable, unavailable = split_runnable(scenarios, router_errors, explicit)
+
+                async def drive():
+                    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+                    async with httpx.AsyncClient(base_url=api.url, limits=limits,
+                                                 timeout=LOADTEST_REQUEST_TIMEOUT_SECONDS) as client:
+                        return {name: await run_scenario(client, SCENARIOS[name], requests, concurrency, warmup,
+                                                         issue_ids)
+                                for name in runnable}
+
+                results = asyncio.run(drive())
+            return {
+                "config": {"requests": requests, "concurrency": concurrency, "warmup": warmup, "workers": workers,
+                           "llm_first_token_seconds": first_token_seconds,
+                           "llm_tokens_per_second": tokens_per_second},
+                "scenarios": results,
+                "skipped": unavailable,
+                "llm": llm.stats(),
+                "git_platform_requests": git_platform.total_requests(),
+                "router_errors": router_errors,
+            }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def gate_failures(report: dict, max_p95_ms: Optional[float] = None, max_p99_ms: Optional[float] = None,
+                  max_error_rate: Optional[float] = None, min_rps: Optional[float] = None) -> List[str]:
+    """The thresholds a report exceeds, as readable messages (empty when it passes)."""
+    failures = []
+    for name, result in report["scenarios"].items():
+        if max_p95_ms is not None and result["p95_ms"] > max_p95_ms:
+            failures.append(f"{name}: p95 {result['p95_ms']}ms > {max_p95_ms}ms")
+        if max_p99_ms is not None and result["p99_ms"] > max_p99_ms:
+            failures.append(f"{name}: p99 {result['p99_ms']}ms > {max_p99_ms}ms")
+        if max_error_rate is not None and result["error_rate"] > max_error_rate:
+            failures.append(f"{name}: error rate {result['error_rate']:.2%} > {max_error_rate:.2%}")
+        if min_rps is not None and result["throughput_rps"] < min_rps:
+            failures.append(f"{name}: {result['throughput_rps']} req/s < {min_rps} req/s")
+    return failures
+
+
+def format_report(report: dict) -> str:
+    config = report["config"]
+    lines = [
+        f"📊 DebugIQ load test: {config['requests']} requests x {config['concurrency']} concurrent, "
+        f"{config['workers']} worker(s), LLM {config['llm_first_token_seconds']}s + "
+        f"{config['llm_tokens_per_second'] or '∞'} tok/s",
+        f"{'scenario':<10} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}",
+    ]
+    for name, result in report["scenarios"].items():
+        lines.append(f"{name:<10} {result['throughput_rps']:>8} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+                     f"{result['p99_ms']:>9} {result['max_ms']:>9} {result['errors']:>7}")
+        for message, count in result["top_errors"].items():
+            lines.append(f"  ⚠️ {count}x {message}")
+    lines.append(f"LLM calls: {report['llm']['requests']} ({report['llm']['completion_tokens']} completion tokens), "
+                 f"Git platform API calls: {report['git_platform_requests']}")
+    for name, reason in report.get("skipped", {}).items():
+        lines.append(f"⏭️ Skipped {name}: {reason}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline load test for the DebugIQ API.")
+    parser.add_argument("--scenarios", help=f"Comma-separated, from: {', '.join(SCENARIOS)} "
+                                            f"(default: {','.join(DEFAULT_SCENARIOS)}, minus any that can't load)")
+    parser.add_argument("--requests", type=int, default=LOADTEST_REQUESTS, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=LOADTEST_CONCURRENCY)
+    parser.add_argument("--warmup", type=int, default=LOADTEST_WARMUP)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--llm-first-token-seconds", type=float, default=LOADTEST_LLM_FIRST_TOKEN_SECONDS)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=LOADTEST_LLM_TOKENS_PER_SECOND)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--max-p95-ms", type=float)
+    parser.add_argument("--max-p99-ms", type=float)
+    parser.add_argument("--max-error-rate", type=float, help="Fraction, e.g. 0.01")
+    parser.add_argument("--min-rps", type=float)
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_loadtest(
+            scenarios=[name.strip() for name in args.scenarios.split(",") if name.strip()] if args.scenarios else None,
+            requests=args.requests, concurrency=args.concurrency, warmup=args.warmup, workers=args.workers,
+            first_token_seconds=args.llm_first_token_seconds, tokens_per_second=args.llm_tokens_per_second,
+        )
+    except ScenarioUnavailable as e:
+        print(f"❌ {e}")
+        return 2
+    failures = gate_failures(report, args.max_p95_ms, args.max_p99_ms, args.max_error_rate, args.min_rps)
+    report["gate_failures"] = failures
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    if failures and not args.json:
+        print("\n".join(["❌ Gate failed:"] + [f"  - {failure}" for failure in failures]))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
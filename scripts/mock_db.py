@@ -0,0 +1,8 @@
+# DebugIQ-backend/scripts/mock_db.py
+
+from scripts.shared_state import issue_store
+
+# Issue store used by platform_data_api until a real database is wired.
+# issue_id -> issue dict (status, last_updated, diagnosis, validation_results, ...)
+# A dict in a single process; a SQLite-backed mapping when workers share state (SHARED_STATE_DB).
+db = issue_store()
@@ -0,0 +1,387 @@
+# DebugIQ-backend/scripts/patch_engine.py
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Union
+
+# Context lines a hunk may lose at each end and still apply (GNU patch's --fuzz)
+PATCH_FUZZ = 2
+# Plain `git apply` (no -C) tolerates offsets but no fuzz: every context line must match
+GIT_APPLY_FUZZ = 0
+# How far (in lines) a hunk may have drifted from the position its header claims
+PATCH_MAX_OFFSET = 1000
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+DEV_NULL = "/dev/null"
+
+
+class PatchParseError(ValueError):
+    """The diff is not a well-formed unified diff."""
+
+
+@dataclass
+class Hunk:
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    # Body lines including their ' ', '-' or '+' prefix, without line endings
+    lines: List[str] = field(default_factory=list)
+    section: str = ""
+    old_missing_newline: bool = False
+    new_missing_newline: bool = False
+
+    @property
+    def old_lines(self) -> List[str]:
+        return [line[1:] for line in self.lines if line[0] in " -"]
+
+    @property
+    def new_lines(self) -> List[str]:
+        return [line[1:] for line in self.lines if line[0] in " +"]
+
+
+@dataclass
+class FilePatch:
+    old_path: str
+    new_path: str
+    hunks: List[Hunk] = field(default_factory=list)
+
+    @property
+    def is_new(self) -> bool:
+        return self.old_path == DEV_NULL
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.new_path == DEV_NULL
+
+    @property
+    def path(self) -> str:
+        return self.old_path if self.is_deleted else self.new_path
+
+
+@dataclass
+class HunkResult:
+    index: int
+    applied: bool
+    offset: int = 0
+    fuzz: int = 0
+    message: str = ""
+
+
+@dataclass
+class FileResult:
+    path: str
+    applied: bool
+    hunks: List[HunkResult] = field(default_factory=list)
+    message: str = ""
+    # New file content; None for deletions and dry runs
+    content: Optional[str] = None
+
+
+@dataclass
+class PatchResult:
+    ok: bool
+    files: List[FileResult] = field(default_factory=list)
+
+    @property
+    def failed_hunks(self) -> List[dict]:
+        return [
+            {"file": f.path, "hunk": h.index, "message": h.message}
+            for f in self.files for h in f.hunks if not h.applied
+        ]
+
+    def to_dict(self) -> dict:
+        files = []
+        for f in self.files:
+            entry = asdict(f)
+            entry.pop("content")
+            files.append(entry)
+        return {"ok": self.ok, "files": files, "failed_hunks": self.failed_hunks}
+
+
+def _strip_prefix(path: str) -> str:
+    path = path.split("\t")[0].strip()
+    if path.startswith('"') and path.endswith('"'):
+        path = path[1:-1]
+    if path != DEV_NULL and path[:2] in ("a/", "b/"):
+        path = path[2:]
+    return path
+
+
+def parse_unified_diff(diff: str, recount: bool = False) -> List[FilePatch]:
+    """
+    Parses a (possibly multi-file) unified diff.
+
+    With `recount`, hunk header line counts are ignored and taken from the body
+    instead, like `git apply --recount` (LLM-written diffs often miscount).
+    Raises PatchParseError with the offending line number on malformed input.
+    """
+    patches: List[FilePatch] = []
+    current: Optional[FilePatch] = None
+    hunk: Optional[Hunk] = None
+    old_left = new_left = 0
+    blank_tail = 0  # Trailing body lines that were completely empty in the diff
+    lines = diff.splitlines()
+
+    def close_hunk(lineno):
+        nonlocal hunk
+        if hunk is None:
+            return
+        if recount:
+            # Without counts, blank lines after the last hunk are just the end of the text
+            if blank_tail:
+                del hunk.lines[-blank_tail:]
+            hunk.old_count = sum(1 for line in hunk.lines if line[0] in " -")
+            hunk.new_count = sum(1 for line in hunk.lines if line[0] in " +")
+        elif old_left or new_left:
+            raise PatchParseError(
+                f"Line {lineno}: hunk @@ -{hunk.old_start},{hunk.old_count} +{hunk.new_start},{hunk.new_count} @@ "
+                f"in {current.path} ends early ({old_left} old / {new_left} new lines missing)"
+            )
+        hunk = None
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        lineno = i + 1
+        in_hunk = hunk is not None and (recount or old_left > 0 or new_left > 0)
+
+        if in_hunk and line[:1] in (" ", "-", "+") or (in_hunk and line == ""):
+            if recount and line.startswith(("--- ", "+++ ")) and i + 1 < len(lines) and \
+                    (lines[i + 1].startswith("+++ ") or lines[i + 1].startswith("@@")):
+                close_hunk(lineno)
+                continue  # A new file header, not hunk content
+            body_line = line or " "  # Some tools strip the space off empty context lines
+            blank_tail = blank_tail + 1 if not line else 0
+            hunk.lines.append(body_line)
+            if body_line[0] in " -":
+                old_left -= 1
+            if body_line[0] in " +":
+                new_left -= 1
+            if not recount and (old_left < 0 or new_left < 0):
+                raise PatchParseError(f"Line {lineno}: hunk in {current.path} is longer than its header says")
+            i += 1
+            continue
+
+        if line.startswith("\\"):
+            # "\ No newline at end of file" applies to the previous body line
+            if hunk is None or not hunk.lines:
+                raise PatchParseError(f"Line {lineno}: stray '{line}'")
+            if hunk.lines[-1][0] in " -":
+                hunk.old_missing_newline = True
+            if hunk.lines[-1][0] in " +":
+                hunk.new_missing_newline = True
+            i += 1
+            continue
+
+        close_hunk(lineno)
+
+        if line.startswith("--- "):
+            if i + 1 >= len(lines) or not lines[i + 1].startswith("+++ "):
+                raise PatchParseError(f"Line {lineno}: '---' header without a following '+++' header")
+            current = FilePatch(old_path=_strip_prefix(line[4:]), new_path=_strip_prefix(lines[i + 1][4:]))
+            patches.append(current)
+            i += 2
+            continue
+
+        match = _HUNK_HEADER.match(line)
+        if match:
+            if current is None:
+                raise PatchParseError(f"Line {lineno}: hunk before any file header")
+            old_start, old_count, new_start, new_count, section = match.groups()
+            hunk = Hunk(
+                old_start=int(old_start),
+                old_count=int(old_count) if old_count is not None else 1,
+                new_start=int(new_start),
+                new_count=int(new_count) if new_count is not None else 1,
+                section=section.strip(),
+            )
+            current.hunks.append(hunk)
+            old_left, new_left = hunk.old_count, hunk.new_count
+            blank_tail = 0
+            i += 1
+            continue
+
+        if line.startswith("@@"):
+            raise PatchParseError(f"Line {lineno}: malformed hunk header '{line}'")
+        # Anything else (diff --git, index, mode lines, prose around the diff) is ignored
+        i += 1
+
+    close_hunk(len(lines))
+
+    if not patches:
+        raise PatchParseError("No file headers ('--- a/...', '+++ b/...') found in the diff")
+    for patch in patches:
+        if not patch.hunks:
+            raise PatchParseError(f"No hunks for {patch.path}")
+    return patches
+
+
+def _find(lines: List[str], needle: List[str], expected: int, lower_bound: int, max_offset: int) -> Optional[int]:
+    """Position of `needle` in `lines` closest to `expected`, searching outwards."""
+    last_start = len(lines) - len(needle)
+    if last_start < lower_bound:
+        return None
+    expected = min(max(expected, lower_bound), last_start)
+    for distance in range(0, max_offset + 1):
+        candidates = (expected - distance, expected + distance) if distance else (expected,)
+        in_range = False
+        for pos in candidates:
+            if lower_bound <= pos <= last_start:
+                in_range = True
+                if lines[pos:pos + len(needle)] == needle:
+                    return pos
+        if not in_range and (expected - distance < lower_bound and expected + distance > last_start):
+            return None
+    return None
+
+
+def _context_trim(hunk: Hunk, fuzz: int):
+    """How many leading/trailing context lines may be dropped at this fuzz level."""
+    leading = 0
+    while leading < len(hunk.lines) and hunk.lines[leading][0] == " ":
+        leading += 1
+    trailing = 0
+    while trailing < len(hunk.lines) and hunk.lines[-1 - trailing][0] == " ":
+        trailing += 1
+    return min(fuzz, leading), min(fuzz, trailing)
+
+
+def apply_file_patch(
+    content: Optional[str],
+    file_patch: FilePatch,
+    fuzz: int = PATCH_FUZZ,
+    max_offset: int = PATCH_MAX_OFFSET,
+) -> FileResult:
+    """Applies one file's hunks to `content` (None when the file doesn't exist)."""
+    result = FileResult(path=file_patch.path, applied=False)
+
+    if file_patch.is_new:
+        if content is not None:
+            result.message = "File already exists"
+            return result
+        content = ""
+    elif content is None:
+        result.message = "File not found"
+        return result
+
+    newline = "\r\n" if "\r\n" in content else "\n"
+    lines = content.splitlines()
+    ends_with_newline = not content or content.endswith(("\n", "\r"))
+    drift = 0  # How far the file has moved from where the hunk headers expect it
+    shift = 0  # Lines added minus lines removed by the hunks applied so far
+    lower_bound = 0
+
+    for index, hunk in enumerate(file_patch.hunks):
+        hunk_result = HunkResult(index=index, applied=False)
+        result.hunks.append(hunk_result)
+        # A hunk with no old lines inserts *after* old_start
+        base = hunk.old_start - 1 if hunk.old_count else hunk.old_start
+        expected = base + shift + drift
+
+        for level in range(0, fuzz + 1):
+            lead, trail = _context_trim(hunk, level)
+            body = hunk.lines[lead:len(hunk.lines) - trail]
+            old = [line[1:] for line in body if line[0] in " -"]
+            new = [line[1:] for line in body if line[0] in " +"]
+            if not old:
+                # Pure insertion: nothing to match, place it at the expected position
+                pos = min(max(expected + lead, lower_bound), len(lines))
+            else:
+                pos = _find(lines, old, expected + lead, lower_bound, max_offset)
+                if pos is None:
+                    continue
+            lines[pos:pos + len(old)] = new
+            drift = pos - lead - base - shift
+            shift += len(new) - len(old)
+            hunk_result.applied = True
+            hunk_result.offset = drift
+            hunk_result.fuzz = level
+            lower_bound = pos + len(new)
+            break
+        else:
+            first_old = next((line[1:] for line in hunk.lines if line[0] in " -"), "")
+            hunk_result.message = f"Context for hunk #{index + 1} (line {hunk.old_start}) not found near '{first_old.strip()[:60]}'"
+
+        # The "\ No newline at end of file" markers only mean something at the end of the file
+        if hunk is file_patch.hunks[-1] and hunk_result.applied and lower_bound == len(lines):
+            if hunk.new_missing_newline:
+                ends_with_newline = False
+            elif hunk.old_missing_newline:
+                ends_with_newline = True
+
+    result.applied = all(h.applied for h in result.hunks)
+    if not result.applied:
+        result.message = f"{sum(not h.applied for h in result.hunks)} of {len(result.hunks)} hunks failed"
+        return result
+
+    if file_patch.is_deleted:
+        if lines:
+            result.applied = False
+            result.message = "Deleted file still has content after applying the patch"
+        return result
+
+    result.content = newline.join(lines) + (newline if lines and ends_with_newline else "")
+    return result
+
+
+FileSource = Union[Mapping[str, str], Callable[[str], Optional[str]]]
+
+
+def apply_patch(
+    diff: str,
+    files: FileSource,
+    fuzz: int = PATCH_FUZZ,
+    max_offset: int = PATCH_MAX_OFFSET,
+    recount: bool = False,
+    dry_run: bool = False,
+) -> PatchResult:
+    """
+    Applies a unified diff to in-memory file contents.
+
+    `files` maps repository-relative paths to their current content, or is a
+    loader called with a path that returns None for missing files. Raises
+    PatchParseError if the diff itself is malformed. With `dry_run` the new
+    contents are not returned; only whether each hunk would apply.
+    """
+    load = files.get if isinstance(files, Mapping) else files
+    patches = parse_unified_diff(diff, recount=recount)
+
+    results = []
+    pending: Dict[str, str] = {}
+    for file_patch in patches:
+        # Later sections for the same file apply on top of earlier ones
+        content = pending[file_patch.old_path] if file_patch.old_path in pending else \
+            (None if file_patch.is_new else load(file_patch.old_path))
+        file_result = apply_file_patch(content, file_patch, fuzz=fuzz, max_offset=max_offset)
+        if file_result.content is not None:
+            pending[file_patch.new_path] = file_result.content
+        if dry_run:
+            file_result.content = None
+        results.append(file_result)
+
+    return PatchResult(ok=all(r.applied for r in results), files=results)
+
+
+def check_patch(diff: str, files: Optional[FileSource] = None, fuzz: int = PATCH_FUZZ, recount: bool = False) -> PatchResult:
+    """
+    Dry run of apply_patch that reports malformed diffs as a failed result instead
+    of raising. Without `files` only the diff's structure is checked.
+    """
+    try:
+        if files is None:
+            return PatchResult(ok=True, files=[
+                FileResult(path=p.path, applied=True) for p in parse_unified_diff(diff, recount=recount)
+            ])
+        return apply_patch(diff, files, fuzz=fuzz, recount=recount, dry_run=True)
+    except PatchParseError as e:
+        return PatchResult(ok=False, files=[FileResult(path="<diff>", applied=False, message=str(e))])
+
+
+def paths_needed(diff: str) -> List[str]:
+    """Paths whose current content is needed to apply the diff (new files excluded)."""
+    try:
+        patches = parse_unified_diff(diff, recount=True)
+    except PatchParseError:
+        return []
+    return sorted({p.old_path for p in patches if not p.is_new})
@@ -1,12 +1,20 @@
 # DebugIQ-backend/scripts/platform_data_api.py (Production Scaffold)
 
+import contextvars
 import os
-import shutil
-import subprocess
 import json
-from typing import Union, List, Dict, Any
+import time
+from contextlib import contextmanager
+from typing import Union, List, Dict, Any, Optional
 from datetime import datetime
-import traceback # Import traceback for error logging
+
+from scripts import platform_data_api_async
+from scripts.async_bridge import run_sync
+from scripts.fix_metrics import get_fix_metrics
+from scripts.issue_events import get_issue_event_bus
+from scripts.utils.logger import setup_logger
+
+logger = setup_logger("platform_data_api")
 
 # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
 # Replace the mock database and placeholders with real database interactions (ORM or client library)
@@ -37,32 +45,110 @@ GIT_PLATFORM_TOKEN = os.getenv("GIT_PLATFORM_TOKEN") # Example: Get token from e
 # from api_clients import github_client, gitlab_client, jira_client # Example
 
 # --- Helper to run git commands ---
+# Git and Git platform calls are implemented in platform_data_api_async; these wrappers
+# run them on the shared background loop for synchronous callers (agents, thread pools).
 def run_git_command(command: list[str], cwd: str, env: dict = None) -> tuple[int, str, str]:
      """Helper to run git commands."""
-     print(f"Executing git command in {cwd}: {' '.join(command)}")
-     try:
-         # Merge provided env with current environment for subprocess
-         full_env = os.environ.copy()
-         if env:
-             full_env.update(env)
-
-         result = subprocess.run(
-             command,
-             cwd=cwd,
-             capture_output=True,
-             text=True,
-             check=False, # Don't raise exception on non-zero exit code
-             env=full_env # Pass the environment with credentials if needed
-         )
-         if result.returncode != 0:
-             print(f"Git command failed with exit code {result.returncode}. Stderr:\n{result.stderr}")
-         return result.returncode, result.stdout, result.stderr
-     except FileNotFoundError:
-         print(f"Error: git command not found. Make sure Git is installed and in the PATH.")
-         return -1, "", "git command not found"
-     except Exception as e:
-         print(f"Error executing git command {' '.join(command)}: {e}")
-         return -1, "", str(e)
+     return run_sync(platform_data_api_async.run_git_command(command, cwd, env))
+
+
+# --- Issue Writes (Unit of Work) ---
+# Every change to an issue goes through _write_issue. Callers stage field updates and
+# status transitions on an IssueUpdate and commit them together, so a workflow stage
+# costs one write (one transaction with a real backend) instead of one per call.
+_active_update: contextvars.ContextVar[Optional["IssueUpdate"]] = contextvars.ContextVar(
+    "debugiq_issue_update", default=None)
+
+
+def _write_issue(issue_id: str, fields: dict, transitions: List[str] = (), at: float = None) -> List[int]:
+    """
+    Applies `fields` to the issue and records its status `transitions` in a single
+    write. Returns the transitions' ids in the shared log (empty in-process).
+    """
+    # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
+    # - One transaction: UPDATE the issue row with all staged columns, then commit.
+    # - If linked to an external issue tracker, push the final status there once.
+    # Example conceptual ORM update:
+    # db_session = next(get_db())
+    # db_session.query(IssueModel).filter(IssueModel.id == issue_id).update(fields)
+    # db_session.commit()
+
+    # --- Mock Implementation (for development until real DB is wired) ---
+    from .mock_db import db as mock_db
+    return mock_db.update_issue(issue_id, fields, transitions, at)
+    # --- End Mock Implementation ---
+
+
+class IssueUpdate:
+    """
+    Field updates and status transitions staged for one issue. commit() writes them
+    at once: successive transitions coalesce to the last status in the store, while
+    fix metrics still record each one and subscribers are notified of the final status.
+    """
+
+    def __init__(self, issue_id: str):
+        self.issue_id = issue_id
+        self.fields: Dict[str, Any] = {}
+        self.statuses: List[str] = []
+
+    def set(self, **fields) -> "IssueUpdate":
+        self.fields.update(fields)
+        return self
+
+    def set_status(self, status: str) -> "IssueUpdate":
+        self.statuses.append(status)
+        return self
+
+    def commit(self) -> None:
+        if not self.fields and not self.statuses:
+            return
+        fields = dict(self.fields)
+        if self.statuses:
+            fields["status"] = self.statuses[-1]
+            fields["last_updated"] = datetime.utcnow().isoformat()
+        at = time.time()
+        event_ids = _write_issue(self.issue_id, fields, self.statuses, at)
+
+        # Fold the transitions into the running fix metrics so /metrics/summary never scans issues
+        # (other workers pick them up from the shared log, see scripts/shared_state.py)
+        metrics = get_fix_metrics()
+        for status in self.statuses:
+            metrics.record_transition(self.issue_id, status, at=at)
+        # Push the change to SSE/WebSocket/long-poll subscribers instead of making them poll
+        if self.statuses:
+            get_issue_event_bus().publish(self.issue_id, self.statuses[-1], event_id=event_ids[-1] if event_ids else None)
+        self.fields, self.statuses = {}, []
+
+
+@contextmanager
+def issue_update(issue_id: str):
+    """
+    Stages writes to `issue_id` until the block exits, then commits them together.
+    update_issue_status and the store_* functions called inside the block join it
+    rather than writing on their own. Nothing is written if the block raises.
+    """
+    active = _active_update.get()
+    if active is not None and active.issue_id == issue_id:
+        yield active  # Nested: the outermost block commits
+        return
+    update = IssueUpdate(issue_id)
+    token = _active_update.set(update)
+    try:
+        yield update
+    finally:
+        _active_update.reset(token)
+    update.commit()
+
+
+def _stage_write(issue_id: str, status: str = None, fields: dict = None) -> None:
+    """Adds to the enclosing issue_update for this issue, or writes immediately if there is none."""
+    active = _active_update.get()
+    update = active if active is not None and active.issue_id == issue_id else IssueUpdate(issue_id)
+    update.fields.update(fields or {})
+    if status:
+        update.set_status(status)
+    if update is not active:
+        update.commit()
 
 
 # --- Core Data API Functions ---
@@ -70,7 +156,7 @@ def run_git_command(command: list[str], cwd: str, env: dict = None) -> tuple[int
 
 def fetch_issue_details(issue_id: str) -> dict | None:
     """Fetches details for a specific issue from the database and/or issue tracker."""
-    print(f"🔄 Fetching issue details for {issue_id} from DB/Issue Tracker...")
+    logger.debug("🔄 Fetching issue details for %s from DB/Issue Tracker...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Query the issue table/collection by issue_id.
@@ -92,7 +178,7 @@ def fetch_issue_details(issue_id: str) -> dict | None:
 
 def store_diagnosis(issue_id: str, diagnosis_data: dict) -> None:
     """Stores the diagnosis results for an issue in the database."""
-    print(f"💾 Storing diagnosis results for {issue_id} in DB...")
+    logger.info("💾 Storing diagnosis results for %s in DB...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Find the issue by issue_id.
@@ -105,18 +191,13 @@ def store_diagnosis(issue_id: str, diagnosis_data: dict) -> None:
     #     issue.diagnosis = json.dumps(diagnosis_data) # Store as JSON or in related table
     #     db_session.commit()
 
-    # Update status as part of this operation or call update_issue_status separately
-    update_issue_status(issue_id, "Diagnosis Complete")
-
-    # --- Mock Implementation (for development until real DB is wired) ---
-    from .mock_db import db as mock_db
-    mock_db.setdefault(issue_id, {})['diagnosis'] = diagnosis_data
-    # --- End Mock Implementation ---
+    # The diagnosis and its status transition go out in the same write
+    _stage_write(issue_id, "Diagnosis Complete", {"diagnosis": diagnosis_data})
 
 
 def update_issue_status(issue_id: str, status: str) -> None:
     """Updates the status of an issue in the database and/or issue tracker."""
-    print(f"📊 Updating status for {issue_id} to: {status} in DB/Issue Tracker...")
+    logger.info("📊 Updating status for %s to: %s in DB/Issue Tracker...", issue_id, status)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Find the issue by issue_id.
@@ -132,16 +213,13 @@ def update_issue_status(issue_id: str, status: str) -> None:
     #     db_session.commit()
     #     # Call issue_tracker_client.update_issue(issue_id, status=status)
 
-    # --- Mock Implementation (for development until real DB is wired) ---
-    from .mock_db import db as mock_db
-    mock_db.setdefault(issue_id, {})['status'] = status
-    mock_db[issue_id]['last_updated'] = datetime.utcnow().isoformat()
-    # --- End Mock Implementation ---
+    # Inside an issue_update block this only stages the transition (see IssueUpdate)
+    _stage_write(issue_id, status)
 
 
 def query_issues_by_status(status_filter: Union[str, List[str]]) -> dict:
     """Queries issues from the database filtered by status."""
-    print(f"🔎 Querying issues by status: {status_filter} from DB...")
+    logger.debug("🔎 Querying issues by status: %s from DB...", status_filter)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Query the issue table/collection, filtering by the 'status' field.
@@ -171,9 +249,17 @@ def query_issues_by_status(status_filter: Union[str, List[str]]) -> dict:
     # --- End Mock Implementation ---
 
 
+def get_autonomous_fix_metrics() -> dict:
+    """
+    Success rate, per-stage failure counts and hourly throughput of the autonomous
+    workflow. Maintained incrementally by update_issue_status, so this is O(1).
+    """
+    return get_fix_metrics().summary()
+
+
 def get_validation_results(issue_id: str) -> dict:
     """Retrieves validation results for an issue from the database."""
-    print(f"📊 Retrieving validation results for {issue_id} from DB...")
+    logger.debug("📊 Retrieving validation results for %s from DB...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Find the issue by issue_id.
@@ -193,7 +279,7 @@ def get_validation_results(issue_id: str) -> dict:
 # Add implementations for other getter functions like get_diagnosis, get_proposed_patch
 def get_diagnosis(issue_id: str) -> dict:
      """Retrieves diagnosis results for an issue from the database."""
-     print(f"🔬 Retrieving diagnosis for {issue_id} from DB...")
+     logger.debug("🔬 Retrieving diagnosis for %s from DB...", issue_id)
      # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
      # Similar database retrieval as get_validation_results
      # --- Mock Implementation ---
@@ -203,7 +289,7 @@ def get_diagnosis(issue_id: str) -> dict:
 
 def get_proposed_patch(issue_id: str) -> dict:
      """Retrieves proposed patch details for an issue from the database."""
-     print(f"🩹 Retrieving proposed patch for {issue_id} from DB...")
+     logger.debug("🩹 Retrieving proposed patch for %s from DB...", issue_id)
      # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
      # Similar database retrieval as get_validation_results
      # --- Mock Implementation ---
@@ -213,30 +299,35 @@ def get_proposed_patch(issue_id: str) -> dict:
 
 def store_qa_results(issue_id: str, qa_data: dict) -> None:
     """Stores QA results for an issue in the database."""
-    print(f"✅ Storing QA results for {issue_id} in DB...")
+    logger.info("✅ Storing QA results for %s in DB...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # Similar database update as store_diagnosis
-    # --- Mock Implementation ---
-    from .mock_db import db as mock_db
-    mock_db.setdefault(issue_id, {})["qa_results"] = qa_data
-    update_issue_status(issue_id, "QA Complete")
-    # --- End Mock Implementation ---
+    _stage_write(issue_id, "QA Complete", {"qa_results": qa_data})
 
 def store_validation_results(issue_id: str, validation_data: dict) -> None:
     """Stores validation results for an issue in the database."""
-    print(f"💾 Storing validation results for {issue_id} in DB...")
+    logger.info("💾 Storing validation results for %s in DB...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # Similar database update as store_diagnosis
-    # --- Mock Implementation ---
-    from .mock_db import db as mock_db
-    mock_db.setdefault(issue_id, {})["validation_results"] = validation_data
-    update_issue_status(issue_id, "Validation Complete") # Note: This updates status to "Validation Complete", the workflow uses "Patch Validated" - ensure consistency
-    # --- End Mock Implementation ---
+    # Note: This updates status to "Validation Complete", the workflow uses "Patch Validated" - ensure consistency
+    _stage_write(issue_id, "Validation Complete", {"validation_results": validation_data})
+
+
+def store_patch_suggestion(issue_id: str, patch_suggestion: dict) -> None:
+    """Stores the AI-suggested patch for an issue (read back by get_proposed_patch)."""
+    logger.info("🩹 Storing patch suggestion for %s in DB...", issue_id)
+    _stage_write(issue_id, fields={"patch_suggestion": patch_suggestion})
+
+
+def store_pull_request_details(issue_id: str, pull_request: dict) -> None:
+    """Stores the URL, number and state of the fix PR opened for an issue."""
+    logger.info("💾 Storing pull request details for %s in DB...", issue_id)
+    _stage_write(issue_id, fields={"pull_request": pull_request})
 
 
 def create_new_issue(issue_data: dict) -> str:
     """Creates a new issue in the database."""
-    print(f"➕ Creating new issue in DB...")
+    logger.info("➕ Creating new issue in DB...")
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Create a new record/document with issue_data.
@@ -254,17 +345,13 @@ def create_new_issue(issue_data: dict) -> str:
 
     # --- Mock Implementation (for development until real DB is wired) ---
     from .mock_db import db as mock_db
-    issue_id = f"ISSUE-{len(mock_db)+1:04d}"
-    mock_db[issue_id] = issue_data
-    mock_db[issue_id]['status'] = "New"
-    mock_db[issue_id]['created'] = datetime.utcnow().isoformat()
-    return issue_id
+    return mock_db.create_issue({**issue_data, "status": "New", "created": datetime.utcnow().isoformat()})
     # --- End Mock Implementation ---
 
 
 def find_duplicate_issue(structured_issue: dict) -> (bool, Union[str, None]):
     """Finds if a similar issue already exists in the database."""
-    print(f"🔍 Finding duplicate issue in DB...")
+    logger.debug("🔍 Finding duplicate issue in DB...")
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Query based on criteria for detecting duplicates (e.g., matching summary, error message, file paths).
@@ -288,7 +375,7 @@ def find_duplicate_issue(structured_issue: dict) -> (bool, Union[str, None]):
 
 def update_issue_with_new_data(issue_id: str, structured_issue: dict) -> None:
     """Updates an existing issue with new data in the database."""
-    print(f"✏️ Updating issue {issue_id} with new data in DB...")
+    logger.info("✏️ Updating issue %s with new data in DB...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Find the issue by issue_id.
@@ -302,17 +389,12 @@ def update_issue_with_new_data(issue_id: str, structured_issue: dict) -> None:
     #          setattr(issue, key, value) # Be careful with keys that might not map directly to model fields
     #     db_session.commit()
 
-    update_issue_status(issue_id, "Updated with New Data")
-
-    # --- Mock Implementation (for development until real DB is wired) ---
-    from .mock_db import db as mock_db
-    mock_db.setdefault(issue_id, {}).update(structured_issue)
-    # --- End Mock Implementation ---
+    _stage_write(issue_id, "Updated with New Data", structured_issue)
 
 
 def fetch_comprehensive_context(issue_id: str) -> dict:
     """Fetches comprehensive context (logs, code snippet, meta) for an issue from the database."""
-    print(f"🧠 Fetching comprehensive context for {issue_id} from DB...")
+    logger.debug("🧠 Fetching comprehensive context for %s from DB...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Find the issue by issue_id.
@@ -343,7 +425,7 @@ def fetch_comprehensive_context(issue_id: str) -> dict:
 
 def get_repository_info_for_issue(issue_id: str) -> dict | None:
     """Fetches repository information linked to an issue from the database."""
-    print(f"ℹ️ Getting repository info for {issue_id} from DB...")
+    logger.debug("ℹ️ Getting repository info for %s from DB...", issue_id)
     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
     # - Connect to your database.
     # - Retrieve repository linking information for the issue (repo URL, credentials ID, etc.).
@@ -385,261 +467,28 @@ def get_repository_info_for_issue(issue_id: str) -> dict | None:
 
 def fetch_code_context(repository_url: str, file_paths: List[str], commit_hash: str = None) -> str | None:
     """Fetches content of specified files from a repository at a specific commit (optional)."""
-    print(f"📄 Fetching code context from {repository_url} for files: {file_paths} at commit: {commit_hash}")
-    # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
-    # Use Git commands (subprocess) or a Git library (GitPython) or Git platform API.
-    # Be mindful of repository size, authentication, and error handling.
-    # If using git clone, ensure temporary directories are handled securely.
-    # If using Git platform API, check API rate limits.
-
-    temp_dir = None
-    try:
-        # Example using git clone (less efficient for frequent small fetches):
-        temp_dir = f"/tmp/debugiq_fetch_clone_{abs(hash(repository_url))}_{os.getpid()}_{datetime.now().timestamp()}"
-        repo_info = get_repository_info_for_issue(issue_id="MOCK_ISSUE_FOR_REPO_INFO") # Need a way to get auth details
-        auth_env = None
-        if repo_info and repo_info.get("auth_token"):
-             # Configure git to use the token (e.g., via environment variables or .git/credentials)
-             # Be very careful with security here! Using a credential helper is better.
-             auth_env = os.environ.copy()
-             if repo_info.get("platform_type") == "github":
-                 # Example for GitHub with token
-                 auth_env["GITHUB_TOKEN"] = repo_info["auth_token"]
-                 # You might need to configure a credential helper
-                 # run_git_command(["git", "config", "--local", "credential.helper", f"!echo token={repo_info['auth_token']}"], temp_dir)
-             # Add logic for GitLab, etc.
-
-
-        return_code, stdout, stderr = run_git_command(["git", "clone", "--depth", "1", repository_url, temp_dir], ".", env=auth_env)
-        if return_code != 0:
-            print(f"❌ Failed to clone repository for fetching context: {stderr}")
-            return None
-
-        if commit_hash:
-             return_code, stdout, stderr = run_git_command(["git", "checkout", commit_hash], temp_dir)
-             if return_code != 0:
-                 print(f"❌ Failed to checkout commit {commit_hash}: {stderr}")
-                 return None
-
-
-        combined_content = ""
-        for file_path in file_paths:
-            full_path = os.path.join(temp_dir, file_path)
-            # Check if file exists and is within the repository path to prevent directory traversal
-            if os.path.exists(full_path) and os.path.commonpath([temp_dir, full_path]) == temp_dir:
-                try:
-                    with open(full_path, "r", encoding='utf-8', errors='ignore') as f: # Handle potential encoding issues
-                        combined_content += f"// --- Content of {file_path} ---\n"
-                        combined_content += f.read()
-                        combined_content += "\n\n"
-                except Exception as file_read_error:
-                    combined_content += f"// --- Error reading file {file_path}: {file_read_error} ---\n\n"
-            else:
-                combined_content += f"// --- File not found or outside repo path: {file_path} ---\n\n"
-
-        return combined_content
-
-    except Exception as e:
-        print(f"❌ Error fetching code context: {e}")
-        traceback.print_exc()
-        return None
-    finally:
-        # Clean up the temporary clone
-        if temp_dir and os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir, ignore_errors=True) # Ignore errors during cleanup
+    return run_sync(platform_data_api_async.fetch_code_context(repository_url, file_paths, commit_hash))
 
 
 def clone_repository(repository_url: str, branch: str = "main", auth_token: str = None, platform_type: str = "github") -> str | None:
     """Clones a repository to a temporary local directory."""
-    print(f"⬇️ Cloning repository {repository_url} (branch: {branch})...")
-    temp_dir = f"/tmp/debugiq_repo_clone_{abs(hash(repository_url))}_{os.getpid()}_{datetime.now().timestamp()}"
-    auth_env = None
-    repo_url_with_auth = repository_url
-
-    if auth_token:
-        auth_env = os.environ.copy()
-        # Securely configure authentication based on platform type
-        if platform_type == "github":
-             # Example for GitHub with token
-             repo_url_with_auth = repository_url.replace("https://", f"https://oauth2:{auth_token}@")
-             # You might need to configure a credential helper instead
-             # run_git_command(["git", "config", "--global", "credential.helper", "store"], ".") # Or store long-term
-             # run_git_command(["git", "credential", "approve"], ".", input=f"url={repository_url}\nprotocol=https\nhost={repo_url_with_auth.split('/')[2]}\nusername=oauth2\npassword={auth_token}\n")
-
-        elif platform_type == "gitlab":
-             # Example for GitLab with token (using oauth2 or private token)
-             repo_url_with_auth = repository_url.replace("https://", f"https://oauth2:{auth_token}@") # Or use private token in headers if using API client
-             # run_git_command(["git", "config", "--global", "credential.helper", "store"], ".")
-             # run_git_command(["git", "credential", "approve"], ".", input=f"url={repository_url}\nprotocol=https\nhost={repo_url_with_auth.split('/')[2]}\nusername=oauth2\npassword={auth_token}\n")
-
-        # Add logic for other platforms
-
-    try:
-        # Use --depth 1 for shallow clone if only latest commit is needed
-        return_code, stdout, stderr = run_git_command(["git", "clone", "--branch", branch, "--depth", "1", repo_url_with_auth, temp_dir], ".", env=auth_env)
+    return run_sync(platform_data_api_async.clone_repository(repository_url, branch, auth_token, platform_type))
 
-        if return_code != 0:
-            print(f"❌ Failed to clone repository: {stderr}")
-            return None
 
-        print(f"✅ Cloned successfully to {temp_dir}")
-        return temp_dir
+def cleanup_repository(local_repo_path: str):
+    """Removes a temporary local repository clone."""
+    return run_sync(platform_data_api_async.cleanup_repository(local_repo_path))
 
-    except Exception as e:
-        print(f"❌ Error cloning repository: {e}")
-        traceback.print_exc()
-        return None
 
+def fetch_file_contents(repository_url: str, file_paths: List[str], ref: str = "main", auth_token: str = None, platform_type: str = "github") -> Dict[str, str | None] | None:
+    """Fetches the content of specific files at `ref` without checking out the repository (cached per commit)."""
+    return run_sync(platform_data_api_async.fetch_file_contents(repository_url, file_paths, ref, auth_token, platform_type))
 
-def cleanup_repository(local_repo_path: str):
-    """Removes a temporary local repository clone."""
-    print(f"🧹 Cleaning up repository clone at {local_repo_path}...")
-    if local_repo_path and os.path.exists(local_repo_path):
-        try:
-            # Use ignore_errors=True to prevent exceptions if cleanup fails (e.g., permission issues)
-            shutil.rmtree(local_repo_path, ignore_errors=True)
-            print(f"✅ Cleaned up {local_repo_path}")
-        except Exception as e:
-            print(f"❌ Error cleaning up {local_repo_path}: {e}")
-            traceback.print_exc()
-    else:
-        print(f"⚠️ Directory not found for cleanup: {local_repo_path}")
-
-
-# --- Patch Application and Branch Creation (Require Git Interaction) ---
-def apply_patch_and_create_branch(repository_url: str, base_branch: str, new_branch_name: str, patch_diff: str, issue_id: str):
-     """Applies a patch, creates a new branch, commits, and pushes."""
-     print(f"🛠️ Applying patch and creating branch {new_branch_name} for {repository_url}...")
-     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
-     # - Use Git commands (subprocess) or a Git library (GitPython) to perform these steps.
-     # - Securely handle authentication for pushing the new branch.
-     # - Handle potential conflicts during patch application or pushing.
-
-     local_repo_path = None
-     try:
-         # Get repo info for authentication details
-         repo_info = get_repository_info_for_issue(issue_id) # Fetch repo info based on issue_id
-         if not repo_info:
-             raise Exception(f"Repository info not available for issue {issue_id}")
-
-         auth_token = repo_info.get("auth_token")
-         platform_type = repo_info.get("platform_type")
-         owner = repo_info.get("owner")
-         repo_name = repo_info.get("repo_name")
-
-         # Clone the repository (shallow clone the base branch) with authentication
-         local_repo_path = clone_repository(repository_url, base_branch, auth_token=auth_token, platform_type=platform_type)
-         if not local_repo_path or not os.path.exists(local_repo_path):
-              raise Exception("Could not clone repository for patching")
-
-         # Create and checkout the new branch
-         return_code, stdout, stderr = run_git_command(["git", "checkout", "-b", new_branch_name], local_repo_path)
-         if return_code != 0:
-              raise Exception(f"Failed to create branch {new_branch_name}: {stderr}")
-
-         # Apply the patch
-         patch_file_path = os.path.join(local_repo_path, f"{issue_id}.patch")
-         try:
-             with open(patch_file_path, "w", encoding='utf-8', errors='ignore') as f:
-                  f.write(patch_diff.strip())
-         except Exception as file_write_error:
-              raise Exception(f"Failed to write patch file: {file_write_error}")
-
-
-         # Use --allow-empty to handle cases where the patch might result in no changes
-         return_code, stdout, stderr = run_git_command(["git", "apply", "--allow-empty", patch_file_path], local_repo_path)
-         if return_code != 0:
-              # If apply fails, try applying with --3way for better conflict reporting (if needed)
-              # return_code, stdout, stderr = run_git_command(["git", "apply", "--3way", patch_file_path], local_repo_path)
-              # Add conflict resolution logic here if --3way is used
-              raise Exception(f"Failed to apply patch: {stderr}")
-
-         # Stage all changes (handles added, modified, deleted files)
-         return_code, stdout, stderr = run_git_command(["git", "add", "-A"], local_repo_path)
-         if return_code != 0:
-              print(f"Warning: Failed to stage changes: {stderr}") # Log warning, but attempt commit
-
-
-         # Check if there are any changes to commit
-         return_code_status, stdout_status, stderr_status = run_git_command(["git", "status", "--porcelain"], local_repo_path)
-         if return_code_status != 0:
-              print(f"Warning: Could not get git status: {stderr_status}")
-
-         if not stdout_status.strip():
-             print(f"⚠️ No changes detected after applying patch for issue {issue_id}. Skipping commit and push.")
-             # You might decide to return a specific status or raise an exception here
-             # For now, we'll let the function complete, but no PR will be created if no commit happens.
-             return # Exit the function if no changes
-
-
-         # Commit the changes
-         commit_message = f"feat: DebugIQ auto-fix for issue #{issue_id}\n\nResolves issue #{issue_id}\n\nAutomated patch generated by DebugIQ agent."
-         # Use --allow-empty if you want to allow commits with no changes
-         return_code, stdout, stderr = run_git_command(["git", "commit", "-m", commit_message], local_repo_path)
-         if return_code != 0:
-              raise Exception(f"Failed to create commit: {stderr}")
-
-
-         # Push the new branch
-         # Ensure your git environment or config is set up for authentication
-         # Example using subprocess env:
-         push_env = os.environ.copy()
-         if auth_token:
-             if platform_type == "github":
-                  push_env["GITHUB_TOKEN"] = auth_token # Example env var for GitHub CLI or some setups
-             # Add logic for other platforms/authentication methods
-             pass # Authentication is complex, this is a simplified representation
-
-         # Use --set-upstream origin new_branch_name to link the local branch to the remote
-         return_code, stdout, stderr = run_git_command(["git", "push", "--set-upstream", "origin", new_branch_name], local_repo_path, env=push_env)
-
-         if return_code != 0:
-             raise Exception(f"Failed to push branch {new_branch_name}: {stderr}")
-
-         print(f"✅ Branch {new_branch_name} created and pushed successfully.")
-
-     except Exception as e:
-         print(f"❌ Error in apply_patch_and_create_branch for issue {issue_id}: {e}")
-         traceback.print_exc() # Print full traceback
-         # Clean up in case of error
-         if local_repo_path and os.path.exists(local_repo_path):
-             cleanup_repository(local_repo_path)
-         raise e # Re-raise the exception to be caught by the caller
-     finally:
-         # Clean up the temporary repository clone regardless of success or failure
-         if local_repo_path and os.path.exists(local_repo_path):
-              cleanup_repository(local_repo_path)
-
-
-# --- Pull Request Creation (Requires Git Platform API) ---
-# This is typically done via the Git platform's API, not local git commands
-
-# Assuming you have a client for interacting with Git platform APIs (GitHub, GitLab, etc.)
-# from api_clients import git_platform_client # Example import
-
-# --- Mock Git Platform Client (for development until real API client is wired) ---
-class MockGitPlatformClient:
-    def create_pull_request(self, owner: str, repo_name: str, head_branch: str, base_branch: str, title: str, body: str) -> dict:
-        print(f">>> Calling Mock Git Platform API to create PR for {owner}/{repo_name}")
-        # Simulate API call and response
-        import time
-        time.sleep(1)
-        # Simulate generating a PR URL based on the info
-        simulated_pr_url = f"https://github.com/{owner}/{repo_name}/pull/{head_branch}" # Example for GitHub
-
-        simulated_pr_details = {
-            "url": simulated_pr_url,
-            "id": f"{owner}-{repo_name}-{head_branch}-mock-id",
-            "title": title,
-            "state": "open",
-            "created_at": datetime.utcnow().isoformat()
-        }
-        print(f"<<< Mock Git Platform API response received. PR URL: {simulated_pr_details['url']}")
-        return simulated_pr_details
 
-git_platform_client = MockGitPlatformClient() # Use the mock client for now
+def apply_patch_and_create_branch(repository_url: str, base_branch: str, new_branch_name: str, patch_diff: str, issue_id: str) -> dict:
+     """Applies a patch, creates a new branch, commits, and pushes; see the async version for the result."""
+     return run_sync(platform_data_api_async.apply_patch_and_create_branch(repository_url, base_branch, new_branch_name, patch_diff, issue_id))
 
-# --- End Mock Git Platform Client ---
 
 def create_pull_request_on_platform(
     issue_id: str,
@@ -651,52 +500,8 @@ def create_pull_request_on_platform(
     """
     Creates a Pull Request on the Git platform using its API.
     """
-    print(f"🌐 Requesting PR creation on Git platform for issue: {issue_id}")
-
-    repo_info = get_repository_info_for_issue(issue_id)
-    if not repo_info or not repo_info.get("owner") or not repo_info.get("repo_name"):
-        print(f"❌ PR creation failed: Repository owner or name not available for issue {issue_id}.")
-        return {"error": "Repository owner or name not linked."}
+    return run_sync(platform_data_api_async.create_pull_request_on_platform(issue_id, branch_name, base_branch, pr_title, pr_body))
 
-    owner = repo_info["owner"]
-    repo_name = repo_info["repo_name"]
-    platform_type = repo_info.get("platform_type", "github") # Default to github if not specified
-
-    # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
-    # Use your actual Git platform API client here based on platform_type.
-    # Handle authentication using auth_token from repo_info.
-
-    try:
-        # Example using the mock client (replace with your actual git_platform_client)
-        # You would select the correct client based on platform_type
-        # if platform_type == "github":
-        #      pr_details = github_client.create_pull_request(...)
-        # elif platform_type == "gitlab":
-        #      pr_details = gitlab_client.create_merge_request(...)
-        # else:
-        #      raise Exception(f"Unsupported Git platform type: {platform_type}")
-
-        pr_details = git_platform_client.create_pull_request(
-            owner=owner,
-            repo_name=repo_name,
-            head_branch=branch_name,
-            base_branch=base_branch,
-            title=pr_title,
-            body=pr_body
-        )
-
-        # Basic validation if API call seemed successful
-        if not pr_details or "url" not in pr_details:
-             print(f"❌ PR creation failed: Git platform API call did not return expected details for issue {issue_id}.")
-             return {"error": "Git platform API call failed or returned unexpected response."}
-
-        print(f"✅ PR creation requested successfully for issue: {issue_id}")
-        return pr_details
-
-    except Exception as e:
-        print(f"❌ Error calling Git platform API for PR creation for issue {issue_id}: {e}")
-        traceback.print_exc()
-        return {"error": f"Failed to create Pull Request via API: {e}"}
 
 # --- Add other platform interaction functions here as needed ---
 # Example:
@@ -805,7 +610,7 @@ if __name__ == "__main__":
     #      if test_issue_id in mock_db: del mock_db[test_issue_id] # Clean up mock db entry
 
     # --- Test create_pull_request_on_platform (Requires Git Platform API client and AUTHENTICATION) ---
-    # Uses the MockGitPlatformClient by default in this scaffold.
+    # Calls the real Git platform API; point GITHUB_API_URL at scripts/fake_git_platform_server.py to try it offline.
     print("\nTesting create_pull_request_on_platform (conceptual - requires API client/auth)...")
     mock_pr_issue_id = "TEST-PROD-PR"
     mock_pr_branch = f"debugiq/feature-{mock_pr_issue_id.lower()}"
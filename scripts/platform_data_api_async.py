@@ -0,0 +1,486 @@
+# DebugIQ-backend/scripts/platform_data_api_async.py
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Union, List, Dict
+
+from scripts import platform_data_api, shared_state, tracing
+from scripts.git_platform_client import get_git_platform_client
+from scripts.git_runner import get_git_runner
+from scripts.latency_metrics import git_subcommand
+from scripts.utils.logger import setup_logger
+
+# Async surface of platform_data_api for use from async routes and workflows.
+# Git and Git platform calls are implemented here natively (asyncio subprocesses);
+# the same-named functions in platform_data_api are thin wrappers that run these
+# on the shared background loop (scripts.async_bridge).
+
+logger = setup_logger("platform_data_api")
+
+
+# --- Helper to run git commands ---
+async def run_git_command(command: list[str], cwd: str, env: dict = None) -> tuple[int, str, str]:
+     """
+     Runs a git command through the shared AsyncGitRunner (concurrency limits, timeout,
+     cached environment); returns (exit code, stdout, stderr). `env` holds only the
+     variables to add to the process environment.
+     """
+     # Only the verb is logged: the full argv can carry authenticated URLs
+     subcommand = git_subcommand(command)
+     logger.debug("Executing git %s in %s", subcommand, cwd)
+     try:
+         return_code, stdout, stderr = await get_git_runner().run(command, cwd, env=env)
+         if return_code != 0:
+             logger.warning("Git %s failed with exit code %s: %s", subcommand, return_code, stderr[-2000:])
+         return return_code, stdout, stderr
+     except FileNotFoundError:
+         logger.error("Error: git command not found. Make sure Git is installed and in the PATH.")
+         return -1, "", "git command not found"
+     except Exception as e:
+         logger.error("Error executing git %s: %s", subcommand, e)
+         return -1, "", str(e)
+
+
+# --- Issue Store ---
+# The store is mock_db. The in-process dict never blocks, so its calls run inline; the
+# shared SQLite store (SHARED_STATE_DB) does disk I/O and can wait on another worker's
+# write lock, so its calls run in a thread to keep the event loop free. Once a database
+# is wired, these become the async driver calls (e.g. an AsyncSession) and the sync
+# functions wrap them instead.
+
+async def _store_call(func, *args):
+    if shared_state.enabled():
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+async def fetch_issue_details(issue_id: str) -> dict | None:
+    return await _store_call(platform_data_api.fetch_issue_details, issue_id)
+
+
+async def update_issue_status(issue_id: str, status: str) -> None:
+    await _store_call(platform_data_api.update_issue_status, issue_id, status)
+
+
+async def query_issues_by_status(status_filter: Union[str, List[str]]) -> dict:
+    return await _store_call(platform_data_api.query_issues_by_status, status_filter)
+
+
+async def store_diagnosis(issue_id: str, diagnosis_data: dict) -> None:
+    await _store_call(platform_data_api.store_diagnosis, issue_id, diagnosis_data)
+
+
+async def store_patch_suggestion(issue_id: str, patch_suggestion: dict) -> None:
+    await _store_call(platform_data_api.store_patch_suggestion, issue_id, patch_suggestion)
+
+
+async def store_validation_results(issue_id: str, validation_data: dict) -> None:
+    await _store_call(platform_data_api.store_validation_results, issue_id, validation_data)
+
+
+async def store_qa_results(issue_id: str, qa_data: dict) -> None:
+    await _store_call(platform_data_api.store_qa_results, issue_id, qa_data)
+
+
+async def store_pull_request_details(issue_id: str, pull_request: dict) -> None:
+    await _store_call(platform_data_api.store_pull_request_details, issue_id, pull_request)
+
+
+async def get_diagnosis(issue_id: str) -> dict:
+    return await _store_call(platform_data_api.get_diagnosis, issue_id)
+
+
+async def get_proposed_patch(issue_id: str) -> dict:
+    return await _store_call(platform_data_api.get_proposed_patch, issue_id)
+
+
+async def get_validation_results(issue_id: str) -> dict:
+    return await _store_call(platform_data_api.get_validation_results, issue_id)
+
+
+async def create_new_issue(issue_data: dict) -> str:
+    return await _store_call(platform_data_api.create_new_issue, issue_data)
+
+
+async def find_duplicate_issue(structured_issue: dict) -> (bool, Union[str, None]):
+    return await _store_call(platform_data_api.find_duplicate_issue, structured_issue)
+
+
+async def update_issue_with_new_data(issue_id: str, structured_issue: dict) -> None:
+    await _store_call(platform_data_api.update_issue_with_new_data, issue_id, structured_issue)
+
+
+async def fetch_comprehensive_context(issue_id: str) -> dict:
+    return await _store_call(platform_data_api.fetch_comprehensive_context, issue_id)
+
+
+async def get_repository_info_for_issue(issue_id: str) -> dict | None:
+    return await _store_call(platform_data_api.get_repository_info_for_issue, issue_id)
+
+
+# --- Git Repository Interaction Functions ---
+
+@tracing.traced("fetch_code_context")
+async def fetch_code_context(repository_url: str, file_paths: List[str], commit_hash: str = None) -> str | None:
+    """Fetches content of specified files from a repository at a specific commit (optional)."""
+    logger.info("📄 Fetching code context from %s for files: %s at commit: %s", repository_url, file_paths, commit_hash)
+    # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
+    # Use Git commands (subprocess) or a Git library (GitPython) or Git platform API.
+    # Be mindful of repository size, authentication, and error handling.
+    # If using git clone, ensure temporary directories are handled securely.
+    # If using Git platform API, check API rate limits.
+
+    temp_dir = None
+    try:
+        # Example using git clone (less efficient for frequent small fetches):
+        temp_dir = f"/tmp/debugiq_fetch_clone_{abs(hash(repository_url))}_{os.getpid()}_{datetime.now().timestamp()}"
+        repo_info = await get_repository_info_for_issue(issue_id="MOCK_ISSUE_FOR_REPO_INFO") # Need a way to get auth details
+        auth_env = None
+        if repo_info and repo_info.get("auth_token"):
+             # Configure git to use the token (e.g., via environment variables or .git/credentials)
+             # Be very careful with security here! Using a credential helper is better.
+             auth_env = {}
+             if repo_info.get("platform_type") == "github":
+                 # Example for GitHub with token
+                 auth_env["GITHUB_TOKEN"] = repo_info["auth_token"]
+                 # You might need to configure a credential helper
+                 # await run_git_command(["git", "config", "--local", "credential.helper", f"!echo token={repo_info['auth_token']}"], temp_dir)
+             # Add logic for GitLab, etc.
+
+
+        return_code, stdout, stderr = await run_git_command(["git", "clone", "--depth", "1", repository_url, temp_dir], ".", env=auth_env)
+        if return_code != 0:
+            logger.error("❌ Failed to clone repository for fetching context: %s", stderr)
+            return None
+
+        if commit_hash:
+             return_code, stdout, stderr = await run_git_command(["git", "checkout", commit_hash], temp_dir)
+             if return_code != 0:
+                 logger.error("❌ Failed to checkout commit %s: %s", commit_hash, stderr)
+                 return None
+
+
+        combined_content = ""
+        for file_path in file_paths:
+            full_path = os.path.join(temp_dir, file_path)
+            # Check if file exists and is within the repository path to prevent directory traversal
+            if os.path.exists(full_path) and os.path.commonpath([temp_dir, full_path]) == temp_dir:
+                try:
+                    with open(full_path, "r", encoding='utf-8', errors='ignore') as f: # Handle potential encoding issues
+                        combined_content += f"// --- Content of {file_path} ---\n"
+                        combined_content += f.read()
+                        combined_content += "\n\n"
+                except Exception as file_read_error:
+                    combined_content += f"// --- Error reading file {file_path}: {file_read_error} ---\n\n"
+            else:
+                combined_content += f"// --- File not found or outside repo path: {file_path} ---\n\n"
+
+        tracing.current_span().set_attributes({
+            "repo.url": repository_url, "files.count": len(file_paths), "bytes.fetched": len(combined_content),
+        })
+        return combined_content
+
+    except Exception as e:
+        logger.exception("❌ Error fetching code context: %s", e)
+        return None
+    finally:
+        # Clean up the temporary clone
+        if temp_dir and os.path.exists(temp_dir):
+            await asyncio.to_thread(shutil.rmtree, temp_dir, True) # Ignore errors during cleanup
+
+
+async def clone_repository(repository_url: str, branch: str = "main", auth_token: str = None, platform_type: str = "github") -> str | None:
+    """Clones a repository to a temporary local directory."""
+    logger.info("⬇️ Cloning repository %s (branch: %s)...", repository_url, branch)
+    temp_dir = f"/tmp/debugiq_repo_clone_{abs(hash(repository_url))}_{os.getpid()}_{datetime.now().timestamp()}"
+    auth_env = None
+    repo_url_with_auth = repository_url
+
+    if auth_token:
+        # Securely configure authentication based on platform type
+        if platform_type == "github":
+             # Example for GitHub with token
+             repo_url_with_auth = repository_url.replace("https://", f"https://oauth2:{auth_token}@")
+             # You might need to configure a credential helper instead
+             # await run_git_command(["git", "config", "--global", "credential.helper", "store"], ".") # Or store long-term
+             # await run_git_command(["git", "credential", "approve"], ".", input=f"url={repository_url}\nprotocol=https\nhost={repo_url_with_auth.split('/')[2]}\nusername=oauth2\npassword={auth_token}\n")
+
+        elif platform_type == "gitlab":
+             # Example for GitLab with token (using oauth2 or private token)
+             repo_url_with_auth = repository_url.replace("https://", f"https://oauth2:{auth_token}@") # Or use private token in headers if using API client
+             # await run_git_command(["git", "config", "--global", "credential.helper", "store"], ".")
+             # await run_git_command(["git", "credential", "approve"], ".", input=f"url={repository_url}\nprotocol=https\nhost={repo_url_with_auth.split('/')[2]}\nusername=oauth2\npassword={auth_token}\n")
+
+        # Add logic for other platforms
+
+    try:
+        # Use --depth 1 for shallow clone if only latest commit is needed
+        return_code, stdout, stderr = await run_git_command(["git", "clone", "--branch", branch, "--depth", "1", repo_url_with_auth, temp_dir], ".", env=auth_env)
+
+        if return_code != 0:
+            logger.error("❌ Failed to clone repository: %s", stderr)
+            return None
+
+        logger.info("✅ Cloned successfully to %s", temp_dir)
+        return temp_dir
+
+    except Exception as e:
+        logger.exception("❌ Error cloning repository: %s", e)
+        return None
+
+
+async def cleanup_repository(local_repo_path: str):
+    """Removes a temporary local repository clone."""
+    logger.info("🧹 Cleaning up repository clone at %s...", local_repo_path)
+    if local_repo_path and os.path.exists(local_repo_path):
+        try:
+            # Use ignore_errors=True to prevent exceptions if cleanup fails (e.g., permission issues)
+            await asyncio.to_thread(shutil.rmtree, local_repo_path, True)
+            logger.info("✅ Cleaned up %s", local_repo_path)
+        except Exception as e:
+            logger.exception("❌ Error cleaning up %s: %s", local_repo_path, e)
+    else:
+        logger.warning("⚠️ Directory not found for cleanup: %s", local_repo_path)
+
+
+# --- File Contents Without a Checkout ---
+# Blob contents keyed by (repository_url, commit, path). A commit's blobs never change,
+# so entries stay valid until evicted. None records a file that doesn't exist at that commit.
+BLOB_CACHE_MAX_ENTRIES = int(os.getenv("BLOB_CACHE_MAX_ENTRIES", "2000"))
+_blob_cache: "OrderedDict[tuple, str | None]" = OrderedDict()
+_blob_cache_lock = threading.Lock()
+
+
+def _authenticated_url(repository_url: str, auth_token: str = None, platform_type: str = "github") -> str:
+    if auth_token and platform_type in ("github", "gitlab"):
+        return repository_url.replace("https://", f"https://oauth2:{auth_token}@")
+    return repository_url
+
+
+@tracing.traced("fetch_file_contents")
+async def fetch_file_contents(repository_url: str, file_paths: List[str], ref: str = "main", auth_token: str = None, platform_type: str = "github") -> Dict[str, str | None] | None:
+    """
+    Fetches the content of specific files at `ref` without checking out the repository.
+
+    Uses a shallow, blobless clone with no checkout, so only the requested blobs
+    are downloaded, and caches them per resolved commit. Returns None if the
+    ref can't be resolved or fetched.
+    """
+    url = _authenticated_url(repository_url, auth_token, platform_type)
+    return_code, stdout, stderr = await run_git_command(["git", "ls-remote", url, ref], ".")
+    if return_code != 0 or not stdout.strip():
+        logger.error("❌ Could not resolve %s in %s: %s", ref, repository_url, stderr)
+        return None
+    commit = stdout.split()[0]
+
+    contents: Dict[str, str | None] = {}
+    missing = []
+    with _blob_cache_lock:
+        for path in file_paths:
+            key = (repository_url, commit, path)
+            if key in _blob_cache:
+                _blob_cache.move_to_end(key)
+                contents[path] = _blob_cache[key]
+            else:
+                missing.append(path)
+    tracing.current_span().set_attributes({
+        "repo.url": repository_url, "files.count": len(file_paths), "files.cached": len(file_paths) - len(missing),
+    })
+    if not missing:
+        return contents
+
+    temp_dir = tempfile.mkdtemp(prefix="debugiq_blobs_")
+    try:
+        return_code, _, stderr = await run_git_command(
+            ["git", "clone", "--depth", "1", "--filter=blob:none", "--no-checkout", "--branch", ref, url, temp_dir], "."
+        )
+        if return_code != 0:
+            logger.error("❌ Failed to fetch %s from %s: %s", ref, repository_url, stderr)
+            return None
+        for path in missing:
+            return_code, stdout, _ = await run_git_command(["git", "show", f"{commit}:{path}"], temp_dir)
+            contents[path] = stdout if return_code == 0 else None
+        tracing.current_span().set_attribute("bytes.fetched", sum(len(contents[path] or "") for path in missing))
+    finally:
+        await asyncio.to_thread(shutil.rmtree, temp_dir, True)
+
+    with _blob_cache_lock:
+        for path in missing:
+            _blob_cache[(repository_url, commit, path)] = contents[path]
+        while len(_blob_cache) > BLOB_CACHE_MAX_ENTRIES:
+            _blob_cache.popitem(last=False)
+    return contents
+
+
+# --- Patch Application and Branch Creation (Require Git Interaction) ---
+async def apply_patch_and_create_branch(repository_url: str, base_branch: str, new_branch_name: str, patch_diff: str, issue_id: str) -> dict:
+     """
+     Applies a patch, creates a new branch, commits, and pushes.
+
+     Returns {"branch", "pushed": True, "commit"} once the branch is on the remote,
+     or {"branch", "pushed": False, "reason"} when the patch changes nothing (no
+     commit, no push). Raises on any other failure.
+     """
+     logger.info("🛠️ Applying patch and creating branch %s for %s...", new_branch_name, repository_url)
+     # 🚧 PRODUCTION IMPLEMENTATION REQUIRED 🚧
+     # - Use Git commands (subprocess) or a Git library (GitPython) to perform these steps.
+     # - Securely handle authentication for pushing the new branch.
+     # - Handle potential conflicts during patch application or pushing.
+
+     local_repo_path = None
+     try:
+         # Get repo info for authentication details
+         repo_info = await get_repository_info_for_issue(issue_id) # Fetch repo info based on issue_id
+         if not repo_info:
+             raise Exception(f"Repository info not available for issue {issue_id}")
+
+         auth_token = repo_info.get("auth_token")
+         platform_type = repo_info.get("platform_type")
+         owner = repo_info.get("owner")
+         repo_name = repo_info.get("repo_name")
+
+         # Clone the repository (shallow clone the base branch) with authentication
+         local_repo_path = await clone_repository(repository_url, base_branch, auth_token=auth_token, platform_type=platform_type)
+         if not local_repo_path or not os.path.exists(local_repo_path):
+              raise Exception("Could not clone repository for patching")
+
+         # Create and checkout the new branch
+         return_code, stdout, stderr = await run_git_command(["git", "checkout", "-b", new_branch_name], local_repo_path)
+         if return_code != 0:
+              raise Exception(f"Failed to create branch {new_branch_name}: {stderr}")
+
+         # Apply the patch. The patch file lives outside the clone so `git add -A` can't commit it.
+         try:
+             with tempfile.NamedTemporaryFile("w", suffix=".patch", prefix=f"debugiq_{issue_id}_", delete=False,
+                                              encoding='utf-8', errors='ignore') as f:
+                  f.write(patch_diff.strip() + "\n")
+                  patch_file_path = f.name
+         except Exception as file_write_error:
+              raise Exception(f"Failed to write patch file: {file_write_error}")
+
+
+         # Use --allow-empty to handle cases where the patch might result in no changes
+         try:
+             return_code, stdout, stderr = await run_git_command(["git", "apply", "--allow-empty", patch_file_path], local_repo_path)
+         finally:
+             os.remove(patch_file_path)
+         if return_code != 0:
+              # If apply fails, try applying with --3way for better conflict reporting (if needed)
+              # return_code, stdout, stderr = await run_git_command(["git", "apply", "--3way", patch_file_path], local_repo_path)
+              # Add conflict resolution logic here if --3way is used
+              raise Exception(f"Failed to apply patch: {stderr}")
+
+         # Stage all changes (handles added, modified, deleted files)
+         return_code, stdout, stderr = await run_git_command(["git", "add", "-A"], local_repo_path)
+         if return_code != 0:
+              logger.warning("Warning: Failed to stage changes: %s", stderr) # Log warning, but attempt commit
+
+
+         # Check if there are any changes to commit
+         return_code_status, stdout_status, stderr_status = await run_git_command(["git", "status", "--porcelain"], local_repo_path)
+         if return_code_status != 0:
+              logger.warning("Warning: Could not get git status: %s", stderr_status)
+
+         if not stdout_status.strip():
+             logger.warning("⚠️ No changes detected after applying patch for issue %s. Skipping commit and push.", issue_id)
+             return {"branch": new_branch_name, "pushed": False, "reason": "Patch produced no changes"}
+
+
+         # Commit the changes
+         commit_message = f"feat: DebugIQ auto-fix for issue #{issue_id}\n\nResolves issue #{issue_id}\n\nAutomated patch generated by DebugIQ agent."
+         # Use --allow-empty if you want to allow commits with no changes
+         return_code, stdout, stderr = await run_git_command(["git", "commit", "-m", commit_message], local_repo_path)
+         if return_code != 0:
+              raise Exception(f"Failed to create commit: {stderr}")
+
+
+         # Push the new branch
+         # Ensure your git environment or config is set up for authentication
+         # Example using subprocess env:
+         push_env = {} # Added to the runner's cached environment
+         if auth_token:
+             if platform_type == "github":
+                  push_env["GITHUB_TOKEN"] = auth_token # Example env var for GitHub CLI or some setups
+             # Add logic for other platforms/authentication methods
+             pass # Authentication is complex, this is a simplified representation
+
+         # Use --set-upstream origin new_branch_name to link the local branch to the remote
+         return_code, stdout, stderr = await run_git_command(["git", "push", "--set-upstream", "origin", new_branch_name], local_repo_path, env=push_env)
+
+         if return_code != 0:
+             raise Exception(f"Failed to push branch {new_branch_name}: {stderr}")
+
+         logger.info("✅ Branch %s created and pushed successfully.", new_branch_name)
+         _, commit, _ = await run_git_command(["git", "rev-parse", "HEAD"], local_repo_path)
+         return {"branch": new_branch_name, "pushed": True, "commit": commit.strip()}
+
+     except Exception as e:
+         logger.exception("❌ Error in apply_patch_and_create_branch for issue %s: %s", issue_id, e)
+         # Clean up in case of error
+         if local_repo_path and os.path.exists(local_repo_path):
+             await cleanup_repository(local_repo_path)
+         raise e # Re-raise the exception to be caught by the caller
+     finally:
+         # Clean up the temporary repository clone regardless of success or failure
+         if local_repo_path and os.path.exists(local_repo_path):
+              await cleanup_repository(local_repo_path)
+
+
+# --- Pull Request Creation (Requires Git Platform API) ---
+# This is typically done via the Git platform's API, not local git commands
+
+async def create_pull_request_on_platform(
+    issue_id: str,
+    branch_name: str,
+    base_branch: str,
+    pr_title: str,
+    pr_body: str
+) -> dict:
+    """
+    Creates a Pull Request on the Git platform using its API.
+    """
+    logger.info("🌐 Requesting PR creation on Git platform for issue: %s", issue_id)
+
+    repo_info = await get_repository_info_for_issue(issue_id)
+    if not repo_info or not repo_info.get("owner") or not repo_info.get("repo_name"):
+        logger.error("❌ PR creation failed: Repository owner or name not available for issue %s.", issue_id)
+        return {"error": "Repository owner or name not linked."}
+
+    owner = repo_info["owner"]
+    repo_name = repo_info["repo_name"]
+    platform_type = repo_info.get("platform_type", "github") # Default to github if not specified
+
+    if platform_type != "github":
+        logger.error("❌ PR creation failed: Unsupported Git platform type: %s", platform_type)
+        return {"error": f"Unsupported Git platform type: {platform_type}"}
+
+    try:
+        # Shared pooled client: keep-alive connections, rate-limit pacing and retries
+        git_platform_client = get_git_platform_client(repo_info.get("auth_token"))
+        # The pooled client is synchronous; keep its HTTP round-trips off the event loop
+        pr_details = await asyncio.to_thread(
+            git_platform_client.create_pull_request,
+            owner=owner,
+            repo_name=repo_name,
+            head_branch=branch_name,
+            base_branch=base_branch,
+            title=pr_title,
+            body=pr_body
+        )
+
+        # Basic validation if API call seemed successful
+        if not pr_details or "url" not in pr_details:
+             logger.error("❌ PR creation failed: Git platform API call did not return expected details for issue %s.", issue_id)
+             return {"error": "Git platform API call failed or returned unexpected response."}
+
+        logger.info("✅ PR creation requested successfully for issue: %s", issue_id)
+        return pr_details
+
+    except Exception as e:
+        logger.exception("❌ Error calling Git platform API for PR creation for issue %s: %s", issue_id, e)
+        return {"error": f"Failed to create Pull Request via API: {e}"}
@@ -1,8 +1,15 @@
 import subprocess
 import json
 import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 REPORT_FILE = os.getenv("REGRESSION_REPORT", "regression_report.json")
+# Number of benchmark processes allowed to run at the same time.
+BENCHMARK_WORKERS = int(os.getenv("BENCHMARK_WORKERS", str(os.cpu_count() or 1)))
+# Number of before/after pairs to run. Runs are interleaved (ABAB...) so that
+# background noise on the host is spread across both sides of the comparison.
+BENCHMARK_ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", "1"))
 
 def run_benchmark(script_path, args=None):
     cmd = ["python", script_path]
@@ -14,6 +21,38 @@ def run_benchmark(script_path, args=None):
     except Exception:
         return {"output": result.stdout.strip()}
 
+def interleave_runs(before_script, after_script, rounds):
+    """Returns the (side, round, script) schedule in ABAB order."""
+    schedule = []
+    for i in range(rounds):
+        schedule.append(("before", i, before_script))
+        schedule.append(("after", i, after_script))
+    return schedule
+
+def aggregate_metrics(runs):
+    """
+    Collapses repeated runs of one benchmark into a single metrics dict.
+    Numeric metrics use the median across runs; anything else keeps the last value.
+    """
+    if not runs:
+        return {}
+    if len(runs) == 1:
+        return runs[0]
+
+    aggregated = {}
+    for run in runs:
+        for k, v in run.items():
+            aggregated.setdefault(k, []).append(v)
+
+    result = {}
+    for k, values in aggregated.items():
+        numeric = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        if numeric and len(numeric) == len(values):
+            result[k] = statistics.median(numeric)
+        else:
+            result[k] = values[-1]
+    return result
+
 def compare_metrics(before, after):
     report = {"before": before, "after": after, "regressions": {}}
     for k in before:
@@ -21,18 +60,60 @@ def compare_metrics(before, after):
             report["regressions"][k] = {"before": before[k], "after": after[k]}
     return report
 
-def record_regression(report):
-    with open(REPORT_FILE, "w") as f:
+def record_regression(report, quiet=False):
+    # Write to a sibling file and swap it in, so readers such as rollback_or_deploy
+    # never observe a half-written report while partial results are streaming in.
+    tmp_path = f"{REPORT_FILE}.tmp"
+    with open(tmp_path, "w") as f:
         json.dump(report, f, indent=2)
-    print(f"Regression report saved to {REPORT_FILE}")
+    os.replace(tmp_path, REPORT_FILE)
+    if not quiet:
+        print(f"Regression report saved to {REPORT_FILE}")
+
+def _build_report(results):
+    return compare_metrics(
+        aggregate_metrics([results["before"][i] for i in sorted(results["before"])]),
+        aggregate_metrics([results["after"][i] for i in sorted(results["after"])])
+    )
+
+def run_suite(before_script, after_script, rounds=BENCHMARK_ROUNDS, workers=BENCHMARK_WORKERS):
+    """
+    Runs the before/after benchmarks `rounds` times each across a process pool.
+
+    Partial reports (marked "complete": false) are written after every finished run,
+    and the final report is written once all runs are in.
+    """
+    schedule = interleave_runs(before_script, after_script, rounds)
+    results = {"before": {}, "after": {}}
+
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(schedule)))) as pool:
+        # Submission order follows the ABAB schedule, so with limited parallelism
+        # before and after runs are still started alternately.
+        futures = {pool.submit(run_benchmark, script): (side, round_no) for side, round_no, script in schedule}
+        for future in as_completed(futures):
+            side, round_no = futures[future]
+            try:
+                results[side][round_no] = future.result()
+            except Exception as e:
+                results[side][round_no] = {"error": str(e)}
+
+            report = _build_report(results)
+            report["complete"] = False
+            report["runs_finished"] = sum(len(r) for r in results.values())
+            report["runs_total"] = len(schedule)
+            record_regression(report, quiet=True)
+
+    report = _build_report(results)
+    report["complete"] = True
+    report["runs_finished"] = len(schedule)
+    report["runs_total"] = len(schedule)
+    return report
 
 def main():
     before_script = os.getenv("BEFORE_BENCHMARK", "benchmarks/before.py")
     after_script = os.getenv("AFTER_BENCHMARK", "benchmarks/after.py")
 
-    before_metrics = run_benchmark(before_script)
-    after_metrics = run_benchmark(after_script)
-    report = compare_metrics(before_metrics, after_metrics)
+    report = run_suite(before_script, after_script)
     record_regression(report)
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import os
+import json
 import subprocess
 import logging
 from debugiq_agents.core.logger import get_logger
@@ -16,16 +17,8 @@ def deploy():
     token = os.getenv("GITHUB_TOKEN")
     workflow_id = os.getenv("DEPLOY_WORKFLOW_ID")
     if repo and token and workflow_id:
-        import requests
-        resp = requests.post(
-            f"https://api.github.com/repos/{repo}/actions/workflows/{workflow_id}/dispatches",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/vnd.github+json"
-            },
-            json={"ref": "main"}
-        )
-        resp.raise_for_status()
+        from scripts.git_platform_client import get_git_platform_client
+        get_git_platform_client(token).dispatch_workflow(repo, workflow_id, ref="main")
         logger.info("Deployment workflow triggered.")
     else:
         logger.error("Missing GITHUB_REPO, GITHUB_TOKEN, or DEPLOY_WORKFLOW_ID env vars.")
@@ -35,7 +28,10 @@ def main():
     if os.path.exists(report_file):
         with open(report_file) as f:
             report = json.load(f)
-        if report.get("regressions"):
+        if report.get("complete") is False:
+            logger.error(f"Regression report at {report_file} is still in progress "
+                         f"({report.get('runs_finished')}/{report.get('runs_total')} runs), aborting.")
+        elif report.get("regressions"):
             rollback()
         else:
             deploy()
@@ -5,89 +5,155 @@ from scripts import (
     agent_suggest_patch,
     validate_proposed_patch,
     create_fix_pull_request,
-    platform_data_api
+    patch_engine,
+    platform_data_api,
+    tracing
 )
-import traceback # Import traceback to print full error details
+from scripts.latency_metrics import WORKFLOW_STAGE_SECONDS
+from scripts.utils.logger import setup_logger
+from contextlib import contextmanager
 
-def run_workflow_for_issue(issue_id: str):
-    """
-    Orchestrates the full autonomous bug resolution workflow.
-    Steps: Fetch Issue -> Diagnosis -> Patch Suggestion -> Validate -> Create PR -> Update Status
-    """
-    print(f"🔁 Starting autonomous workflow for issue: {issue_id}")
+logger = setup_logger("run_autonomous_workflow")
 
-    # Use platform_data_api to update status throughout the workflow
-    platform_data_api.update_issue_status(issue_id, "Fetching Details")
 
-    # 1. Fetch issue details and link repository info
-    issue = platform_data_api.fetch_issue_details(issue_id)
-    if not issue:
-        platform_data_api.update_issue_status(issue_id, "Details Fetch Failed")
-        print(f"❌ Workflow failed: Issue {issue_id} not found.")
-        return {"error": "Issue not found", "issue_id": issue_id}
+@contextmanager
+def _stage(name: str, attributes: dict = None):
+    """Times a workflow stage into the stage histogram and a child span of the issue's trace."""
+    with tracing.span(f"workflow.{name}", attributes) as span, WORKFLOW_STAGE_SECONDS.time(stage=name) as timer:
+        yield timer
+        if timer.outcome:
+            span.set_attribute("outcome", timer.outcome)
 
-    repo_info = platform_data_api.get_repository_info_for_issue(issue_id)
-    if not repo_info:
-         platform_data_api.update_issue_status(issue_id, "Repository Not Linked")
-         print(f"❌ Workflow failed: Repository not linked for issue {issue_id}.")
-         return {"error": "Repository not linked", "issue_id": issue_id}
+
+def precheck_patch(patch_diff: str, repo_info: dict) -> patch_engine.PatchResult:
+    """
+    Dry-runs the patch in memory against the files it touches. Catches malformed
+    or non-applying diffs in milliseconds, before a clone and a validation run.
+    Falls back to a structure-only check when file contents can't be fetched.
+    Uses git apply's strictness, since that is what applies the patch for the PR.
+    """
+    paths = patch_engine.paths_needed(patch_diff)
+    contents = {}
+    if paths:
+        contents = platform_data_api.fetch_file_contents(
+            repo_info["repository_url"],
+            paths,
+            ref=repo_info.get("default_branch", "main"),
+            auth_token=repo_info.get("auth_token"),
+            platform_type=repo_info.get("platform_type", "github")
+        )
+    return patch_engine.check_patch(patch_diff, contents, fuzz=patch_engine.GIT_APPLY_FUZZ)
 
 
-    platform_data_api.update_issue_status(issue_id, "Diagnosis in Progress")
+def run_workflow_for_issue(issue_id: str):
+    """
+    Orchestrates the full autonomous bug resolution workflow.
+    Steps: Fetch Issue -> Diagnosis -> Patch Suggestion -> Validate -> Create PR -> Update Status
+    """
+    with tracing.span("workflow", {"issue.id": issue_id}, root=True) as span, \
+            WORKFLOW_STAGE_SECONDS.time(stage="workflow") as timer:
+        result = _run_workflow(issue_id)
+        timer.outcome = "failed" if "error" in result else "ok"
+        span.set_attribute("outcome", timer.outcome)
+        if "error" in result:
+            span.set_status("ERROR", result["error"])
+    return result
+
+
+def _run_workflow(issue_id: str):
+    logger.info("🔁 Starting autonomous workflow for issue: %s", issue_id)
+
+    # Use platform_data_api to update status throughout the workflow. Each issue_update
+    # block stages a stage's results and transitions and commits them as one write.
+    with platform_data_api.issue_update(issue_id):
+        platform_data_api.update_issue_status(issue_id, "Fetching Details")
+
+        # 1. Fetch issue details and link repository info
+        with _stage("fetch_details"):
+            issue = platform_data_api.fetch_issue_details(issue_id)
+            repo_info = platform_data_api.get_repository_info_for_issue(issue_id) if issue else None
+            if repo_info:
+                tracing.current_span().set_attribute("repo.url", repo_info.get("repository_url"))
+        if not issue:
+            platform_data_api.update_issue_status(issue_id, "Details Fetch Failed")
+            logger.error("❌ Workflow failed: Issue %s not found.", issue_id)
+            return {"error": "Issue not found", "issue_id": issue_id}
+
+        if not repo_info:
+             platform_data_api.update_issue_status(issue_id, "Repository Not Linked")
+             logger.error("❌ Workflow failed: Repository not linked for issue %s.", issue_id)
+             return {"error": "Repository not linked", "issue_id": issue_id}
+
+        platform_data_api.update_issue_status(issue_id, "Diagnosis in Progress")
 
     # 2. Run diagnosis
     try:
-        diagnosis = autonomous_diagnose_issue.autonomous_diagnose(issue_id)
+        with _stage("diagnosis"):
+            diagnosis = autonomous_diagnose_issue.autonomous_diagnose(issue_id)
         if not diagnosis or diagnosis.get("root_cause") == "Could not determine root cause.":
             platform_data_api.update_issue_status(issue_id, "Diagnosis Failed")
-            print(f"❌ Workflow failed: Diagnosis failed or was inconclusive for issue {issue_id}.")
+            logger.error("❌ Workflow failed: Diagnosis failed or was inconclusive for issue %s.", issue_id)
             return {"error": "Diagnosis failed or inconclusive", "issue_id": issue_id, "diagnosis_result": diagnosis}
 
-        platform_data_api.store_diagnosis_results(issue_id, diagnosis)
-        platform_data_api.update_issue_status(issue_id, "Patch Suggestion in Progress")
+        with platform_data_api.issue_update(issue_id):
+            platform_data_api.store_diagnosis(issue_id, diagnosis)
+            platform_data_api.update_issue_status(issue_id, "Patch Suggestion in Progress")
 
     except Exception as e:
         platform_data_api.update_issue_status(issue_id, "Diagnosis Error")
-        print(f"❌ Workflow error during diagnosis for issue {issue_id}: {e}")
-        traceback.print_exc() # Print traceback for debugging
+        logger.exception("❌ Workflow error during diagnosis for issue %s: %s", issue_id, e)
         return {"error": "Diagnosis error", "issue_id": issue_id, "details": str(e)}
 
 
     # 3. Suggest patch using AI agent
     try:
-        patch_suggestion = agent_suggest_patch.agent_suggest_patch(issue_id, diagnosis)
+        with _stage("patch_suggestion"):
+            patch_suggestion = agent_suggest_patch.agent_suggest_patch(issue_id, diagnosis)
         if not patch_suggestion or not patch_suggestion.get("suggested_patch_diff"):
              platform_data_api.update_issue_status(issue_id, "Patch Suggestion Failed")
-             print(f"❌ Workflow failed: Patch suggestion failed or returned empty for issue {issue_id}.")
+             logger.error("❌ Workflow failed: Patch suggestion failed or returned empty for issue %s.", issue_id)
              return {"error": "Patch suggestion failed or empty", "issue_id": issue_id, "patch_suggestion_result": patch_suggestion}
 
         patch_diff = patch_suggestion["suggested_patch_diff"]
-        platform_data_api.store_patch_suggestion(issue_id, patch_suggestion)
-        platform_data_api.update_issue_status(issue_id, "Patch Validation in Progress")
+
+        with platform_data_api.issue_update(issue_id):
+            platform_data_api.store_patch_suggestion(issue_id, patch_suggestion)
+
+            with _stage("patch_precheck") as timer:
+                patch_check = precheck_patch(patch_diff, repo_info)
+                timer.outcome = "ok" if patch_check.ok else "failed"
+            if not patch_check.ok:
+                platform_data_api.store_validation_results(issue_id, {"is_valid": False, "patch_check": patch_check.to_dict()})
+                platform_data_api.update_issue_status(issue_id, "Patch Malformed")
+                logger.error("❌ Workflow failed: Suggested patch does not apply for issue %s.", issue_id)
+                return {"error": "Patch malformed", "issue_id": issue_id, "patch_check": patch_check.to_dict()}
+
+            platform_data_api.update_issue_status(issue_id, "Patch Validation in Progress")
 
     except Exception as e:
         platform_data_api.update_issue_status(issue_id, "Patch Suggestion Error")
-        print(f"❌ Workflow error during patch suggestion for issue {issue_id}: {e}")
-        traceback.print_exc() # Print traceback for debugging
+        logger.exception("❌ Workflow error during patch suggestion for issue %s: %s", issue_id, e)
         return {"error": "Patch suggestion error", "issue_id": issue_id, "details": str(e)}
 
 
     # 4. Validate patch
     try:
-        validation = validate_proposed_patch.validate_patch(issue_id, patch_diff)
-        platform_data_api.store_validation_results(issue_id, validation)
+        with _stage("validation") as timer:
+            validation = validate_proposed_patch.validate_patch(issue_id, patch_diff)
+            timer.outcome = "ok" if validation.get("is_valid") else "failed"
+        with platform_data_api.issue_update(issue_id):
+            platform_data_api.store_validation_results(issue_id, validation)
 
-        if not validation.get("is_valid"):
-            platform_data_api.update_issue_status(issue_id, "Patch Validation Failed")
-            print(f"❌ Workflow failed: Patch validation failed for issue {issue_id}.")
-            return {"error": "Patch validation failed", "validation": validation, "issue_id": issue_id}
+            if not validation.get("is_valid"):
+                platform_data_api.update_issue_status(issue_id, "Patch Validation Failed")
+                logger.error("❌ Workflow failed: Patch validation failed for issue %s.", issue_id)
+                return {"error": "Patch validation failed", "validation": validation, "issue_id": issue_id}
 
-        platform_data_api.update_issue_status(issue_id, "Patch Validated")
+            platform_data_api.update_issue_status(issue_id, "Patch Validated")
 
     except Exception as e:
         platform_data_api.update_issue_status(issue_id, "Patch Validation Error")
-        print(f"❌ Workflow error during patch validation for issue {issue_id}: {e}")
-        traceback.print_exc() # Print traceback for debugging
+        logger.exception("❌ Workflow error during patch validation for issue %s: %s", issue_id, e)
         return {"error": "Patch validation error", "issue_id": issue_id, "details": str(e)}
 
     # 5. Create PR
@@ -96,28 +162,30 @@ def run_workflow_for_issue(issue_id: str):
         safe_issue_id = issue_id.lower().replace(" ", "-").replace("_", "-")
         branch_name = f"debugiq/fix-{safe_issue_id}"
 
-        pr = create_fix_pull_request.create_pull_request(
-            issue_id=issue_id,
-            branch_name=branch_name,
-            code_diff=patch_diff,
-            diagnosis_details=diagnosis,
-            validation_results=validation
-        )
+        with _stage("pr_creation") as timer:
+            pr = create_fix_pull_request.create_pull_request(
+                issue_id=issue_id,
+                branch_name=branch_name,
+                code_diff=patch_diff,
+                diagnosis_details=diagnosis,
+                validation_results=validation
+            )
+            timer.outcome = "failed" if "error" in pr else "ok"
 
         if "error" in pr:
             platform_data_api.update_issue_status(issue_id, "PR Creation Failed")
-            print(f"❌ Workflow failed: PR creation failed for issue {issue_id}. Details: {pr['error']}")
+            logger.error("❌ Workflow failed: PR creation failed for issue %s. Details: %s", issue_id, pr['error'])
             return {"error": "PR creation failed", "details": pr, "issue_id": issue_id}
 
-        platform_data_api.store_pull_request_details(issue_id, pr)
-        platform_data_api.update_issue_status(issue_id, "PR Created - Awaiting Review/QA")
-        print(f"✅ Workflow completed for issue: {issue_id}. PR created: {pr.get('url')}")
+        with platform_data_api.issue_update(issue_id):
+            platform_data_api.store_pull_request_details(issue_id, pr)
+            platform_data_api.update_issue_status(issue_id, "PR Created - Awaiting Review/QA")
+        logger.info("✅ Workflow completed for issue: %s. PR created: %s", issue_id, pr.get('url'))
         return {"message": "Workflow completed", "pull_request": pr, "issue_id": issue_id}
 
     except Exception as e:
         platform_data_api.update_issue_status(issue_id, "PR Creation Error")
-        print(f"❌ Workflow error during PR creation for issue {issue_id}: {e}")
-        traceback.print_exc() # Print traceback for debugging
+        logger.exception("❌ Workflow error during PR creation for issue %s: %s", issue_id, e)
         return {"error": "PR creation error", "issue_id": issue_id, "details": str(e)}
 
 
@@ -0,0 +1,265 @@
+# DebugIQ-backend/scripts/sandbox_pool.py
+
+import configparser
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import tomllib
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+SANDBOX_ROOT = os.getenv("SANDBOX_ROOT", "/tmp/debugiq_sandboxes")
+# Ready-to-lease snapshots kept per (repo, lockfile hash)
+SANDBOX_IDLE_PER_KEY = int(os.getenv("SANDBOX_IDLE_PER_KEY", "2"))
+# Let sandboxes see the host's site-packages (test tooling such as pytest/flake8);
+# the repository's own dependencies are installed into the sandbox and take precedence.
+SANDBOX_SYSTEM_SITE_PACKAGES = os.getenv("SANDBOX_SYSTEM_SITE_PACKAGES", "1") == "1"
+SANDBOX_EXTRA_PACKAGES = os.getenv("SANDBOX_EXTRA_PACKAGES", "").split()
+SANDBOX_INSTALL_TIMEOUT_SECONDS = float(os.getenv("SANDBOX_INSTALL_TIMEOUT_SECONDS", "1800"))
+
+# Files whose content determines the installed dependency set
+LOCKFILES = (
+    "requirements.txt", "requirements-dev.txt", "requirements-test.txt",
+    "poetry.lock", "Pipfile.lock", "pyproject.toml", "setup.cfg", "setup.py",
+)
+# Optional dependency groups installed alongside the main ones, since validation runs the tests
+TEST_EXTRAS = ("test", "tests", "testing", "dev")
+
+
+@dataclass
+class Sandbox:
+    key: str
+    path: str
+
+    @property
+    def venv(self) -> str:
+        return os.path.join(self.path, "venv")
+
+    @property
+    def python(self) -> str:
+        # Always run tools as `python -m ...`: console-script shebangs in a
+        # snapshot still point at the template's interpreter.
+        return os.path.join(self.venv, "bin", "python")
+
+    def env(self, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        env = dict(base if base is not None else os.environ)
+        env["VIRTUAL_ENV"] = self.venv
+        env["PATH"] = os.path.join(self.venv, "bin") + os.pathsep + env.get("PATH", "")
+        env.pop("PYTHONHOME", None)
+        return env
+
+
+def lockfile_hash(repo_path: str, base_python: str = sys.executable) -> str:
+    """Hash of the dependency-defining files in the repository and the base interpreter."""
+    digest = hashlib.sha256(os.path.realpath(base_python).encode())
+    for name in LOCKFILES:
+        path = os.path.join(repo_path, name)
+        if os.path.isfile(path):
+            digest.update(name.encode() + b"\x00")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def has_lockfile(repo_path: str) -> bool:
+    return any(os.path.isfile(os.path.join(repo_path, name)) for name in LOCKFILES)
+
+
+def declared_dependencies(repo_path: str) -> List[str]:
+    """
+    Requirements declared in pyproject.toml ([project]) or setup.cfg ([options]),
+    plus their test/dev extras. Only the dependencies: the project itself is never
+    installed into a template, which is shared by every commit with the same
+    dependency files. Dependencies only declared in setup.py can't be read
+    without running it, so they aren't found.
+    """
+    requirements: List[str] = []
+    pyproject = os.path.join(repo_path, "pyproject.toml")
+    if os.path.isfile(pyproject):
+        try:
+            with open(pyproject, "rb") as f:
+                project = tomllib.load(f).get("project", {})
+        except (tomllib.TOMLDecodeError, OSError):
+            project = {}
+        requirements += project.get("dependencies", [])
+        for extra in TEST_EXTRAS:
+            requirements += project.get("optional-dependencies", {}).get(extra, [])
+
+    setup_cfg = os.path.join(repo_path, "setup.cfg")
+    if os.path.isfile(setup_cfg):
+        parser = configparser.RawConfigParser()
+        try:
+            parser.read(setup_cfg)
+        except configparser.Error:
+            parser = configparser.RawConfigParser()
+        values = [parser.get("options", "install_requires", fallback="")]
+        values += [parser.get("options.extras_require", extra, fallback="") for extra in TEST_EXTRAS]
+        requirements += [line.strip() for value in values for line in value.splitlines() if line.strip()]
+
+    return list(dict.fromkeys(requirements))
+
+
+def _snapshot_copy(src: str, dst: str):
+    # Copy-on-write where the filesystem supports it (btrfs, XFS, APFS...), plain copy otherwise
+    result = subprocess.run(["cp", "-a", "--reflink=auto", src, dst], capture_output=True)
+    if result.returncode != 0:
+        shutil.copytree(src, dst, symlinks=True)
+
+
+class SandboxPool:
+    """
+    Reusable dependency sandboxes keyed by repository and lockfile hash.
+
+    Each key has one immutable template (a virtualenv with the repository's
+    dependencies installed, built once per dependency change) and a few idle
+    snapshot copies of it. A lease hands out an idle snapshot; when the lease
+    ends the snapshot is thrown away and a fresh one is prepared in the
+    background, so every job starts from the pristine template.
+    """
+
+    def __init__(
+        self,
+        root: str = SANDBOX_ROOT,
+        idle_per_key: int = SANDBOX_IDLE_PER_KEY,
+        base_python: str = sys.executable,
+    ):
+        self.root = root
+        self.idle_per_key = idle_per_key
+        self.base_python = base_python
+        self._idle: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.root, "pip-cache"), exist_ok=True)
+
+    def key_for(self, repo_path: str, repo_id: Optional[str] = None) -> str:
+        name = repo_id or os.path.basename(os.path.realpath(repo_path))
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", name).strip("-")[:60] or "repo"
+        return f"{slug}-{lockfile_hash(repo_path, self.base_python)[:16]}"
+
+    def _key_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _template_dir(self, key: str) -> str:
+        return os.path.join(self._key_dir(key), "template")
+
+    def ensure_template(self, repo_path: str, key: str) -> str:
+        """Builds the template for `key` unless it exists. Safe across processes."""
+        template = self._template_dir(key)
+        ready_marker = os.path.join(template, ".ready")
+        if os.path.exists(ready_marker):
+            return template
+
+        os.makedirs(self._key_dir(key), exist_ok=True)
+        with open(os.path.join(self._key_dir(key), ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(ready_marker):
+                    return template  # Another worker finished it while we waited
+                shutil.rmtree(template, ignore_errors=True)
+                self._build_template(repo_path, template)
+                open(ready_marker, "w").close()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return template
+
+    def _build_template(self, repo_path: str, template: str):
+        print(f"📦 Building sandbox template {template}...")
+        venv = os.path.join(template, "venv")
+        cmd = [self.base_python, "-m", "venv", venv]
+        if SANDBOX_SYSTEM_SITE_PACKAGES:
+            # pip is then available from the base interpreter; no need to bootstrap it
+            cmd[3:3] = ["--system-site-packages", "--without-pip"]
+        subprocess.run(cmd, check=True, capture_output=True)
+
+        python = os.path.join(venv, "bin", "python")
+        env = dict(os.environ, PIP_CACHE_DIR=os.path.join(self.root, "pip-cache"), VIRTUAL_ENV=venv)
+        installs = []
+        for name in ("requirements.txt", "requirements-dev.txt", "requirements-test.txt"):
+            if os.path.isfile(os.path.join(repo_path, name)):
+                installs.append(["-r", os.path.join(repo_path, name)])
+        if not installs:
+            declared = declared_dependencies(repo_path)
+            if declared:
+                installs.append(declared)
+        if SANDBOX_EXTRA_PACKAGES:
+            installs.append(SANDBOX_EXTRA_PACKAGES)
+
+        for args in installs:
+            result = subprocess.run(
+                [python, "-m", "pip", "install", "--disable-pip-version-check", *args],
+                env=env, capture_output=True, text=True, timeout=SANDBOX_INSTALL_TIMEOUT_SECONDS
+            )
+            if result.returncode != 0:
+                shutil.rmtree(template, ignore_errors=True)
+                raise RuntimeError(f"Dependency install failed for sandbox: {result.stderr[-2000:]}")
+
+    def _new_snapshot(self, key: str) -> str:
+        snapshot = os.path.join(self._key_dir(key), "snapshots", uuid.uuid4().hex)
+        os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+        _snapshot_copy(self._template_dir(key), snapshot)
+        return snapshot
+
+    def _refill(self, key: str):
+        with self._lock:
+            missing = self.idle_per_key - len(self._idle.get(key, []))
+        for _ in range(max(0, missing)):
+            snapshot = self._new_snapshot(key)
+            with self._lock:
+                self._idle.setdefault(key, []).append(snapshot)
+
+    def prewarm(self, repo_path: str, repo_id: Optional[str] = None) -> str:
+        """Builds the template and fills the idle snapshots ahead of the first lease."""
+        key = self.key_for(repo_path, repo_id)
+        self.ensure_template(repo_path, key)
+        self._refill(key)
+        return key
+
+    @contextmanager
+    def lease(self, repo_path: str, repo_id: Optional[str] = None):
+        """Leases a clean sandbox matching the repository's dependencies."""
+        key = self.key_for(repo_path, repo_id)
+        self.ensure_template(repo_path, key)
+        with self._lock:
+            idle = self._idle.get(key, [])
+            snapshot = idle.pop() if idle else None
+        if snapshot is None:
+            snapshot = self._new_snapshot(key)
+
+        try:
+            yield Sandbox(key=key, path=snapshot)
+        finally:
+            # Discard the used snapshot and prepare a replacement off the request path
+            def reset():
+                shutil.rmtree(snapshot, ignore_errors=True)
+                self._refill(key)
+            threading.Thread(target=reset, name=f"sandbox-reset-{key}", daemon=True).start()
+
+    def prune(self, keep_keys: Optional[List[str]] = None):
+        """Removes templates and snapshots for keys no longer in use (e.g. after a dependency bump)."""
+        keep = set(keep_keys or [])
+        if not os.path.isdir(self.root):
+            return
+        for key in os.listdir(self.root):
+            if key == "pip-cache" or key in keep:
+                continue
+            with self._lock:
+                self._idle.pop(key, None)
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+def get_sandbox_pool() -> SandboxPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SandboxPool()
+    return _pool
@@ -0,0 +1,278 @@
+# DebugIQ-backend/scripts/shared_state.py
+
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from scripts.utils.logger import setup_logger
+
+
+def _default_path() -> str:
+    # More than one uvicorn worker needs a store they all see; a single worker keeps state in memory
+    if int(os.getenv("WEB_CONCURRENCY") or "1") > 1:
+        return os.path.join(tempfile.gettempdir(), "debugiq_state.db")
+    return ""
+
+
+# SQLite file shared by all worker processes (issues, status transitions, latency metrics).
+# Empty keeps all state in-process, which is only correct with a single worker.
+SHARED_STATE_DB = os.getenv("SHARED_STATE_DB", _default_path())
+# How quickly a worker sees transitions written by the others (events, fix metrics)
+SHARED_STATE_POLL_SECONDS = float(os.getenv("SHARED_STATE_POLL_SECONDS", "0.2"))
+# How often a worker publishes its latency histograms for the merged /metrics view
+SHARED_METRICS_FLUSH_SECONDS = float(os.getenv("SHARED_METRICS_FLUSH_SECONDS", "5"))
+
+logger = setup_logger("shared_state")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (id TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    issue_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    at REAL NOT NULL,
+    origin TEXT NOT NULL,
+    notify INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metric_snapshots (origin TEXT PRIMARY KEY, payload TEXT NOT NULL, updated REAL NOT NULL);
+"""
+
+_ORIGIN_TOKEN = secrets.token_hex(4)
+
+
+def origin() -> str:
+    """Identifies this process's rows; includes the pid so forked workers differ."""
+    return f"{socket.gethostname()}:{os.getpid()}:{_ORIGIN_TOKEN}"
+
+
+def enabled() -> bool:
+    return bool(SHARED_STATE_DB)
+
+
+class SharedStateDB:
+    """SQLite in WAL mode: concurrent readers, one writer at a time, safe across processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.connection().executescript(_SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+class LocalIssueStore(dict):
+    """The single-process issue store: a dict, plus the two write operations platform_data_api uses."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def update_issue(self, issue_id: str, fields: dict, transitions: Iterable[str] = (), at: float = None) -> List[int]:
+        with self._lock:
+            self.setdefault(issue_id, {}).update(fields)
+        return []
+
+    def create_issue(self, fields: dict) -> str:
+        with self._lock:
+            issue_id = f"ISSUE-{len(self)+1:04d}"
+            self[issue_id] = fields
+        return issue_id
+
+
+class SQLiteIssueStore(MutableMapping):
+    """
+    Issues as JSON documents in the shared database. Reads return copies, so
+    change an issue with update_issue (or by assigning the whole issue).
+    """
+
+    def __init__(self, database: SharedStateDB):
+        self.database = database
+
+    def __getitem__(self, issue_id: str) -> dict:
+        row = self.database.connection().execute("SELECT data FROM issues WHERE id = ?", (issue_id,)).fetchone()
+        if row is None:
+            raise KeyError(issue_id)
+        return json.loads(row[0])
+
+    def __setitem__(self, issue_id: str, issue: dict):
+        with self.database.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO issues (id, data) VALUES (?, ?)", (issue_id, json.dumps(issue, default=str)))
+
+    def __delitem__(self, issue_id: str):
+        with self.database.transaction() as conn:
+            if not conn.execute("DELETE FROM issues WHERE id = ?", (issue_id,)).rowcount:
+                raise KeyError(issue_id)
+
+    def __iter__(self):
+        return iter([row[0] for row in self.database.connection().execute("SELECT id FROM issues")])
+
+    def __len__(self) -> int:
+        return self.database.connection().execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+
+    def items(self):
+        # One query instead of a lookup per key
+        return [(issue_id, json.loads(data)) for issue_id, data in
+                self.database.connection().execute("SELECT id, data FROM issues")]
+
+    def update_issue(self, issue_id: str, fields: dict, transitions: Iterable[str] = (), at: float = None) -> List[int]:
+        """
+        Merges `fields` into the issue and appends its status transitions in one
+        transaction. Returns the transitions' ids; the last one is the event other
+        workers' subscribers are notified of.
+        """
+        transitions = list(transitions)
+        at = time.time() if at is None else at
+        with self.database.transaction() as conn:
+            row = conn.execute("SELECT data FROM issues WHERE id = ?", (issue_id,)).fetchone()
+            issue = json.loads(row[0]) if row else {}
+            issue.update(fields)
+            conn.execute("INSERT OR REPLACE INTO issues (id, data) VALUES (?, ?)", (issue_id, json.dumps(issue, default=str)))
+            ids = []
+            for index, status in enumerate(transitions):
+                cursor = conn.execute(
+                    "INSERT INTO transitions (issue_id, status, at, origin, notify) VALUES (?, ?, ?, ?, ?)",
+                    (issue_id, status, at, origin(), int(index == len(transitions) - 1)))
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def create_issue(self, fields: dict) -> str:
+        with self.database.transaction() as conn:
+            number = conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0] + 1
+            while conn.execute("SELECT 1 FROM issues WHERE id = ?", (f"ISSUE-{number:04d}",)).fetchone():
+                number += 1
+            issue_id = f"ISSUE-{number:04d}"
+            conn.execute("INSERT INTO issues (id, data) VALUES (?, ?)", (issue_id, json.dumps(fields, default=str)))
+        return issue_id
+
+
+class TransitionFeed:
+    """
+    Applies status transitions written by other processes to this process's fix
+    metrics and issue event bus, so every worker reports the same numbers and
+    streams every issue's changes.
+    """
+
+    def __init__(self, database: SharedStateDB, metrics, bus, own_origin: Optional[str] = None):
+        self.database = database
+        self.metrics = metrics
+        self.bus = bus
+        self.own_origin = own_origin or origin()
+        self.cursor = 0
+
+    def poll(self, limit: int = 1000) -> int:
+        rows = self.database.connection().execute(
+            "SELECT id, issue_id, status, at, notify FROM transitions WHERE id > ? AND origin != ? ORDER BY id LIMIT ?",
+            (self.cursor, self.own_origin, limit)).fetchall()
+        for event_id, issue_id, status, at, notify in rows:
+            self.metrics.record_transition(issue_id, status, at=at)
+            if notify:
+                self.bus.publish(issue_id, status, event_id=event_id,
+                                 timestamp=datetime.utcfromtimestamp(at).isoformat())
+            self.cursor = event_id
+        return len(rows)
+
+    def catch_up(self):
+        while self.poll():
+            pass
+
+
+def publish_metrics(database: SharedStateDB, registry, own_origin: Optional[str] = None):
+    """Stores this process's latency histograms for the merged /metrics view."""
+    with database.transaction() as conn:
+        conn.execute("INSERT OR REPLACE INTO metric_snapshots (origin, payload, updated) VALUES (?, ?, ?)",
+                     (own_origin or origin(), json.dumps(registry.export()), time.time()))
+
+
+def render_metrics(registry) -> str:
+    """Prometheus text for this worker alone, or summed over every worker in shared mode."""
+    if not enabled():
+        return registry.render()
+    database = get_database()
+    publish_metrics(database, registry)
+    exports = [json.loads(payload) for (payload,) in
+               database.connection().execute("SELECT payload FROM metric_snapshots")]
+    return registry.render(exports)
+
+
+_database: Optional[SharedStateDB] = None
+_database_lock = threading.Lock()
+_started = False
+
+
+def get_database() -> SharedStateDB:
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = SharedStateDB(SHARED_STATE_DB)
+    return _database
+
+
+def issue_store():
+    """The issue store backing platform_data_api: shared SQLite in multi-worker mode, else a dict."""
+    return SQLiteIssueStore(get_database()) if enabled() else LocalIssueStore()
+
+
+def start():
+    """
+    In shared mode, replays the transitions recorded so far and then follows
+    new ones in a background thread; also publishes this worker's histograms
+    periodically. Does nothing with in-process state. Idempotent.
+    """
+    global _started
+    if not enabled():
+        return
+    with _database_lock:
+        if _started:
+            return
+        _started = True
+
+    from scripts.fix_metrics import get_fix_metrics
+    from scripts.issue_events import get_issue_event_bus
+    from scripts.latency_metrics import registry
+
+    database = get_database()
+    feed = TransitionFeed(database, get_fix_metrics(), get_issue_event_bus())
+    feed.catch_up()
+    logger.info("🗄️ Shared state at %s (worker %s)", SHARED_STATE_DB, origin())
+
+    def follow():
+        next_flush = 0.0
+        while True:
+            try:
+                feed.catch_up()
+                if time.monotonic() >= next_flush:
+                    publish_metrics(database, registry)
+                    next_flush = time.monotonic() + SHARED_METRICS_FLUSH_SECONDS
+            except sqlite3.Error as e:
+                logger.warning("⚠️ Shared state poll failed: %s", e)
+            time.sleep(SHARED_STATE_POLL_SECONDS)
+
+    threading.Thread(target=follow, name="shared-state-feed", daemon=True).start()
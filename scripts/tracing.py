@@ -0,0 +1,406 @@
+# DebugIQ-backend/scripts/tracing.py
+
+"""
+Lightweight tracing with OpenTelemetry-compatible output.
+
+Spans nest through a contextvar, so a span opened inside another (in the same
+thread, or in a pool worker started through `wrap`) becomes its child. Finished
+spans are batched in the background and exported as OTLP/JSON, either as JSON
+lines in TRACE_EXPORT_FILE or POSTed to an OTLP/HTTP collector at
+TRACE_EXPORT_ENDPOINT (e.g. http://localhost:4318/v1/traces). With neither set,
+spans are no-ops.
+
+Local collector stand-in and tail-latency report:
+
+    python -m scripts.tracing collect --port 4318 --out traces.jsonl
+    python -m scripts.tracing report traces.jsonl
+"""
+
+import argparse
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE", "")
+TRACE_EXPORT_ENDPOINT = os.getenv("TRACE_EXPORT_ENDPOINT", "")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "debugiq-backend")
+TRACE_BATCH_SIZE = int(os.getenv("TRACE_BATCH_SIZE", "512"))
+TRACE_FLUSH_SECONDS = float(os.getenv("TRACE_FLUSH_SECONDS", "2"))
+# Spans buffered for export; beyond this they are dropped rather than slowing callers down
+TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", "10000"))
+
+_STATUS_CODES = {"UNSET": 0, "OK": 1, "ERROR": 2}
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], attributes: Optional[dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "UNSET"
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_status(self, status: str, message: str = ""):
+        self.status = status
+        self.status_message = message
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns is not None else None
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header for outbound calls."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": {"code": _STATUS_CODES[self.status], "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NoopSpan:
+    """Returned when tracing is off so call sites don't need to check."""
+    trace_id = span_id = parent_span_id = None
+    traceparent = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def set_status(self, status, message=""):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_current_span: contextvars.ContextVar = contextvars.ContextVar("debugiq_current_span", default=None)
+
+
+# --- Exporters ---
+
+def _resource_spans(spans: List[Span]) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "debugiq"}, "spans": [s.to_otlp() for s in spans]}],
+    }]}
+
+
+class FileSpanExporter:
+    """One OTLP/JSON span per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps({"service": TRACE_SERVICE_NAME, **span.to_otlp()}) + "\n")
+
+
+class OTLPHttpExporter:
+    """POSTs batches to an OTLP/HTTP JSON endpoint (a real collector or `collect` below)."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        import httpx
+        self.endpoint = endpoint
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: List[Span]):
+        self._client.post(self.endpoint, json=_resource_spans(spans)).raise_for_status()
+
+
+def _logger():
+    # Imported on use: the logger imports this module to stamp trace ids on records
+    from scripts.utils.logger import setup_logger
+    return setup_logger("tracing")
+
+
+class BatchSpanProcessor:
+    """
+    Exports finished spans in batches from a background thread. `dropped` counts
+    spans lost to a full queue or a failed export.
+    """
+
+    def __init__(self, exporter, batch_size: int = TRACE_BATCH_SIZE, flush_seconds: float = TRACE_FLUSH_SECONDS,
+                 max_queue: int = TRACE_QUEUE_SIZE):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._flush_requested = threading.Event()
+        self._flushed = threading.Condition()
+        self._pending = 0
+        self._thread = threading.Thread(target=self._worker, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span):
+        with self._flushed:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            with self._flushed:
+                self._pending -= 1
+                self.dropped += 1
+
+    def _drain(self) -> List[Span]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while True:
+            self._flush_requested.wait(self.flush_seconds)
+            self._flush_requested.clear()
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                try:
+                    self.exporter.export(batch)
+                except Exception as e:
+                    with self._flushed:
+                        self.dropped += len(batch)
+                    _logger().warning("⚠️ Trace export failed (%d spans dropped): %s", len(batch), e)
+                with self._flushed:
+                    self._pending -= len(batch)
+                    self._flushed.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        self._flush_requested.set()
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._pending <= 0, timeout)
+
+
+class Tracer:
+    def __init__(self, processor: Optional[BatchSpanProcessor] = None):
+        self.processor = processor
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[dict] = None, root: bool = False):
+        """
+        Opens a child of the current span (or a new trace when there is none, or
+        `root` is set). Exceptions mark the span as an error and propagate.
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        parent = None if root else _current_span.get()
+        span = Span(name, parent.trace_id if parent else secrets.token_hex(16),
+                    parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_status("ERROR", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.processor.on_end(span)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        return self.processor.flush(timeout) if self.processor else True
+
+
+def _tracer_from_env() -> Tracer:
+    if TRACE_EXPORT_ENDPOINT:
+        return Tracer(BatchSpanProcessor(OTLPHttpExporter(TRACE_EXPORT_ENDPOINT)))
+    if TRACE_EXPORT_FILE:
+        return Tracer(BatchSpanProcessor(FileSpanExporter(TRACE_EXPORT_FILE)))
+    return Tracer()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = _tracer_from_env()
+                atexit.register(_tracer.flush)
+    return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    global _tracer
+    _tracer = tracer
+
+
+def span(name: str, attributes: Optional[dict] = None, root: bool = False):
+    return get_tracer().span(name, attributes, root)
+
+
+def current_span():
+    return _current_span.get() or NOOP_SPAN
+
+
+def traced(name: Optional[str] = None):
+    """Decorator: runs the function inside a span named `name` (default: module.function)."""
+    def decorator(func):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def wrap(func):
+    """
+    Binds the caller's current span to `func` so work submitted to a thread pool
+    is parented correctly (executor threads don't inherit contextvars).
+    """
+    parent = _current_span.get()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return wrapper
+
+
+# --- Local collector stand-in and report ---
+
+def collect(host: str, port: int, out_path: str):
+    """Accepts OTLP/HTTP JSON on /v1/traces and appends the spans to `out_path`."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            lines = []
+            for resource_spans in body.get("resourceSpans", []):
+                service = next((a["value"].get("stringValue") for a in resource_spans.get("resource", {}).get("attributes", [])
+                                if a.get("key") == "service.name"), None)
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    lines += [json.dumps({"service": service, **s}) for s in scope_spans.get("spans", [])]
+            with lock, open(out_path, "a", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"🛰️ Collecting spans on http://{host}:{port}/v1/traces -> {out_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+def report(path: str, top: int = 15) -> List[dict]:
+    """Per span name: count and p50/p95/p99/max duration, slowest p99 first."""
+    durations: Dict[str, List[float]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            s = json.loads(line)
+            seconds = (int(s["endTimeUnixNano"]) - int(s["startTimeUnixNano"])) / 1e9
+            durations.setdefault(s["name"], []).append(seconds)
+
+    def pct(values, q):
+        return round(values[min(len(values) - 1, int(q * len(values)))], 4)
+
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append({"name": name, "count": len(values), "p50": pct(values, 0.5), "p95": pct(values, 0.95),
+                     "p99": pct(values, 0.99), "max": round(values[-1], 4)})
+    return sorted(rows, key=lambda row: -row["p99"])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trace collector stand-in and latency report.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    collect_parser = sub.add_parser("collect")
+    collect_parser.add_argument("--host", default="127.0.0.1")
+    collect_parser.add_argument("--port", type=int, default=4318)
+    collect_parser.add_argument("--out", default="traces.jsonl")
+    report_parser = sub.add_parser("report")
+    report_parser.add_argument("path")
+    report_parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.command == "collect":
+        collect(args.host, args.port, args.out)
+    else:
+        print(f"{'span':40} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for row in report(args.path, args.top):
+            print(f"{row['name'][:40]:40} {row['count']:>7} {row['p50']:>9} {row['p95']:>9} {row['p99']:>9} {row['max']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,196 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
 
-def setup_logger(name: str = "debugiq", level: int = logging.INFO) -> logging.Logger:
-    """Configure and return a logger."""
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+from scripts import tracing
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Per-logger overrides, e.g. "platform_data_api=WARNING,agent_review_pr=DEBUG"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+# Records waiting for the writer thread; when full, new records are dropped instead of blocking the caller
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Sampling: beyond LOG_SAMPLE_BURST records of one message template per window, INFO/DEBUG are dropped
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "20"))
+LOG_SAMPLE_WINDOW_SECONDS = float(os.getenv("LOG_SAMPLE_WINDOW_SECONDS", "1"))
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra={...}` fields are included as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        # Keep the emoji and other non-ASCII text readable rather than \u-escaped
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets the first `burst` records of each (logger, message template) through per
+    window and drops the rest; the next record that passes carries `sampled_out`.
+    Warnings and above are never sampled.
+    """
+
+    def __init__(self, burst: int = LOG_SAMPLE_BURST, window_seconds: float = LOG_SAMPLE_WINDOW_SECONDS):
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self._windows: Dict[tuple, list] = {}  # key -> [window start, emitted, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.burst <= 0:
+            return True
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                dropped = window[2] if window else 0
+                window = self._windows[key] = [now, 0, 0]
+                if dropped:
+                    record.sampled_out = dropped
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+            if len(self._windows) > 10000:
+                self._windows.clear()
+            return True
+
+
+class _TraceContextFilter(logging.Filter):
+    """Stamps the caller's trace/span ids before the record crosses to the writer thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = tracing.current_span()
+        if span.trace_id:
+            record.trace_id = span.trace_id
+            record.span_id = span.span_id
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full rather than blocking or erroring."""
+
+    dropped = 0
 
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] - %(message)s", "%Y-%m-%d %H:%M:%S")
-    handler.setFormatter(formatter)
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (args may be mutated later) but leave formatting to the writer
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever sys.stdout is at emit time (it may be swapped after setup)."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _output_handler() -> logging.Handler:
+    handler = _StdoutHandler()
+    if LOG_FORMAT == "text":
+        handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s] - %(message)s", "%Y-%m-%d %H:%M:%S"))
+    else:
+        handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def _shared_queue_handler() -> NonBlockingQueueHandler:
+    """One queue and one background writer thread per process."""
+    global _queue_handler, _listener
+    with _setup_lock:
+        if _queue_handler is None:
+            log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            _listener = logging.handlers.QueueListener(log_queue, _output_handler(), respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop)
+            handler = NonBlockingQueueHandler(log_queue)
+            handler.addFilter(SamplingFilter())
+            handler.addFilter(_TraceContextFilter())
+            _queue_handler = handler
+    return _queue_handler
+
+
+def setup_logger(name: str = "debugiq", level: Optional[int] = None) -> logging.Logger:
+    """
+    Configure and return a logger that writes through the shared background queue.
+
+    Level precedence: LOG_LEVELS entry for `name`, then `level`, then LOG_LEVEL.
+    """
+    logger = logging.getLogger(name)
+    configured = parse_levels(LOG_LEVELS).get(name)
+    logger.setLevel(configured or level or logging.getLevelName(LOG_LEVEL.upper()))
 
     if not logger.handlers:
-        logger.addHandler(handler)
+        logger.addHandler(_shared_queue_handler())
+        logger.propagate = False
 
     return logger
 
+
+def flush_logs(timeout: float = 5.0):
+    """Blocks until queued records have been written (for CLIs and tests)."""
+    if _queue_handler is None:
+        return
+    deadline = time.monotonic() + timeout
+    while _queue_handler.queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for handler in (_listener.handlers if _listener else ()):
+        handler.flush()
+
+
 logger = setup_logger()
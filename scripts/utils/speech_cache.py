@@ -0,0 +1,177 @@
+import hashlib
+import os
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional
+
+SPEECH_CACHE_MAX_BYTES = int(os.getenv("SPEECH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Once the disk tier exceeds this, least recently used files are removed down to 90% of it.
+SPEECH_CACHE_DISK_MAX_BYTES = int(os.getenv("SPEECH_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+# Set SPEECH_CACHE_DIR to an empty string to disable the on-disk tier.
+SPEECH_CACHE_DIR = os.getenv("SPEECH_CACHE_DIR", os.path.join(tempfile.gettempdir(), "debugiq_speech_cache"))
+# Optional file with one phrase per line to synthesize ahead of time.
+SPEECH_CACHE_PREWARM = os.getenv("SPEECH_CACHE_PREWARM", "")
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes text so trivially different spellings share a cache entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class SpeechCache:
+    """
+    Two-tier cache of synthesized audio keyed by (normalized text, voice, encoding).
+
+    Both tiers are LRUs bounded by total audio size. The disk tier tracks use
+    through file modification times (a hit touches the file), so workers sharing
+    the directory evict by their combined use; a disk hit repopulates the memory tier.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = SPEECH_CACHE_MAX_BYTES,
+        disk_dir: Optional[str] = SPEECH_CACHE_DIR,
+        max_disk_bytes: int = SPEECH_CACHE_DISK_MAX_BYTES,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir or None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # Estimated size of the disk tier; recounted from the directory whenever it's pruned
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, voice: str, encoding: str) -> str:
+        raw = "\x00".join([normalize_text(text), voice, encoding])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def _remember(self, key: str, audio: bytes):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            if len(audio) > self.max_memory_bytes:
+                return
+            self._memory[key] = audio
+            self._memory_bytes += len(audio)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def get(self, text: str, voice: str, encoding: str) -> Optional[bytes]:
+        key = self.make_key(text, voice, encoding)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, "rb") as f:
+                    audio = f.read()
+                os.utime(path)  # Mark as recently used for disk eviction
+            except OSError:
+                audio = None
+            if audio is not None:
+                self._remember(key, audio)
+                self.hits += 1
+                return audio
+
+        self.misses += 1
+        return None
+
+    def put(self, text: str, voice: str, encoding: str, audio: bytes):
+        key = self.make_key(text, voice, encoding)
+        self._remember(key, audio)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so concurrent readers never see a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "wb") as f:
+                    f.write(audio)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Speech cache: could not write {path}: {e}")
+                return
+            self._prune_disk(len(audio))
+
+    def _disk_entries(self) -> List[tuple]:
+        """(mtime, size, path) of each cached file; in-flight temporary files are skipped."""
+        entries = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.startswith("tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Removed by another worker meanwhile
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _prune_disk(self, added: int):
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_bytes += added
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            entries = sorted(self._disk_entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_disk_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+            self._disk_bytes = total
+
+    def get_or_synthesize(self, text: str, synthesize: Callable[[str], bytes], voice: str, encoding: str) -> bytes:
+        audio = self.get(text, voice, encoding)
+        if audio is None:
+            audio = synthesize(text)
+            self.put(text, voice, encoding, audio)
+        return audio
+
+    def prewarm(self, phrases: Iterable[str], synthesize: Callable[[str], bytes], voice: str, encoding: str) -> int:
+        """Synthesizes any phrases that are not cached yet. Returns how many were synthesized."""
+        synthesized = 0
+        for phrase in phrases:
+            if self.get(phrase, voice, encoding) is not None:
+                continue
+            try:
+                self.put(phrase, voice, encoding, synthesize(phrase))
+                synthesized += 1
+            except Exception as e:
+                print(f"Speech cache: pre-warm failed for {phrase!r}: {e}")
+        return synthesized
+
+
+def load_prewarm_phrases(path: str = SPEECH_CACHE_PREWARM) -> List[str]:
+    """Reads the configured pre-warm phrase list, one phrase per line."""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+speech_cache = SpeechCache()
@@ -1,12 +1,25 @@
-from google.cloud import texttospeech
 import os
 
-def synthesize_speech_to_bytes(text: str) -> bytes:
-    client = texttospeech.TextToSpeechClient()
+from scripts.utils.speech_cache import speech_cache
+
+_client = None
+
+def _get_client():
+    # Creating the client sets up gRPC channels and auth, so do it once per process
+    global _client
+    if _client is None:
+        from google.cloud import texttospeech
+        _client = texttospeech.TextToSpeechClient()
+    return _client
+
+def _synthesize(text: str, language_code: str) -> bytes:
+    client = _get_client()
+    from google.cloud import texttospeech  # Cheap: _get_client() has already imported it
+
     input_text = texttospeech.SynthesisInput(text=text)
 
     voice = texttospeech.VoiceSelectionParams(
-        language_code="en-US",
+        language_code=language_code,
         ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
     )
 
@@ -14,3 +27,19 @@ def synthesize_speech_to_bytes(text: str) -> bytes:
 
     response = client.synthesize_speech(input=input_text, voice=voice, audio_config=audio_config)
     return response.audio_content
+
+def synthesize_speech_to_bytes(text: str, language_code: str = "en-US") -> bytes:
+    return speech_cache.get_or_synthesize(
+        text,
+        lambda t: _synthesize(t, language_code),
+        voice=f"google:{language_code}:neutral",
+        encoding="LINEAR16"
+    )
+
+def prewarm(phrases, language_code: str = "en-US") -> int:
+    return speech_cache.prewarm(
+        phrases,
+        lambda t: _synthesize(t, language_code),
+        voice=f"google:{language_code}:neutral",
+        encoding="LINEAR16"
+    )
@@ -1,62 +1,136 @@
-# Save the production-ready version of validate_proposed_patch.py
-from pathlib import Path
-
-validate_code = '''
 import os
 import sys
 import json
-from .utils import ai_api_client
+import time
+from contextlib import contextmanager
+
+from scripts import impact_map, platform_data_api, validation_engine
+from scripts.sandbox_pool import get_sandbox_pool, has_lockfile
+from scripts.utils.logger import setup_logger
+# from scripts.utils import ai_api_client  # Enable with the live AI assessment below
+
+# Run checks inside a pre-warmed virtualenv matching the repository's lockfiles
+VALIDATION_USE_SANDBOX = os.getenv("VALIDATION_USE_SANDBOX", "1") == "1"
+
+logger = setup_logger("validate_proposed_patch")
+
+
+@contextmanager
+def _dependency_sandbox(repo_path, validation_results):
+    """Leases a sandbox for the repository, or yields None to use the current interpreter."""
+    if not VALIDATION_USE_SANDBOX or not has_lockfile(repo_path):
+        yield None
+        return
+    started = time.monotonic()
+    # Key by the repository, not the checkout: every validation runs in a fresh clone
+    with get_sandbox_pool().lease(repo_path, repo_id=impact_map.repository_id(repo_path)) as sandbox:
+        validation_results["timings"]["sandbox_lease_seconds"] = round(time.monotonic() - started, 3)
+        validation_results["sandbox"] = sandbox.key
+        yield sandbox
+
 
-def validate_patch(issue_id, patch_diff_content):
+def validate_patch(issue_id, patch_diff_content, repo_path=None, base_ref="HEAD"):
     """
     Performs automated validation checks and uses AI to summarize/assess results.
 
+    The patch is applied in an isolated git worktree; lint, build, targeted tests
+    and quick regression tests then run as independent parallel jobs with
+    per-check timeouts, and the remaining checks are cancelled as soon as a
+    blocking check fails. When the repository has lockfiles, checks run in a
+    leased dependency sandbox so dependencies aren't reinstalled per patch.
+
     Args:
         issue_id (str): The ID of the issue the patch is for.
         patch_diff_content (str): The diff content of the proposed patch.
+        repo_path (str, optional): Local repository to validate against. When omitted,
+            the repository linked to the issue is cloned.
+        base_ref (str, optional): Commit or branch the patch is applied on top of.
 
     Returns:
         dict: Validation results with AI assessment.
-              Includes 'is_valid', 'checks_run', 'failures', 'ai_assessment'.
+              Includes 'is_valid', 'checks_run', 'failures', 'timings', 'ai_assessment'.
     """
-    print(f"[🔍] Validating patch for Issue ID: {issue_id}")
+    logger.info("[🔍] Validating patch for Issue ID: %s", issue_id)
 
     validation_results = {
         "is_valid": True,
         "checks_run": [],
-        "failures": []
+        "failures": [],
+        "timings": {}
     }
-    temp_branch_name = f"validation-{issue_id}-{os.getpid()}"
+    started = time.monotonic()
+    cloned_path = None
+    worktree = None
 
     try:
-        # Simulated validation steps — replace with actual logic
-        print("[🛠️] Running automated checks...")
-        validation_results['checks_run'] = [
-            {"check": "Apply Patch", "status": "passed", "message": ""},
-            {"check": "Static Analysis/Linting", "status": "passed", "output": "No linting issues found."},
-            {"check": "Code Build", "status": "passed", "output": "Build successful."},
-            {"check": "Targeted Bug Test", "status": "passed", "output": "Bug reproduction test passed."},
-            {"check": "Quick Regression Tests", "status": "passed", "output": "All 50 regression tests passed."}
+        if repo_path is None:
+            repo_info = platform_data_api.get_repository_info_for_issue(issue_id)
+            if not repo_info:
+                raise Exception(f"Repository info not available for issue {issue_id}")
+            cloned_path = platform_data_api.clone_repository(
+                repo_info["repository_url"],
+                repo_info.get("default_branch", "main"),
+                auth_token=repo_info.get("auth_token"),
+                platform_type=repo_info.get("platform_type", "github")
+            )
+            if not cloned_path:
+                raise Exception("Could not clone repository for validation")
+            repo_path = cloned_path
+
+        logger.info("[🛠️] Running automated checks...")
+        setup_started = time.monotonic()
+        worktree = validation_engine.create_worktree(repo_path, base_ref)
+        validation_results["timings"]["setup_seconds"] = round(time.monotonic() - setup_started, 3)
+
+        apply_result = validation_engine.apply_patch(worktree, patch_diff_content)
+        validation_results["checks_run"].append(apply_result)
+
+        if apply_result["status"] == "passed":
+            changed_files = validation_engine.changed_files_from_diff(patch_diff_content)
+            # Only run the tests the change can affect, per the stored test-impact map
+            selection = impact_map.select_tests_for_diff(repo_path, patch_diff_content, base_ref)
+            validation_results["test_selection"] = {
+                "full_suite": selection.full_suite,
+                "reason": selection.reason,
+                "selected_tests": len(selection.tests)
+            }
+            with _dependency_sandbox(repo_path, validation_results) as sandbox:
+                checks = validation_engine.default_checks(
+                    changed_files, worktree,
+                    python=sandbox.python if sandbox else sys.executable,
+                    test_selection=selection
+                )
+                checks_started = time.monotonic()
+                validation_results["checks_run"].extend(
+                    validation_engine.run_checks(worktree, checks, env=sandbox.env() if sandbox else None)
+                )
+                validation_results["timings"]["checks_wall_seconds"] = round(time.monotonic() - checks_started, 3)
+
+        validation_results["failures"] = [
+            step for step in validation_results["checks_run"]
+            if step.get("blocking", True) and step["status"] in ("failed", "timeout")
         ]
-
-        validation_results["is_valid"] = all(step["status"] == "passed" for step in validation_results["checks_run"])
+        validation_results["is_valid"] = not validation_results["failures"]
         if not validation_results["is_valid"]:
-            validation_results["failures"] = [step for step in validation_results["checks_run"] if step["status"] != "passed"]
-            print("[❌] One or more validation checks failed.")
+            logger.warning("[❌] One or more validation checks failed.")
         else:
-            print("[✅] All checks passed.")
+            logger.info("[✅] All checks passed.")
 
     except Exception as e:
-        print(f"[❌] Error during validation: {e}", file=sys.stderr)
+        logger.exception("[❌] Error during validation: %s", e)
         validation_results["is_valid"] = False
         validation_results["failures"].append({"check": "Execution Error", "message": str(e)})
 
     finally:
-        print(f"[🧹] Cleaning up temp branch: {temp_branch_name}")
-        # repo_utils.delete_branch(temp_branch_name)  # Uncomment in production
+        if worktree:
+            logger.info("[🧹] Cleaning up validation worktree: %s", worktree)
+            validation_engine.remove_worktree(repo_path, worktree)
+        if cloned_path:
+            platform_data_api.cleanup_repository(cloned_path)
+        validation_results["timings"]["total_seconds"] = round(time.monotonic() - started, 3)
 
     # Step 2: AI-Based Validation Assessment
-    print("[🤖] Running AI assessment of validation results...")
+    logger.info("[🤖] Running AI assessment of validation results...")
     try:
         assessment_prompt = f"""
         Review these validation results for Issue {issue_id}. Summarize the outcome and potential risks.
@@ -75,30 +149,20 @@ def validate_patch(issue_id, patch_diff_content):
         # response = ai_api_client.chat_completion(...)
         # ai_assessment = response.choices[0].message.content
 
-        # Mock response for dev
-        ai_assessment = """
-        All checks passed:
-        - Patch applied cleanly
-        - No lint issues
-        - Bug-specific test passed
-        - Regression tests passed
-
-        Recommendation: Safe to proceed to CI/CD and human review.
-        """
+        # Summary from the actual check results until the AI call is wired
+        lines = [f"- {step['check']}: {step['status']}" for step in validation_results["checks_run"]]
+        if validation_results["is_valid"]:
+            lines.append("\nRecommendation: Safe to proceed to CI/CD and human review.")
+        else:
+            lines.append("\nRecommendation: Do not merge; address the failing checks first.")
+        ai_assessment = "\n".join(lines)
 
         validation_results["ai_assessment"] = ai_assessment.strip()
-        print("[✅] AI validation summary complete.")
+        logger.info("[✅] AI validation summary complete.")
 
     except Exception as e:
-        print(f"[⚠️] AI validation failed: {e}", file=sys.stderr)
+        logger.warning("[⚠️] AI validation failed: %s", e)
         validation_results["ai_assessment"] = "AI assessment failed due to internal error."
 
-    print(f"[📦] Patch validation complete. Valid: {validation_results['is_valid']}")
+    logger.info("[📦] Patch validation complete. Valid: %s", validation_results['is_valid'])
     return validation_results
-'''.strip()
-
-validate_path = Path("/mnt/data/DebugIQ-backend/scripts/validate_proposed_patch.py")
-validate_path.parent.mkdir(parents=True, exist_ok=True)
-validate_path.write_text(validate_code + "\n")
-
-validate_path
@@ -0,0 +1,289 @@
+# DebugIQ-backend/scripts/validation_engine.py
+
+import os
+import re
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from scripts import platform_data_api, tracing
+from scripts.lint_service import get_lint_service
+from scripts.impact_map import TestSelection
+
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", str(os.cpu_count() or 2)))
+VALIDATION_CHECK_TIMEOUT_SECONDS = float(os.getenv("VALIDATION_CHECK_TIMEOUT_SECONDS", "300"))
+# Set to 0 to report lint findings without failing the patch
+VALIDATION_LINT_BLOCKING = os.getenv("VALIDATION_LINT_BLOCKING", "1") == "1"
+# Optional command overrides, e.g. VALIDATION_REGRESSION_CMD="{python} -m pytest -q -m smoke".
+# {python} is replaced with the interpreter and {files} with the relevant file list.
+CHECK_COMMAND_OVERRIDES = {
+    "Static Analysis/Linting": os.getenv("VALIDATION_LINT_CMD"),
+    "Code Build": os.getenv("VALIDATION_BUILD_CMD"),
+    "Targeted Bug Test": os.getenv("VALIDATION_TEST_CMD"),
+    "Quick Regression Tests": os.getenv("VALIDATION_REGRESSION_CMD"),
+}
+
+_DIFF_FILE_HEADER = re.compile(r"^\+\+\+ (?:b/)?(\S+)", re.MULTILINE)
+
+
+@dataclass
+class CheckSpec:
+    name: str
+    command: List[str]
+    timeout: float = VALIDATION_CHECK_TIMEOUT_SECONDS
+    # A failing blocking check invalidates the patch and cancels the remaining checks
+    blocking: bool = True
+    # pytest exits with 5 when nothing was collected; treat that as a skip
+    skip_returncodes: List[int] = field(default_factory=list)
+    # In-process check returning (returncode, output); used instead of spawning `command`
+    func: Optional[Callable[[], Tuple[int, str]]] = None
+
+
+def changed_files_from_diff(patch_diff: str) -> List[str]:
+    """Returns the paths touched by a unified diff (new-side names, deletions excluded)."""
+    return [path for path in _DIFF_FILE_HEADER.findall(patch_diff) if path != "/dev/null"]
+
+
+def _format_command(template: str, python: str, files: List[str]) -> List[str]:
+    parts = []
+    for part in shlex.split(template):
+        if part == "{files}":
+            parts.extend(files)
+        else:
+            parts.append(part.replace("{python}", python))
+    return parts
+
+
+def targeted_tests_for(changed_files: List[str], worktree: str) -> List[str]:
+    """Test files that directly match the changed modules (tests/test_<module>.py) or are themselves changed."""
+    targeted = []
+    for path in changed_files:
+        name = os.path.basename(path)
+        if not name.endswith(".py"):
+            continue
+        if name.startswith("test_"):
+            candidates = [path]
+        else:
+            candidates = [os.path.join("tests", f"test_{name}"), os.path.join(os.path.dirname(path), "tests", f"test_{name}")]
+        for candidate in candidates:
+            if candidate not in targeted and os.path.exists(os.path.join(worktree, candidate)):
+                targeted.append(candidate)
+    return targeted
+
+
+def lint_check(worktree: str, files: List[str]) -> Tuple[int, str]:
+    """Lints the files through the cached lint service; unchanged blobs cost nothing."""
+    findings = get_lint_service().lint_files(worktree, files)
+    output = "\n".join(line for path in files for line in findings.get(path, []))
+    return (1 if output else 0), output
+
+
+def default_checks(
+    changed_files: List[str],
+    worktree: str,
+    python: str = sys.executable,
+    test_selection: Optional[TestSelection] = None,
+) -> List[CheckSpec]:
+    """
+    Lint, build, targeted test and quick regression checks for the changed files.
+
+    When an impact-map selection is given and it isn't a full-suite run, only the
+    selected tests run and the full regression run is left out.
+    """
+    py_files = [f for f in changed_files if f.endswith(".py") and os.path.exists(os.path.join(worktree, f))]
+    if test_selection is not None and not test_selection.full_suite:
+        targeted, regression = test_selection.tests, []
+    else:
+        targeted, regression = targeted_tests_for(changed_files, worktree), None
+
+    defaults = {
+        "Static Analysis/Linting": ("{python} -m flake8 {files}", py_files),
+        "Code Build": ("{python} -m compileall -q {files}", py_files),
+        "Targeted Bug Test": ("{python} -m pytest -q -x --disable-warnings {files}", targeted),
+        "Quick Regression Tests": ("{python} -m pytest -q --maxfail=3 --disable-warnings", regression),
+    }
+
+    checks = []
+    for name, (template, files) in defaults.items():
+        if files is not None and not files:
+            continue  # Nothing relevant changed for this check
+        override = CHECK_COMMAND_OVERRIDES.get(name)
+        template = override or template
+        func = None
+        if name == "Static Analysis/Linting" and not override:
+            func = lambda files=files: lint_check(worktree, files)
+        checks.append(CheckSpec(
+            name=name,
+            command=_format_command(template, python, files or []),
+            blocking=VALIDATION_LINT_BLOCKING or name != "Static Analysis/Linting",
+            skip_returncodes=[5] if "pytest" in template else [],
+            func=func,
+        ))
+    return checks
+
+
+# --- Isolated worktree ---
+
+def create_worktree(repo_path: str, base_ref: str = "HEAD") -> str:
+    """Creates a detached worktree of `repo_path` at `base_ref` in a fresh temp directory."""
+    worktree = tempfile.mkdtemp(prefix="debugiq_validate_")
+    return_code, _, stderr = platform_data_api.run_git_command(["git", "worktree", "add", "--detach", worktree, base_ref], repo_path)
+    if return_code != 0:
+        os.rmdir(worktree)
+        raise RuntimeError(f"Failed to create worktree: {stderr}")
+    return worktree
+
+
+def remove_worktree(repo_path: str, worktree: str):
+    platform_data_api.run_git_command(["git", "worktree", "remove", "--force", worktree], repo_path)
+    platform_data_api.cleanup_repository(worktree)
+
+
+def apply_patch(worktree: str, patch_diff: str) -> dict:
+    """Applies the diff to the worktree and returns an 'Apply Patch' check result."""
+    started = time.monotonic()
+    patch_path = os.path.join(worktree, ".debugiq_validation.patch")
+    with open(patch_path, "w", encoding="utf-8") as f:
+        f.write(patch_diff.strip() + "\n")
+    try:
+        return_code, stdout, stderr = platform_data_api.run_git_command(["git", "apply", "--whitespace=nowarn", patch_path], worktree)
+    finally:
+        os.remove(patch_path)
+    return {
+        "check": "Apply Patch",
+        "status": "passed" if return_code == 0 else "failed",
+        "output": (stdout + stderr).strip(),
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "blocking": True,
+    }
+
+
+# --- Parallel check runner ---
+
+class _CheckRunner:
+    """Runs checks concurrently, each in its own process group so it can be killed as a unit."""
+
+    def __init__(self, cwd: str, env: Optional[Dict[str, str]] = None):
+        self.cwd = cwd
+        self.env = env
+        self.cancelled = threading.Event()
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic()
+
+    def run(self, check: CheckSpec) -> dict:
+        result = {"check": check.name, "command": check.command, "blocking": check.blocking}
+        started = time.monotonic()
+        result["started_at_seconds"] = round(started - self._t0, 3)
+
+        if self.cancelled.is_set():
+            result.update(status="cancelled", output="Cancelled after a blocking check failed.", duration_seconds=0.0)
+            return result
+
+        if check.func is not None:
+            try:
+                returncode, output = check.func()
+            except Exception as e:
+                returncode, output = 1, f"{type(e).__name__}: {e}"
+            result.update(
+                status="passed" if returncode == 0 else "failed",
+                output=output.strip()[-10000:],
+                returncode=returncode,
+                duration_seconds=round(time.monotonic() - started, 3),
+            )
+            return result
+
+        try:
+            proc = subprocess.Popen(
+                check.command, cwd=self.cwd, env=self.env,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                start_new_session=True,
+            )
+        except FileNotFoundError as e:
+            result.update(status="failed", output=str(e), duration_seconds=round(time.monotonic() - started, 3))
+            return result
+
+        with self._lock:
+            self._procs[check.name] = proc
+            cancelled_while_starting = self.cancelled.is_set()
+        if cancelled_while_starting:
+            self._kill(proc)
+        try:
+            output, _ = proc.communicate(timeout=check.timeout)
+            if self.cancelled.is_set() and proc.returncode < 0:
+                status = "cancelled"
+            elif proc.returncode == 0:
+                status = "passed"
+            elif proc.returncode in check.skip_returncodes:
+                status = "skipped"
+            else:
+                status = "failed"
+        except subprocess.TimeoutExpired:
+            self._kill(proc)
+            output, _ = proc.communicate()
+            status = "timeout"
+        finally:
+            with self._lock:
+                self._procs.pop(check.name, None)
+
+        result.update(
+            status=status,
+            output=(output or "").strip()[-10000:],  # Keep the tail; that's where failures are reported
+            returncode=proc.returncode,
+            duration_seconds=round(time.monotonic() - started, 3),
+        )
+        return result
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def cancel_all(self):
+        self.cancelled.set()
+        with self._lock:
+            procs = list(self._procs.values())
+        for proc in procs:
+            self._kill(proc)
+
+
+def run_checks(
+    worktree: str,
+    checks: List[CheckSpec],
+    workers: int = VALIDATION_WORKERS,
+    env: Optional[Dict[str, str]] = None,
+) -> List[dict]:
+    """
+    Runs the checks as independent jobs. As soon as a blocking check fails or
+    times out, running checks are killed and pending ones are reported as cancelled.
+    Results are returned in the order the checks were given.
+    """
+    if not checks:
+        return []
+    runner = _CheckRunner(worktree, env=env)
+
+    def run_traced(check: CheckSpec) -> dict:
+        with tracing.span("validation.check", {"check.name": check.name, "check.blocking": check.blocking}) as span:
+            result = runner.run(check)
+            span.set_attribute("check.status", result["status"])
+            return result
+
+    results: Dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(checks))), thread_name_prefix="validation-check") as pool:
+        futures = {pool.submit(tracing.wrap(run_traced), check): check for check in checks}
+        for future in as_completed(futures):
+            check = futures[future]
+            result = future.result()
+            results[check.name] = result
+            if check.blocking and result["status"] in ("failed", "timeout") and not runner.cancelled.is_set():
+                runner.cancel_all()
+    return [results[check.name] for check in checks]
@@ -1,19 +1,33 @@
 import os
 import tempfile
-import google.generativeai as genai
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from scripts import tracing
+from scripts.latency_metrics import LLM_CALL_SECONDS
+
 GEMINI_MODEL = "models/gemini-1.5-pro-latest"
 
+_genai = None
+
+def _get_genai():
+    # Deferred so loading the voice routers doesn't pay for the Gemini SDK until audio arrives
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _genai = genai
+    return _genai
+
 def transcribe_and_respond_from_audio(audio_bytes: bytes) -> str:
     try:
-        session = genai.StreamingVoiceChatSession(model=GEMINI_MODEL)
-        session.send_audio_chunk(audio_bytes)
+        with tracing.span("llm.call", {"llm.task": "gemini_voice_chat", "llm.model": GEMINI_MODEL}), \
+                LLM_CALL_SECONDS.time(task="gemini_voice_chat"):
+            session = _get_genai().StreamingVoiceChatSession(model=GEMINI_MODEL)
+            session.send_audio_chunk(audio_bytes)
 
-        full_response = ""
-        for chunk in session:
-            if chunk.text:
-                full_response += chunk.text
+            full_response = ""
+            for chunk in session:
+                if chunk.text:
+                    full_response += chunk.text
         return full_response.strip()
     except Exception as e:
         return f"[Gemini voice error] {e}"
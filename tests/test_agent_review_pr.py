@@ -0,0 +1,86 @@
+import json
+import re
+import threading
+import time
+
+from scripts.agent_review_pr import review_pull_request, split_diff_into_chunks
+
+
+def _diff(files=3, hunks=2):
+    parts = []
+    for f in range(files):
+        parts += [f"--- a/mod{f}.py", f"+++ b/mod{f}.py"]
+        for h in range(hunks):
+            start = h * 10 + 1
+            parts += [f"@@ -{start},2 +{start},2 @@", f" ctx{h}", f"-old{f}{h}", f"+new{f}{h}"]
+    return "\n".join(parts) + "\n"
+
+
+def test_chunks_are_per_file_and_bounded():
+    chunks = split_diff_into_chunks(_diff(files=2, hunks=3), max_chars=60)
+    assert {chunk.path for chunk in chunks} == {"mod0.py", "mod1.py"}
+    assert all(len(chunk.hunks) == 1 for chunk in chunks)  # Each hunk alone fills a chunk
+    assert [h.hunk_id for c in chunks for h in c.hunks] == [f"H{i}" for i in range(1, 7)]
+
+
+def test_chunks_are_reviewed_concurrently_and_merged():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_ai(task_type, prompt):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.1)
+        with lock:
+            active -= 1
+        hunk_ids = re.findall(r"^\[(H\d+)\]$", prompt, re.MULTILINE)
+        findings = [{"hunk": h, "category": "summary", "text": f"changes {h}"} for h in hunk_ids]
+        findings.append({"hunk": hunk_ids[0], "category": "suggested_tests", "text": "add a regression test"})
+        return "```json\n" + json.dumps({"findings": findings}) + "\n```"
+
+    started = time.monotonic()
+    review = review_pull_request(
+        "PR-1", "https://example.com/repo.git", "fix", "main", "Fix", "", _diff(files=6, hunks=1),
+        max_concurrency=3, ai_call=fake_ai, cache=None,
+    )
+    elapsed = time.monotonic() - started
+
+    assert peak == 3
+    assert elapsed < 0.5  # Two waves of 0.1s, not six sequential calls
+    assert review["summary"].startswith("Reviewed 6 file(s) in 6 chunk(s).")
+    assert "- `mod5.py`: changes H6" in review["summary"]
+    assert review["suggested_tests"].count("add a regression test") == 6
+    assert review["security_concerns"] == "None identified."
+
+
+def test_re_review_only_sends_changed_hunks(tmp_path):
+    from scripts.agent_review_pr import ReviewCache
+
+    prompts = []
+
+    def fake_ai(task_type, prompt):
+        prompts.append(prompt)
+        hunk_ids = re.findall(r"^\[(H\d+)\]$", prompt, re.MULTILINE)
+        return json.dumps({"findings": [
+            {"hunk": h, "category": "potential_issues", "text": f"issue in {'newer' if 'newer' in prompt else 'original'} code"}
+            for h in hunk_ids
+        ]})
+
+    cache = ReviewCache(str(tmp_path))
+    first = _diff(files=3, hunks=1)
+    review_pull_request("PR-9", "repo", "fix", "main", "Fix", "", first, ai_call=fake_ai, head_sha="aaa", cache=cache)
+    assert len(prompts) == 3
+
+    # Follow-up push: one file's change is amended, another hunk only moved down
+    second = first.replace("+new10", "+newer10").replace("@@ -1,2 +1,2 @@\n ctx0\n-old20", "@@ -5,2 +5,2 @@\n ctx0\n-old20")
+    prompts.clear()
+    review = review_pull_request("PR-9", "repo", "fix", "main", "Fix", "", second, ai_call=fake_ai, head_sha="bbb",
+                                 cache=ReviewCache(str(tmp_path)))
+
+    assert len(prompts) == 1 and "mod1.py" in prompts[0]
+    assert "- `mod1.py`: issue in newer code" in review["potential_issues"]
+    assert "- `mod0.py`: issue in original code" in review["potential_issues"]
+    assert "Reused findings for 2 unchanged hunk(s)." in review["summary"]
+    assert ReviewCache(str(tmp_path)).load("PR-9")["head_sha"] == "bbb"
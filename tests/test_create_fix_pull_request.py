@@ -0,0 +1,65 @@
+import subprocess
+
+import pytest
+
+from scripts import create_fix_pull_request, platform_data_api
+from scripts.mock_db import db
+
+FIX = """--- a/app.py
++++ b/app.py
+@@ -1 +1 @@
+-print('hi')
++print('hello')
+"""
+# Rewrites the line to what it already is: applies cleanly, changes nothing
+NO_OP = FIX.replace("+print('hello')", "+print('hi')")
+
+
+@pytest.fixture
+def remote(tmp_path):
+    bare, work = tmp_path / "remote.git", tmp_path / "work"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(bare)], check=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(work)], check=True)
+    (work / "app.py").write_text("print('hi')\n")
+    subprocess.run(["git", "-C", str(work), "add", "."], check=True)
+    subprocess.run(["git", "-C", str(work), "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"], check=True)
+    subprocess.run(["git", "-C", str(work), "push", "-q", str(bare), "main"], check=True)
+    return bare
+
+
+@pytest.fixture
+def opened(monkeypatch, remote):
+    db["PR-1"] = {"id": "PR-1", "repository": f"file://{remote}"}
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "t")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "t@t")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "t")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "t@t")
+    platform_data_api.platform_data_api_async.get_git_runner().refresh_env()
+    calls = []
+    monkeypatch.setattr(platform_data_api, "create_pull_request_on_platform",
+                        lambda issue_id, branch, base, title, body: calls.append(branch) or {"number": 1})
+    yield calls
+    del db["PR-1"]
+    platform_data_api.platform_data_api_async.get_git_runner().refresh_env()
+
+
+def _branches(remote):
+    return subprocess.run(["git", "-C", str(remote), "branch", "--format=%(refname:short)"],
+                          capture_output=True, text=True, check=True).stdout.split()
+
+
+def test_no_pull_request_when_the_patch_changes_nothing(opened, remote):
+    result = create_fix_pull_request.create_pull_request("PR-1", "debugiq/fix-pr-1", NO_OP, {}, {})
+
+    assert "no changes" in result["error"]
+    assert opened == []
+    assert _branches(remote) == ["main"]
+
+
+def test_pushed_branch_gets_a_pull_request_without_the_patch_file(opened, remote):
+    result = create_fix_pull_request.create_pull_request("PR-1", "debugiq/fix-pr-1", FIX, {}, {})
+
+    assert result == {"number": 1} and opened == ["debugiq/fix-pr-1"]
+    files = subprocess.run(["git", "-C", str(remote), "ls-tree", "--name-only", "debugiq/fix-pr-1"],
+                           capture_output=True, text=True, check=True).stdout.split()
+    assert files == ["app.py"]
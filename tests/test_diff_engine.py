@@ -0,0 +1,76 @@
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from scripts.diff_engine import diff_opcodes, unified_diff
+from scripts.patch_engine import apply_patch
+
+
+def _random_pair(rng):
+    a = [f"line {rng.randint(0, 6)}" for _ in range(rng.randint(0, 30))]
+    b = list(a)
+    for _ in range(rng.randint(1, 5)):
+        op = rng.random()
+        if op < 0.3 and b:
+            del b[rng.randrange(len(b))]
+        elif op < 0.6:
+            b.insert(rng.randint(0, len(b)), f"new {rng.randint(0, 9)}")
+        elif b:
+            b[rng.randrange(len(b))] = "changed"
+    a_text, b_text = "".join(x + "\n" for x in a), "".join(x + "\n" for x in b)
+    if rng.random() < 0.2 and a_text:
+        a_text = a_text[:-1]
+    if rng.random() < 0.2 and b_text:
+        b_text = b_text[:-1]
+    return a_text, b_text
+
+
+@pytest.mark.parametrize("algorithm", ["myers", "histogram"])
+@pytest.mark.parametrize("git_threshold", [20000, 0])
+def test_diff_round_trips_through_patch_engine(algorithm, git_threshold):
+    rng = random.Random(7)
+    for _ in range(200):
+        a_text, b_text = _random_pair(rng)
+        diff = unified_diff(a_text, b_text, "a/f.py", "b/f.py", context=rng.randint(0, 3),
+                            algorithm=algorithm, git_threshold=git_threshold)
+        if a_text == b_text:
+            assert diff == ""
+            continue
+        result = apply_patch(diff, {"f.py": a_text})
+        assert result.ok and result.files[0].content == b_text, diff
+
+
+@pytest.mark.skipif(not shutil.which("git"), reason="git not installed")
+@pytest.mark.parametrize("algorithm", ["myers", "histogram"])
+def test_diff_round_trips_through_git_apply(tmp_path, algorithm):
+    # What fix_validator.generate_diff produces ends up in PRs, so git itself must accept it
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    target = tmp_path / "f.py"
+    rng = random.Random(11)
+    cases = [("a\nb\n", "a\nb\nc"), ("a\nb", "a\nb\n"), ("a\nb", "a\nc")]
+    cases += [_random_pair(rng) for _ in range(150)]
+    for a_text, b_text in cases:
+        diff = unified_diff(a_text, b_text, "a/f.py", "b/f.py", context=rng.randint(0, 3), algorithm=algorithm)
+        if not diff:
+            continue
+        target.write_bytes(a_text.encode())
+        result = subprocess.run(["git", "apply", "--unidiff-zero", "-"], cwd=tmp_path, input=diff.encode(),
+                                capture_output=True)
+        assert result.returncode == 0, result.stderr.decode() + diff
+        assert target.read_bytes().decode() == b_text, diff
+
+
+def test_myers_edit_script_is_minimal():
+    a = list("ABCABBA")
+    b = list("CBABAC")
+    equal = sum(i2 - i1 for tag, i1, i2, _, _ in diff_opcodes(a, b, "myers") if tag == "equal")
+    assert equal == 4  # LCS length of the classic Myers example
+
+
+def test_small_change_in_large_file_only_diffs_the_change():
+    original = "".join(f"value = {i % 977}\n" for i in range(100000))
+    patched = original.replace("value = 5\n", "value = five\n", 1)
+    diff = unified_diff(original, patched, "a/big.py", "b/big.py")
+    assert diff.count("\n-") == 1 and diff.count("\n+") == 2  # "+++" header and the change
@@ -0,0 +1,41 @@
+from scripts.fix_metrics import FixMetrics
+
+HOUR = 3600
+
+
+def _run(metrics, issue_id, statuses, at):
+    for offset, status in enumerate(statuses):
+        metrics.record_transition(issue_id, status, at=at + offset * 60)
+
+
+def test_transitions_update_success_rate_and_stage_failures():
+    now = 100 * HOUR
+    metrics = FixMetrics(window_hours=24, clock=lambda: now)
+    _run(metrics, "A", ["Fetching Details", "Diagnosis in Progress", "PR Created - Awaiting Review/QA"], now - 600)
+    _run(metrics, "B", ["Fetching Details", "Patch Validation Failed"], now - 600)
+    _run(metrics, "C", ["Fetching Details", "Patch Malformed"], now - 600)
+    _run(metrics, "D", ["Fetching Details", "Diagnosis in Progress"], now - 600)
+
+    summary = metrics.summary()
+    assert summary["all_time"]["success_rate"] == round(1 / 3, 4)
+    assert summary["all_time"]["failures_by_stage"] == {"validation": 1, "patch_suggestion": 1}
+    assert summary["all_time"]["avg_time_to_pr_seconds"] == 120.0
+    assert summary["in_progress"] == 1
+    assert summary["issues_by_status"]["Diagnosis in Progress"] == 1
+
+
+def test_window_buckets_expire_old_hours():
+    clock = [10 * HOUR]
+    metrics = FixMetrics(window_hours=2, clock=lambda: clock[0])
+    _run(metrics, "old", ["Fetching Details", "Diagnosis Failed"], 10 * HOUR)
+    _run(metrics, "new", ["Fetching Details", "PR Created - Awaiting Review/QA"], 11 * HOUR)
+
+    assert metrics.summary()["last_2h"]["failed"] == 1
+
+    clock[0] = 12 * HOUR + 1  # The 10:00 bucket has left the window
+    summary = metrics.summary()
+    assert summary["last_2h"]["failed"] == 0 and summary["last_2h"]["failures_by_stage"] == {}
+    assert summary["last_2h"]["success_rate"] == 1.0
+    assert summary["last_2h"]["throughput_per_hour"] == 0.5
+    assert summary["all_time"]["failed"] == 1
+    assert len(summary["hourly"]) == 1
@@ -0,0 +1,83 @@
+import pytest
+
+from scripts.fake_git_platform_server import FakeGitPlatformServer
+from scripts.git_platform_client import GitPlatformClient, GitPlatformError
+
+
+@pytest.fixture
+def server():
+    with FakeGitPlatformServer() as fake:
+        yield fake
+
+
+def _client(server, **kwargs):
+    kwargs.setdefault("sleep", lambda seconds: None)
+    return GitPlatformClient(base_url=server.url, token="test-token", **kwargs)
+
+
+def test_calls_reuse_one_connection(server):
+    client = _client(server)
+    pr = client.create_pull_request("o", "r", "fix-1", "main", "Fix", "body")
+    for i in range(5):
+        client.post_issue_comment("o/r", pr["number"], f"comment {i}")
+    client.dispatch_workflow("o/r", "deploy.yml")
+
+    assert pr["url"] == "https://github.com/o/r/pull/1"
+    assert len(server.comments) == 5 and server.dispatches[0]["ref"] == "main"
+    assert server.connections == 1
+
+
+def test_conditional_get_serves_cached_body_on_304(server):
+    client = _client(server)
+    client.create_pull_request("o", "r", "fix-1", "main", "Fix", "body")
+    first = client.get_pull_request("o", "r", 1)
+    remaining = server.rate_remaining
+    second = client.get_pull_request("o", "r", 1)
+
+    assert second == first
+    assert server.not_modified == 1
+    assert server.rate_remaining == remaining  # Revalidation was free
+
+
+def test_retries_after_rate_limit_response(server):
+    slept = []
+    client = _client(server, sleep=slept.append)
+    server.fail_next(429, {"Retry-After": "2"})
+    client.post_issue_comment("o/r", 1, "hello")
+
+    assert slept == [2.0]
+    assert len(server.comments) == 1
+
+
+def test_post_is_not_replayed_after_server_error(server):
+    client = _client(server)
+    server.fail_next(502)
+    with pytest.raises(GitPlatformError) as excinfo:
+        client.create_pull_request("o", "r", "fix-1", "main", "Fix", "body")
+
+    assert excinfo.value.status_code == 502
+    assert server.total_requests() == 1  # Sent once; GitHub may already have opened the PR
+
+    client.create_pull_request("o", "r", "fix-1", "main", "Fix", "body")
+    server.fail_next(503)
+    assert client.get_pull_request("o", "r", 1)["number"] == 1  # Reads still retry
+    assert server.total_requests() == 4
+
+
+def test_non_retryable_error_raises(server):
+    client = GitPlatformClient(base_url=server.url, token="wrong", sleep=lambda s: None)
+    with pytest.raises(GitPlatformError) as excinfo:
+        client.post_issue_comment("o/r", 1, "hello")
+    assert excinfo.value.status_code == 401
+
+
+def test_pull_request_lookups_are_batched_into_graphql(server):
+    client = _client(server)
+    for i in range(25):
+        client.create_pull_request("o", "r", f"fix-{i}", "main", f"Fix {i}", "")
+    before = server.total_requests()
+
+    prs = client.get_pull_requests("o", "r", list(range(1, 27)), batch_size=10)
+
+    assert server.total_requests() - before == 3
+    assert prs[7]["title"] == "Fix 6" and prs[26] is None
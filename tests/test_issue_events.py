@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.issues_router import router
+from scripts import platform_data_api
+from scripts.issue_events import IssueEventBus
+
+
+def test_bus_filters_and_replays_events_across_threads():
+    bus = IssueEventBus()
+
+    async def scenario():
+        by_issue = bus.subscribe(issue_ids=["A"])
+        by_status = bus.subscribe(statuses=["Fixed"])
+        publisher = threading.Thread(target=lambda: [
+            bus.publish("A", "Diagnosing"), bus.publish("B", "Fixed"), bus.publish("A", "Fixed"),
+        ])
+        publisher.start()
+        publisher.join()
+
+        issue_events = [await by_issue.get(1) for _ in range(2)]
+        status_events = [await by_status.get(1) for _ in range(2)]
+        resumed = bus.subscribe(issue_ids=["A"], last_event_id=issue_events[0].id)
+        replayed = await resumed.get(1)
+        for subscription in (by_issue, by_status, resumed):
+            subscription.close()
+        return issue_events, status_events, replayed
+
+    issue_events, status_events, replayed = asyncio.run(scenario())
+    assert [(e.issue_id, e.status) for e in issue_events] == [("A", "Diagnosing"), ("A", "Fixed")]
+    assert [(e.issue_id, e.status) for e in status_events] == [("B", "Fixed"), ("A", "Fixed")]
+    assert replayed == issue_events[1]
+    assert bus.subscriber_count == 0
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_long_poll_returns_on_change_or_304():
+    platform_data_api.update_issue_status("LP-1", "Triaged")
+    client = _client()
+    first = client.get("/issues/LP-1/status")
+    etag = first.headers["ETag"]
+    assert first.json()["status"] == "Triaged"
+
+    unchanged = client.get("/issues/LP-1/status", params={"wait": 0.1}, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    timer = threading.Timer(0.2, platform_data_api.update_issue_status, ("LP-1", "Patch Suggested"))
+    timer.start()
+    changed = client.get("/issues/LP-1/status", params={"wait": 5}, headers={"If-None-Match": etag})
+    timer.join()
+    assert changed.status_code == 200 and changed.json()["status"] == "Patch Suggested"
+    assert changed.headers["ETag"] != etag
+
+
+def test_websocket_pushes_snapshot_then_matching_changes():
+    platform_data_api.update_issue_status("WS-1", "Triaged")
+    with _client().websocket_connect("/issues/events/ws?issue_id=WS-1") as websocket:
+        assert websocket.receive_json()["status"] == "Triaged"
+        platform_data_api.update_issue_status("WS-2", "Diagnosing")  # Not subscribed
+        platform_data_api.update_issue_status("WS-1", "Validated")
+        message = websocket.receive_json()
+    assert message["type"] == "status"
+    assert (message["issue_id"], message["status"]) == ("WS-1", "Validated")
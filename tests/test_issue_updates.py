@@ -0,0 +1,53 @@
+import pytest
+
+from scripts import platform_data_api
+from scripts.issue_events import get_issue_event_bus
+from scripts.mock_db import db
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    calls = []
+    write = platform_data_api._write_issue
+
+    def counting_write(issue_id, fields, *args):
+        calls.append((issue_id, dict(fields)))
+        return write(issue_id, fields, *args)
+
+    monkeypatch.setattr(platform_data_api, "_write_issue", counting_write)
+    return calls
+
+
+def test_stage_commits_fields_and_transitions_in_one_write(writes):
+    events_before = len(get_issue_event_bus().recent())
+    transitions_before = platform_data_api.get_autonomous_fix_metrics()["status_transitions"]
+    with platform_data_api.issue_update("UOW-1") as update:
+        platform_data_api.store_diagnosis("UOW-1", {"root_cause": "off by one"})
+        platform_data_api.update_issue_status("UOW-1", "Patch Suggestion in Progress")
+        update.set(assignee="bot")
+        assert writes == []
+
+    assert len(writes) == 1
+    issue = db["UOW-1"]
+    assert issue["status"] == "Patch Suggestion in Progress"
+    assert issue["diagnosis"] == {"root_cause": "off by one"} and issue["assignee"] == "bot"
+    # Intermediate transitions still reach the metrics; subscribers only see where the issue ended up
+    assert platform_data_api.get_autonomous_fix_metrics()["status_transitions"] == transitions_before + 2
+    assert [e.status for e in get_issue_event_bus().recent()[events_before:]] == ["Patch Suggestion in Progress"]
+
+
+def test_nested_blocks_join_and_errors_discard_staged_writes(writes):
+    with platform_data_api.issue_update("UOW-2"):
+        with platform_data_api.issue_update("UOW-2"):
+            platform_data_api.update_issue_status("UOW-2", "Fetching Details")
+        platform_data_api.update_issue_status("UOW-2", "Diagnosis in Progress")
+    assert [fields["status"] for _, fields in writes] == ["Diagnosis in Progress"]
+
+    with pytest.raises(RuntimeError):
+        with platform_data_api.issue_update("UOW-2"):
+            platform_data_api.update_issue_status("UOW-2", "Patch Validated")
+            raise RuntimeError("validation crashed")
+    assert db["UOW-2"]["status"] == "Diagnosis in Progress"
+
+    platform_data_api.update_issue_status("UOW-2", "Patch Validation Error")  # Outside a block: written at once
+    assert len(writes) == 2
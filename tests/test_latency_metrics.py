@@ -0,0 +1,34 @@
+import pytest
+
+from scripts.latency_metrics import Histogram, MetricsRegistry, git_subcommand
+
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Stage duration.", ("stage", "outcome"), buckets=(0.1, 1))
+    histogram.observe(0.05, stage="diagnosis", outcome="ok")
+    histogram.observe(0.5, stage="diagnosis", outcome="ok")
+    with pytest.raises(RuntimeError):
+        with histogram.time(stage="validation"):
+            raise RuntimeError("boom")
+
+    text = registry.render()
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="diagnosis",outcome="ok",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="diagnosis",outcome="ok",le="1.0"} 2' in text
+    assert 'stage_seconds_bucket{stage="diagnosis",outcome="ok",le="+Inf"} 2' in text
+    assert 'stage_seconds_count{stage="validation",outcome="error"} 1' in text
+
+
+def test_label_cardinality_is_capped():
+    histogram = Histogram("git_seconds", "Git duration.", ("subcommand",), max_series=3)
+    for i in range(10):
+        histogram.observe(0.01, subcommand=f"verb{i}")
+    series = histogram.snapshot()
+    assert len(series) == 4
+    assert series[("other",)][2] == 7
+
+
+def test_git_subcommand_skips_options():
+    assert git_subcommand(["git", "--no-pager", "log", "-1"]) == "log"
+    assert git_subcommand(["/usr/bin/git", "clone", "--depth", "1", "url"]) == "clone"
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry
+
+
+def _app():
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    registry.register("issues", "app.api.issues_router", paths=("/issues",))
+    registry.register("broken", "app.api.does_not_exist", prefix="/broken")
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    return app, registry
+
+
+def test_routers_load_on_first_matching_request():
+    app, registry = _app()
+    client = TestClient(app)
+
+    assert client.get("/health").status_code == 200
+    assert registry.pending() == ["issues", "broken"]
+
+    assert client.get("/issues/LAZY-1/status").json()["status"] == "Not Found"
+    assert registry.pending() == ["broken"]
+
+    # A router that fails to import is reported, not retried, and doesn't break the app
+    assert client.get("/broken/x").status_code == 404
+    report = {row["name"]: row for row in registry.report()}
+    assert report["issues"]["loaded"] and report["issues"]["import_ms"] is not None
+    assert report["broken"]["error"].startswith("ModuleNotFoundError")
+    assert registry.pending() == []
+
+
+def test_docs_load_every_router():
+    app, registry = _app()
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+    assert "/issues/{issue_id}/status" in paths
+    assert registry.pending() == []
+
+
+def test_app_import_skips_heavy_modules():
+    heavy = ["openai", "speech_recognition", "google.generativeai", "scripts.platform_data_api", "app.api.voice"]
+    code = f"import sys, app.main; print([m for m in {heavy!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_warm_up_ignores_unknown_router_names():
+    app, registry = _app()
+    assert registry.warm_up("metric") is None
+    assert registry.pending() == ["issues", "broken"]
+
+    registry.load_all([])
+    assert registry.pending() == ["issues", "broken"]
+
+    registry.warm_up("metric, issues").join(10)
+    assert registry.pending() == ["broken"]
@@ -0,0 +1,65 @@
+import pytest
+
+from scripts.lint_service import PYFLAKES_CODES, LintService, load_lint_config
+
+
+class CountingLinter:
+    name = "fake-1"
+
+    def __init__(self):
+        self.calls = []
+
+    def lint(self, source, filename, config):
+        self.calls.append(filename)
+        return [f"{filename}:1:1: X100 too long"] if len(source) > config["max_line_length"] else []
+
+
+def test_results_are_cached_by_content_tool_and_config(tmp_path):
+    linter = CountingLinter()
+    service = LintService(linter=linter, disk_dir=str(tmp_path / "cache"))
+    long_source = "x = '" + "a" * 100 + "'\n"
+
+    assert service.lint_source(long_source, "a.py") == ["a.py:1:1: X100 too long"]
+    assert service.lint_source(long_source, "a.py") == ["a.py:1:1: X100 too long"]
+    assert len(linter.calls) == 1
+
+    # A different config is a different cache entry
+    relaxed = dict(load_lint_config(None), max_line_length=200)
+    assert service.lint_source(long_source, "a.py", relaxed) == []
+    assert len(linter.calls) == 2
+
+    # The disk tier survives a restart
+    restarted = LintService(linter=CountingLinter(), disk_dir=str(tmp_path / "cache"))
+    assert restarted.lint_source(long_source, "a.py") == ["a.py:1:1: X100 too long"]
+    assert restarted.linter.calls == []
+
+
+def test_lint_diff_only_lints_changed_python_files(tmp_path):
+    (tmp_path / "setup.cfg").write_text("[flake8]\nmax-line-length = 120\nextend-ignore = E203\n")
+    (tmp_path / "changed.py").write_text("x = 1\n")
+    (tmp_path / "untouched.py").write_text("y = 2\n")
+    (tmp_path / "notes.md").write_text("text\n")
+    diff = "--- a/changed.py\n+++ b/changed.py\n@@ -0,0 +1 @@\n+x = 1\n--- a/notes.md\n+++ b/notes.md\n"
+
+    linter = CountingLinter()
+    results = LintService(linter=linter, disk_dir=None).lint_diff(str(tmp_path), diff)
+
+    assert results == {"changed.py": []}
+    assert linter.calls == ["changed.py"]
+    config = load_lint_config(str(tmp_path))
+    assert config["max_line_length"] == 120 and "E203" in config["ignore"]
+
+
+def test_in_process_linter_matches_flake8_format():
+    pytest.importorskip("pyflakes")
+    pytest.importorskip("pycodestyle")
+    from scripts.lint_service import InProcessFlake8
+
+    findings = InProcessFlake8().lint("import os\nx=1  # noqa: E225\n", "p.py", load_lint_config(None))
+    assert findings == ["p.py:1:1: F401 'os' imported but unused"]  # From the embedded code table
+
+
+def test_embedded_pyflakes_codes_match_flake8():
+    plugin = pytest.importorskip("flake8.plugins.pyflakes")
+    shared = PYFLAKES_CODES.keys() & plugin.FLAKE8_PYFLAKES_CODES.keys()
+    assert shared and all(PYFLAKES_CODES[name] == plugin.FLAKE8_PYFLAKES_CODES[name] for name in shared)
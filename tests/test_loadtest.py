@@ -0,0 +1,75 @@
+import importlib.util
+import json
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from scripts.fake_llm_server import FakeLLMServer
+from scripts.loadtest import (DEFAULT_SCENARIOS, ScenarioUnavailable, gate_failures, percentile, run_loadtest,
+                              split_runnable, summarize)
+
+
+def _chat(url, prompt, **extra):
+    return httpx.post(url + "/v1/chat/completions", timeout=10,
+                      json={"model": "gpt-4o", "messages": [{"role": "user", "content": prompt}], **extra})
+
+
+def test_fake_llm_is_deterministic_task_aware_and_paced():
+    with FakeLLMServer(first_token_seconds=0.1, tokens_per_second=100) as llm:
+        started = time.monotonic()
+        first = _chat(llm.url, 'Provide a JSON with: "root_cause_summary"').json()
+        elapsed = time.monotonic() - started
+        again = _chat(llm.url, 'Provide a JSON with: "root_cause_summary"').json()
+
+        reply = first["choices"][0]["message"]["content"]
+        assert reply == again["choices"][0]["message"]["content"]
+        assert json.loads(reply)["relevant_files"] == ["service.py"]
+        assert elapsed >= 0.1 + first["usage"]["completion_tokens"] / 100
+        assert llm.stats()["requests"] == 2
+
+        with httpx.stream("POST", llm.url + "/v1/chat/completions", timeout=10, json={
+                "messages": [{"role": "user", "content": "You are a QA agent reviewing a patch."}], "stream": True}) as r:
+            events = [line[len("data: "):] for line in r.iter_lines() if line.startswith("data: ")]
+        assert events[-1] == "[DONE]"
+        streamed = "".join(json.loads(e)["choices"][0]["delta"].get("content", "") for e in events[:-1])
+        assert streamed == llm.reply_for("You are a QA agent reviewing a patch.")
+
+
+def test_summary_percentiles_and_gates():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([0.1] * 99 + [2.0], 99) == pytest.approx(0.119)
+    result = summarize([i / 1000 for i in range(1, 101)], Counter({"HTTP 500": 2}), elapsed=2.0)
+    assert (result["requests"], result["throughput_rps"], result["error_rate"]) == (100, 50.0, 0.02)
+    assert result["p50_ms"] == 50.5 and result["p99_ms"] == 99.0
+
+    report = {"scenarios": {"qa": result}}
+    assert gate_failures(report, max_p95_ms=200, max_error_rate=0.05) == []
+    assert gate_failures(report, max_p95_ms=50, max_error_rate=0.01, min_rps=100) == [
+        f"qa: p95 {result['p95_ms']}ms > 50ms", "qa: error rate 2.00% > 1.00%", "qa: 50.0 req/s < 100 req/s"]
+
+
+def test_scenarios_whose_router_failed_are_skipped_by_default_but_fail_when_requested():
+    errors = {"autonomous": "ModuleNotFoundError: No module named 'x'"}
+    runnable, skipped = split_runnable(DEFAULT_SCENARIOS, errors, explicit=False)
+    assert "workflow" not in runnable and "analyze" in runnable
+    assert set(skipped) == {"ingest", "workflow"} and "No module named 'x'" in skipped["workflow"]
+
+    with pytest.raises(ScenarioUnavailable, match="workflow"):
+        split_runnable(["workflow", "qa"], errors, explicit=True)
+    with pytest.raises(ScenarioUnavailable):
+        split_runnable(["ingest"], errors, explicit=False)
+    assert split_runnable(["qa"], {}, explicit=True) == (["qa"], {})
+
+
+def test_loadtest_drives_the_running_api_offline():
+    report = run_loadtest(scenarios=["analyze", "voice"], requests=6, concurrency=3, warmup=1,
+                          first_token_seconds=0.0, tokens_per_second=0.0)
+
+    for name in ("analyze", "voice"):
+        assert report["scenarios"][name]["requests"] == 6
+        assert report["scenarios"][name]["p99_ms"] >= report["scenarios"][name]["p50_ms"] > 0
+    if importlib.util.find_spec("openai"):
+        assert report["scenarios"]["analyze"]["errors"] == 0
+        assert report["llm"]["requests"] == 14
@@ -0,0 +1,51 @@
+import json
+import logging
+
+from scripts.utils import logger as log
+
+
+def _record(msg, *args, level=logging.INFO, name="test"):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_records_are_written_as_json_by_the_background_writer(capsys, monkeypatch):
+    monkeypatch.setattr(log, "LOG_LEVELS", "test_logger.json=DEBUG")
+    logger = log.setup_logger("test_logger.json", level=logging.WARNING)
+    assert logger.level == logging.DEBUG  # LOG_LEVELS wins over the caller's level
+
+    logger.debug("Fetched %s files", 3, extra={"issue_id": "I-7"})
+    logger.info("🤖 Running AI assessment")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Clone failed for %s", "repo")
+    log.flush_logs()
+
+    raw = [line for line in capsys.readouterr().out.splitlines() if "test_logger.json" in line]
+    assert '"msg": "🤖 Running AI assessment"' in raw[1]  # Not \ud83e\udd16-escaped
+    lines = [json.loads(line) for line in raw]
+    assert lines[0]["msg"] == "Fetched 3 files"
+    assert lines[0]["level"] == "DEBUG"
+    assert lines[0]["issue_id"] == "I-7"
+    assert lines[2]["level"] == "ERROR"
+    assert "ValueError: boom" in lines[2]["exc"]
+
+
+def test_sampling_drops_repeats_per_template_but_never_warnings():
+    sampler = log.SamplingFilter(burst=2, window_seconds=60)
+    passed = [sampler.filter(_record("Executing git %s", verb)) for verb in ("fetch", "show", "diff", "log")]
+    assert passed == [True, True, False, False]
+    assert sampler.filter(_record("Other template"))
+    assert sampler.filter(_record("Executing git %s", "push", level=logging.WARNING))
+
+    sampler.window_seconds = 0
+    record = _record("Executing git %s", "fetch")
+    assert sampler.filter(record)
+    assert record.sampled_out == 2
+
+
+def test_parse_levels():
+    assert log.parse_levels("platform_data_api=warning, agent_review_pr=DEBUG,,bad") == {
+        "platform_data_api": logging.WARNING,
+        "agent_review_pr": logging.DEBUG,
+    }
@@ -0,0 +1,86 @@
+import subprocess
+
+import pytest
+
+from scripts.patch_engine import GIT_APPLY_FUZZ, PatchParseError, apply_patch, check_patch, parse_unified_diff
+
+ORIGINAL = "".join(f"line {i}\n" for i in range(1, 21))
+
+DIFF = """--- a/app.py
++++ b/app.py
+@@ -3,5 +3,5 @@ def context():
+ line 3
+ line 4
+-line 5
++line five
+ line 6
+ line 7
+@@ -15,3 +15,4 @@
+ line 15
++inserted
+ line 16
+ line 17
+"""
+
+
+def test_applies_with_offset_when_file_has_drifted():
+    drifted = "header\nheader\n" + ORIGINAL
+    result = apply_patch(DIFF, {"app.py": drifted})
+
+    assert result.ok
+    assert [h.offset for h in result.files[0].hunks] == [2, 2]
+    content = result.files[0].content
+    assert "line five\n" in content and "line 5\n" not in content
+    assert content.index("inserted") == content.index("line 15\n") + len("line 15\n")
+
+
+def test_fuzz_tolerates_changed_outer_context():
+    changed = ORIGINAL.replace("line 3\n", "line three\n")
+    assert not apply_patch(DIFF, {"app.py": changed}, fuzz=0).ok
+
+    result = apply_patch(DIFF, {"app.py": changed}, fuzz=1)
+    assert result.ok and result.files[0].hunks[0].fuzz == 1
+
+
+def test_reports_failing_hunk_without_raising():
+    broken = ORIGINAL.replace("line 5\n", "something else\n")
+    result = check_patch(DIFF, {"app.py": broken})
+
+    assert not result.ok
+    assert [h["hunk"] for h in result.failed_hunks] == [0]
+    assert result.files[0].content is None  # Dry run
+
+
+def test_new_and_missing_files():
+    new_file = "--- /dev/null\n+++ b/new.py\n@@ -0,0 +1,2 @@\n+a = 1\n+b = 2\n"
+    result = apply_patch(new_file, lambda path: None)
+    assert result.ok and result.files[0].content == "a = 1\nb = 2\n"
+
+    assert not apply_patch(DIFF, lambda path: None).ok
+
+
+def test_miscounted_hunk_is_malformed_unless_recounting():
+    miscounted = DIFF.replace("@@ -3,5 +3,5 @@", "@@ -3,7 +3,7 @@")
+    with pytest.raises(PatchParseError):
+        parse_unified_diff(miscounted)
+    assert not check_patch(miscounted).ok
+    assert apply_patch(miscounted, {"app.py": ORIGINAL}, recount=True).ok
+
+
+def test_git_apply_fuzz_rejects_what_git_apply_rejects(tmp_path):
+    changed = ORIGINAL.replace("line 3\n", "line three\n")  # First context line no longer matches
+    (tmp_path / "app.py").write_text(changed)
+    (tmp_path / "fix.diff").write_text(DIFF)
+    git_apply = subprocess.run(["git", "apply", "--check", "fix.diff"], cwd=tmp_path, capture_output=True)
+
+    assert git_apply.returncode != 0
+    assert check_patch(DIFF, {"app.py": changed}).ok
+    assert not check_patch(DIFF, {"app.py": changed}, fuzz=GIT_APPLY_FUZZ).ok
+
+
+def test_workflow_precheck_is_as_strict_as_git_apply(monkeypatch):
+    workflow = pytest.importorskip("scripts.run_autonomous_workflow")
+    changed = ORIGINAL.replace("line 3\n", "line three\n")
+    monkeypatch.setattr(workflow.platform_data_api, "fetch_file_contents", lambda *a, **kw: {"app.py": changed})
+
+    assert not workflow.precheck_patch(DIFF, {"repository_url": "https://example.com/o/r.git"}).ok
@@ -0,0 +1,78 @@
+import asyncio
+import subprocess
+import time
+
+import pytest
+
+from scripts import async_bridge, platform_data_api, platform_data_api_async
+
+
+@pytest.fixture
+def repo(tmp_path):
+    subprocess.run(["git", "init", "-q", "-b", "main", str(tmp_path)], check=True)
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@t",
+                    "commit", "-qm", "init"], check=True)
+    return tmp_path
+
+
+def test_git_calls_run_concurrently_on_the_event_loop(repo):
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticking = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(
+            platform_data_api_async.run_git_command(["git", "show", "HEAD:app.py"], str(repo)) for _ in range(5)
+        ))
+        ticking.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(main())
+    assert results == [(0, "print('hi')\n", "")] * 5
+    assert ticks > 0  # The loop kept running while git did
+
+
+def test_sync_wrappers_run_on_the_bridge_and_keep_the_callers_context(repo):
+    with platform_data_api.issue_update("ASYNC-1") as update:
+        code, stdout, _ = platform_data_api.run_git_command(["git", "rev-parse", "HEAD"], str(repo))
+        async_bridge.run_sync(platform_data_api_async.update_issue_status("ASYNC-1", "Diagnosis in Progress"))
+        assert update.statuses == ["Diagnosis in Progress"]  # Joined the caller's unit of work
+    assert code == 0 and len(stdout.strip()) == 40
+    assert platform_data_api.fetch_issue_details("ASYNC-1")["status"] == "Diagnosis in Progress"
+
+    async def from_the_bridge():
+        return async_bridge.run_sync(platform_data_api_async.fetch_issue_details("ASYNC-1"))
+
+    with pytest.raises(RuntimeError):
+        async_bridge.run_sync(from_the_bridge())
+
+
+def test_shared_store_calls_do_not_block_the_event_loop(monkeypatch):
+    # The shared SQLite store can wait on another worker's write lock
+    monkeypatch.setattr(platform_data_api_async.shared_state, "enabled", lambda: True)
+    monkeypatch.setattr(platform_data_api, "fetch_issue_details", lambda issue_id: time.sleep(0.2) or {"id": issue_id})
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticking = asyncio.create_task(ticker())
+        issue = await platform_data_api_async.fetch_issue_details("ISSUE-1")
+        ticking.cancel()
+        return issue, ticks
+
+    issue, ticks = asyncio.run(main())
+    assert issue == {"id": "ISSUE-1"}
+    assert ticks > 10
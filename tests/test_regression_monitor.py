@@ -0,0 +1,30 @@
+import json
+
+from scripts import regression_monitor
+
+
+def _write_benchmark(path, latency_ms):
+    path.write_text(f"import json\nprint(json.dumps({{'latency_ms': {latency_ms}}}))\n")
+    return str(path)
+
+def test_interleave_runs_is_abab():
+    schedule = regression_monitor.interleave_runs("a.py", "b.py", 2)
+    assert [side for side, _, _ in schedule] == ["before", "after", "before", "after"]
+
+def test_aggregate_metrics_uses_median():
+    runs = [{"latency_ms": 10, "note": "x"}, {"latency_ms": 30, "note": "y"}, {"latency_ms": 12, "note": "z"}]
+    assert regression_monitor.aggregate_metrics(runs) == {"latency_ms": 12, "note": "z"}
+
+def test_run_suite_reports_regression(tmp_path, monkeypatch):
+    report_file = tmp_path / "report.json"
+    monkeypatch.setattr(regression_monitor, "REPORT_FILE", str(report_file))
+    before = _write_benchmark(tmp_path / "before.py", 10)
+    after = _write_benchmark(tmp_path / "after.py", 20)
+
+    report = regression_monitor.run_suite(before, after, rounds=2, workers=2)
+
+    assert report["complete"] is True
+    assert report["runs_finished"] == 4
+    assert report["regressions"] == {"latency_ms": {"before": 10, "after": 20}}
+    # Partial results were streamed to the report file while the suite ran.
+    assert json.loads(report_file.read_text())["complete"] is False
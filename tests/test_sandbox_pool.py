@@ -0,0 +1,86 @@
+import os
+import subprocess
+import time
+
+from scripts.sandbox_pool import SandboxPool, declared_dependencies, lockfile_hash
+
+
+def _repo(tmp_path, requirements="# no dependencies\n"):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "requirements.txt").write_text(requirements)
+    return repo
+
+
+def test_lockfile_hash_changes_with_dependencies(tmp_path):
+    repo = _repo(tmp_path)
+    before = lockfile_hash(str(repo))
+    (repo / "requirements.txt").write_text("requests==2.31.0\n")
+    assert lockfile_hash(str(repo)) != before
+
+
+def test_leases_are_isolated_snapshots_of_one_template(tmp_path):
+    repo = _repo(tmp_path)
+    pool = SandboxPool(root=str(tmp_path / "sandboxes"), idle_per_key=1)
+    key = pool.prewarm(str(repo))
+    template_mtime = os.path.getmtime(os.path.join(pool._template_dir(key), ".ready"))
+
+    with pool.lease(str(repo)) as first:
+        assert first.key == key
+        out = subprocess.run([first.python, "-c", "import sys; print(sys.prefix)"], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == first.venv
+        # A job dirtying its sandbox must not leak into the next lease
+        open(os.path.join(first.path, "dirty"), "w").close()
+
+    deadline = time.monotonic() + 10
+    while not pool._idle.get(key) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    with pool.lease(str(repo)) as second:
+        assert second.path != first.path
+        assert not os.path.exists(os.path.join(second.path, "dirty"))
+
+    assert not os.path.exists(first.path)
+    assert os.path.getmtime(os.path.join(pool._template_dir(key), ".ready")) == template_mtime
+
+
+def test_clones_of_one_repository_share_a_template(tmp_path, monkeypatch):
+    from scripts import validate_proposed_patch
+
+    origin = _repo(tmp_path)
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(git + ["init", "-q", str(origin)], check=True)
+    subprocess.run(git + ["-C", str(origin), "add", "."], check=True)
+    subprocess.run(git + ["-C", str(origin), "commit", "-qm", "init"], check=True)
+    clones = [tmp_path / f"debugiq_repo_clone_{n}" for n in (1, 2)]
+    for clone in clones:
+        subprocess.run(["git", "clone", "-q", str(origin), str(clone)], check=True)
+
+    pool = SandboxPool(root=str(tmp_path / "sandboxes"), idle_per_key=0)
+    monkeypatch.setattr(validate_proposed_patch, "get_sandbox_pool", lambda: pool)
+    keys = []
+    for clone in clones:
+        results = {"timings": {}}
+        with validate_proposed_patch._dependency_sandbox(str(clone), results) as sandbox:
+            keys.append(sandbox.key)
+    assert keys[0] == keys[1]
+    assert sorted(os.listdir(pool.root)) == sorted(["pip-cache", keys[0]])
+
+
+def test_templates_get_declared_dependencies_but_never_the_project(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / "src" / "acmepkg").mkdir(parents=True)
+    (repo / "src" / "acmepkg" / "__init__.py").write_text("")
+    (repo / "pyproject.toml").write_text(
+        '[project]\nname = "acmepkg"\nversion = "1.0"\ndependencies = []\n'
+        '[project.optional-dependencies]\ndocs = ["sphinx"]\n'
+    )
+    (repo / "setup.cfg").write_text("[options]\ninstall_requires =\n    requests>=2\n\n"
+                                    "[options.extras_require]\ntest = pytest\n")
+    assert declared_dependencies(str(repo)) == ["requests>=2", "pytest"]
+
+    (repo / "setup.cfg").unlink()
+    pool = SandboxPool(root=str(tmp_path / "sandboxes"), idle_per_key=0)
+    with pool.lease(str(repo)) as sandbox:
+        found = subprocess.run([sandbox.python, "-c", "import acmepkg"], cwd=str(tmp_path), capture_output=True)
+    assert found.returncode != 0
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from scripts.fix_metrics import FixMetrics
+from scripts.issue_events import IssueEventBus
+from scripts.latency_metrics import MetricsRegistry
+from scripts.shared_state import SharedStateDB, SQLiteIssueStore, TransitionFeed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = textwrap.dedent("""
+    from scripts import platform_data_api
+    with platform_data_api.issue_update("MW-1"):
+        platform_data_api.update_issue_status("MW-1", "Fetching Details")
+        platform_data_api.update_issue_status("MW-1", "Diagnosis in Progress")
+    print(platform_data_api.create_new_issue({"summary": "from another worker"}))
+""")
+
+
+def test_another_process_sees_issues_transitions_and_events(tmp_path):
+    path = str(tmp_path / "state.db")
+    worker = subprocess.run([sys.executable, "-c", WORKER], cwd=ROOT, capture_output=True, text=True, check=True,
+                            env={**os.environ, "SHARED_STATE_DB": path, "LOG_LEVEL": "WARNING"})
+    created_id = worker.stdout.strip()
+
+    store = SQLiteIssueStore(SharedStateDB(path))
+    assert store["MW-1"]["status"] == "Diagnosis in Progress"
+    assert store[created_id]["summary"] == "from another worker" and store[created_id]["status"] == "New"
+
+    metrics, bus = FixMetrics(), IssueEventBus()
+    feed = TransitionFeed(store.database, metrics, bus)
+    feed.catch_up()
+    summary = metrics.summary()
+    assert summary["status_transitions"] == 2 and summary["in_progress"] == 1
+    (event,) = bus.recent()
+    assert (event.issue_id, event.status, event.id) == ("MW-1", "Diagnosis in Progress", feed.cursor)
+
+    # Transitions this process writes itself are not fed back to it
+    store.update_issue("MW-1", {}, ["Patch Validated"])
+    own = TransitionFeed(store.database, FixMetrics(), IssueEventBus())
+    own.catch_up()
+    assert feed.poll() == 0
+    assert own.metrics.summary()["status_transitions"] == 2
+
+
+def test_metrics_render_sums_worker_exports():
+    workers = []
+    for seconds in (0.2, 3.0):
+        registry = MetricsRegistry()
+        registry.histogram("git_seconds", "Git.", ("subcommand",)).observe(seconds, subcommand="fetch")
+        workers.append(registry)
+
+    text = workers[0].render([worker.export() for worker in workers])
+    assert 'git_seconds_count{subcommand="fetch"} 2' in text
+    assert 'git_seconds_bucket{subcommand="fetch",le="0.25"} 1' in text
+    assert "git_seconds_sum{subcommand=\"fetch\"} 3.2" in text
@@ -0,0 +1,52 @@
+import os
+import time
+
+from scripts.utils.speech_cache import SpeechCache
+
+
+def test_cached_phrase_skips_synthesis(tmp_path):
+    calls = []
+    def synthesize(text):
+        calls.append(text)
+        return text.encode()
+
+    cache = SpeechCache(disk_dir=str(tmp_path))
+    assert cache.get_or_synthesize("Build  passed.", synthesize, voice="v", encoding="wav") == b"Build  passed."
+    # Whitespace differences normalize to the same entry
+    assert cache.get_or_synthesize(" Build passed. ", synthesize, voice="v", encoding="wav") == b"Build  passed."
+    assert calls == ["Build  passed."]
+    # Different voice settings are cached separately
+    cache.get_or_synthesize("Build passed.", synthesize, voice="other", encoding="wav")
+    assert len(calls) == 2
+
+def test_lru_eviction_falls_back_to_disk(tmp_path):
+    cache = SpeechCache(max_memory_bytes=8, disk_dir=str(tmp_path))
+    cache.put("a", "v", "wav", b"aaaaa")
+    cache.put("b", "v", "wav", b"bbbbb")  # Evicts "a" from memory
+    assert cache.make_key("a", "v", "wav") not in cache._memory
+    assert cache.get("a", "v", "wav") == b"aaaaa"
+
+    memory_only = SpeechCache(max_memory_bytes=8, disk_dir="")
+    memory_only.put("a", "v", "wav", b"aaaaa")
+    memory_only.put("b", "v", "wav", b"bbbbb")
+    assert memory_only.get("a", "v", "wav") is None
+
+def test_prewarm_only_synthesizes_missing(tmp_path):
+    cache = SpeechCache(disk_dir=str(tmp_path))
+    cache.put("Deploy started.", "v", "wav", b"cached")
+    assert cache.prewarm(["Deploy started.", "Rollback complete."], lambda t: t.encode(), "v", "wav") == 1
+    assert cache.get("Rollback complete.", "v", "wav") == b"Rollback complete."
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = SpeechCache(max_memory_bytes=0, disk_dir=str(tmp_path), max_disk_bytes=12)
+    cache.put("a", "v", "wav", b"aaaaa")
+    cache.put("b", "v", "wav", b"bbbbb")
+    now = time.time()
+    os.utime(cache._disk_path(cache.make_key("a", "v", "wav")), (now - 20, now - 20))
+    os.utime(cache._disk_path(cache.make_key("b", "v", "wav")), (now - 10, now - 10))
+    assert cache.get("a", "v", "wav") == b"aaaaa"  # A hit makes "a" the most recently used
+
+    cache.put("c", "v", "wav", b"ccccc")
+    assert cache.get("b", "v", "wav") is None
+    assert cache.get("a", "v", "wav") == b"aaaaa" and cache.get("c", "v", "wav") == b"ccccc"
+    assert sum(size for _, size, _ in cache._disk_entries()) == 10
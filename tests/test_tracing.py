@@ -0,0 +1,76 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts import tracing
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    previous = tracing.get_tracer()
+    tracer = tracing.Tracer(tracing.BatchSpanProcessor(tracing.FileSpanExporter(str(path)), flush_seconds=60))
+    tracing.set_tracer(tracer)
+    yield path
+    tracing.set_tracer(previous)
+
+
+def _spans(path):
+    assert tracing.get_tracer().flush()
+    return {s["name"]: s for s in map(json.loads, path.read_text().splitlines())}
+
+
+def test_child_spans_follow_context_into_thread_pools(export_path):
+    with tracing.span("workflow", {"issue.id": "I-1"}, root=True):
+        with tracing.span("workflow.diagnosis"):
+            tracing.current_span().set_attribute("llm.prompt_chars", 120)
+
+        def check(name):
+            with tracing.span(f"validation.{name}"):
+                return name
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(tracing.wrap(check), ["lint", "tests"]))
+
+    spans = _spans(export_path)
+    root = spans["workflow"]
+    assert "parentSpanId" not in root
+    assert {"key": "issue.id", "value": {"stringValue": "I-1"}} in root["attributes"]
+    for name in ("workflow.diagnosis", "validation.lint", "validation.tests"):
+        assert spans[name]["traceId"] == root["traceId"]
+        assert spans[name]["parentSpanId"] == root["spanId"]
+    assert {"key": "llm.prompt_chars", "value": {"intValue": "120"}} in spans["workflow.diagnosis"]["attributes"]
+
+
+def test_errors_mark_span_and_report_ranks_by_tail(export_path):
+    with pytest.raises(ValueError):
+        with tracing.span("git.clone"):
+            raise ValueError("no such repo")
+    with tracing.span("git.show"):
+        pass
+
+    spans = _spans(export_path)
+    assert spans["git.clone"]["status"] == {"code": 2, "message": "ValueError: no such repo"}
+    assert {row["name"] for row in tracing.report(str(export_path))} == {"git.clone", "git.show"}
+
+
+def test_disabled_tracer_is_a_noop():
+    tracer = tracing.Tracer()
+    with tracer.span("anything") as span:
+        span.set_attribute("ignored", 1)
+    assert span is tracing.NOOP_SPAN
+
+
+def test_failed_exports_are_counted_as_dropped():
+    class FailingExporter:
+        def export(self, spans):
+            raise ConnectionError("collector down")
+
+    processor = tracing.BatchSpanProcessor(FailingExporter(), flush_seconds=60)
+    tracer = tracing.Tracer(processor)
+    for name in ("a", "b", "c"):
+        with tracer.span(name):
+            pass
+    assert processor.flush()
+    assert processor.dropped == 3
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from app.services.tts_pool import TTSEnginePool, TTSPoolBusy
+
+
+class FakeEngine:
+    instances = 0
+
+    def __init__(self, block=None):
+        FakeEngine.instances += 1
+        self._block = block
+        self._pending = None
+
+    def save_to_file(self, text, path):
+        self._pending = (text, path)
+
+    def runAndWait(self):
+        if self._block:
+            self._block.wait()
+        text, path = self._pending
+        with open(path, "wb") as f:
+            f.write(b"RIFF" + text.encode())
+
+
+def test_engines_are_reused_across_requests(tmp_path):
+    FakeEngine.instances = 0
+    pool = TTSEnginePool(workers=1, engine_factory=FakeEngine, scratch_dir=str(tmp_path))
+    try:
+        assert pool.synthesize("hello") == b"RIFFhello"
+        assert pool.synthesize("again") == b"RIFFagain"
+        assert FakeEngine.instances == 1
+    finally:
+        pool.shutdown()
+    assert list(tmp_path.iterdir()) == []
+
+def test_full_queue_and_timeout(tmp_path):
+    release = threading.Event()
+    pool = TTSEnginePool(workers=1, queue_size=1, engine_factory=lambda: FakeEngine(block=release), scratch_dir=str(tmp_path))
+    try:
+        with pytest.raises(TimeoutError):
+            pool.synthesize("slow", timeout=0.2)  # Worker is now stuck on this job
+        with pytest.raises(TimeoutError):
+            pool.synthesize("queued", timeout=0.1)  # Fills the single queue slot
+        with pytest.raises(TTSPoolBusy):
+            pool.synthesize("rejected", timeout=0.1)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_default_factory_gives_each_worker_its_own_engine():
+    pytest.importorskip("pyttsx3")
+    from app.services.tts_pool import _default_engine_factory
+    try:
+        first, second = _default_engine_factory(), _default_engine_factory()
+    except (RuntimeError, OSError, ImportError) as e:
+        pytest.skip(f"No speech driver available: {e}")
+    assert first is not second
+    assert first.proxy is not second.proxy
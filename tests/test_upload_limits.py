@@ -0,0 +1,34 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.utils.upload_limits import UploadSizeLimitMiddleware
+
+
+def _client(max_bytes):
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=max_bytes, path_prefixes=("/voice",))
+
+    @app.post("/voice/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return TestClient(app)
+
+def test_upload_within_limit_is_accepted():
+    response = _client(4096).post("/voice/upload", files={"file": ("a.wav", b"x" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+def test_oversized_upload_is_rejected():
+    response = _client(1024).post("/voice/upload", files={"file": ("a.wav", b"x" * 4096)})
+    assert response.status_code == 413
+
+def test_streamed_upload_is_cut_off_without_content_length():
+    def body():
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.wav"\r\n\r\n'
+        for _ in range(8):
+            yield b"x" * 512
+        yield b"\r\n--b--\r\n"
+
+    response = _client(1024).post("/voice/upload", content=body(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
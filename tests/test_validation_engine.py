@@ -0,0 +1,62 @@
+import subprocess
+import sys
+import time
+
+from scripts import validation_engine
+from scripts.validate_proposed_patch import validate_patch
+from scripts.validation_engine import CheckSpec
+
+
+def _git_repo(path):
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    (path / "calc.py").write_text("def add(a, b):\n    return a - b\n")
+    (path / "tests").mkdir()
+    (path / "tests" / "test_calc.py").write_text("from calc import add\n\ndef test_add():\n    assert add(1, 2) == 3\n")
+    subprocess.run(["git", "add", "-A"], cwd=path, check=True)
+    subprocess.run(["git", "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "init"], cwd=path, check=True)
+    return str(path)
+
+FIX = """--- a/calc.py
++++ b/calc.py
+@@ -1,2 +1,2 @@
+ def add(a, b):
+-    return a - b
++    return a + b
+"""
+
+def test_blocking_failure_cancels_other_checks(tmp_path):
+    checks = [
+        CheckSpec("fails fast", [sys.executable, "-c", "import sys; sys.exit(1)"]),
+        CheckSpec("slow", [sys.executable, "-c", "import time; time.sleep(30)"]),
+    ]
+    started = time.monotonic()
+    results = validation_engine.run_checks(str(tmp_path), checks, workers=2)
+    assert time.monotonic() - started < 10
+    assert [r["status"] for r in results] == ["failed", "cancelled"]
+    assert all("duration_seconds" in r for r in results)
+
+def test_check_timeout(tmp_path):
+    results = validation_engine.run_checks(str(tmp_path), [CheckSpec("hang", [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.5)])
+    assert results[0]["status"] == "timeout"
+
+def test_validate_patch_in_worktree(tmp_path, monkeypatch):
+    monkeypatch.setattr(validation_engine, "VALIDATION_LINT_BLOCKING", False)
+    repo = _git_repo(tmp_path / "repo")
+
+    result = validate_patch("ISSUE-1", FIX, repo_path=repo)
+
+    statuses = {step["check"]: step["status"] for step in result["checks_run"]}
+    assert statuses["Apply Patch"] == "passed"
+    assert statuses["Code Build"] == "passed"
+    assert statuses["Targeted Bug Test"] == "passed"
+    assert result["is_valid"] is True
+    assert "total_seconds" in result["timings"]
+    # The original checkout is untouched and the worktree is gone
+    assert "a - b" in (tmp_path / "repo" / "calc.py").read_text()
+    assert subprocess.run(["git", "worktree", "list"], cwd=repo, capture_output=True, text=True).stdout.count("\n") == 1
+
+def test_validate_patch_rejects_unappliable_diff(tmp_path):
+    repo = _git_repo(tmp_path / "repo")
+    result = validate_patch("ISSUE-2", FIX.replace("return a - b", "return a * b"), repo_path=repo)
+    assert result["is_valid"] is False
+    assert [step["check"] for step in result["checks_run"]] == ["Apply Patch"]
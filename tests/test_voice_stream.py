@@ -0,0 +1,104 @@
+import asyncio
+from array import array
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.services import voice_stream
+from app.services.voice_stream import LocalVoiceBackend, VoiceStreamSession, split_sentences
+
+SAMPLE_RATE = 16000
+
+
+def _pcm(ms, amplitude):
+    return array("h", [amplitude] * (SAMPLE_RATE * ms // 1000)).tobytes()
+
+def test_split_sentences():
+    assert split_sentences("Done. Build passed!  Deploy? ") == ["Done.", "Build passed!", "Deploy?"]
+
+def test_session_cuts_utterance_on_silence_and_streams_reply(monkeypatch):
+    monkeypatch.setattr(voice_stream, "PARTIAL_TRANSCRIPT_INTERVAL_MS", 300)
+    sent = []
+
+    async def send_json(message):
+        sent.append(message)
+
+    async def send_bytes(data):
+        sent.append(data)
+
+    async def run():
+        session = VoiceStreamSession(LocalVoiceBackend(), send_json, send_bytes, sample_rate=SAMPLE_RATE)
+        await session.feed_audio(_pcm(200, 0))  # Leading silence is ignored
+        for _ in range(10):  # 900 ms of speech delivered in small chunks
+            await session.feed_audio(_pcm(90, 3000))
+            await asyncio.sleep(0)
+        await session.feed_audio(_pcm(700, 0))  # Silence ends the utterance
+        await session.close()
+
+    asyncio.run(run())
+
+    types = [m["type"] if isinstance(m, dict) else "audio" for m in sent]
+    assert types[0] == "speech_start"
+    assert "partial_transcript" in types
+    transcript = next(m for m in sent if isinstance(m, dict) and m["type"] == "transcript")
+    assert transcript["text"].endswith("ms of speech]")
+    # Each reply sentence is followed by its own audio chunk
+    reply_start = types.index("reply_text")
+    assert types[reply_start:] == ["reply_text", "audio", "reply_text", "audio", "reply_end"]
+    assert all(m.startswith(b"RIFF") for m in sent if isinstance(m, bytes))
+
+
+def _stream_client(monkeypatch, aborted):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api import voice_interactive_router
+
+    abort = VoiceStreamSession.abort
+    monkeypatch.setattr(VoiceStreamSession, "abort", lambda self: aborted.append(self) or abort(self))
+    app = FastAPI()
+    app.include_router(voice_interactive_router.router)
+    return TestClient(app)
+
+
+def test_stream_closes_on_malformed_text_frames_and_stops_the_session(monkeypatch):
+    aborted = []
+    client = _stream_client(monkeypatch, aborted)
+    for frame in ("not json", "[1, 2]"):
+        with client.websocket_connect("/voice/stream?backend=local") as ws:
+            ws.send_text(frame)
+            with pytest.raises(WebSocketDisconnect) as closed:
+                ws.receive_json()
+        assert closed.value.code == 1003
+    assert len(aborted) == 2
+
+
+def test_stream_rejects_unsupported_sample_rates(monkeypatch):
+    client = _stream_client(monkeypatch, [])
+    for rate in (0, 20, 96000):
+        with pytest.raises(WebSocketDisconnect) as closed:
+            with client.websocket_connect(f"/voice/stream?backend=local&sample_rate={rate}") as ws:
+                ws.receive_json()
+        assert closed.value.code == 1008
+
+
+def test_continuous_speech_is_cut_at_the_utterance_limit(monkeypatch):
+    monkeypatch.setattr(voice_stream, "MAX_UTTERANCE_SECONDS", 0.3)
+    sent = []
+
+    async def send_json(message):
+        sent.append(message)
+
+    async def send_bytes(data):
+        sent.append(data)
+
+    async def run():
+        session = VoiceStreamSession(LocalVoiceBackend(), send_json, send_bytes, sample_rate=SAMPLE_RATE)
+        for _ in range(10):  # 900 ms of speech without a pause
+            await session.feed_audio(_pcm(90, 3000))
+            assert len(session._speech) <= session._max_utterance_bytes
+        await session.close()
+
+    asyncio.run(run())
+
+    transcripts = [m["text"] for m in sent if isinstance(m, dict) and m["type"] == "transcript"]
+    assert transcripts == ["[300 ms of speech]"] * 3